@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from app.utils.config import settings
 from app.utils.db import Base
 from app.models.transaction import Transaction  # noqa: F401
+from app.services.partition_maintenance import autogenerate_include_name
 
 config = context.config
 config.set_main_option("sqlalchemy.url", settings.database_url)
@@ -23,6 +24,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        # Partitions are created by migrations and maintenance, not the models; autogenerate would drop them.
+        include_name=autogenerate_include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -33,7 +36,11 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     def do_run_migrations(connection) -> None:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=autogenerate_include_name,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
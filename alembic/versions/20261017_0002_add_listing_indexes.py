@@ -0,0 +1,46 @@
+"""add keyset listing indexes
+
+Revision ID: 20261017_0002
+Revises: 20260217_0001
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0002"
+down_revision: str | None = "20260217_0001"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+_INDEXES = (
+    ("ix_transactions_created_at_id", ["created_at", "id"], None),
+    ("ix_transactions_source_account_created_at_id", ["source_account", "created_at", "id"], None),
+    ("ix_transactions_destination_account_created_at_id", ["destination_account", "created_at", "id"], None),
+    ("ix_transactions_unsettled_status_created_at_id", ["status", "created_at", "id"], "status <> 'PROCESSED'"),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids blocking webhook writes while indexes build on a large table.
+    with op.get_context().autocommit_block():
+        for name, columns, where in _INDEXES:
+            op.create_index(
+                name,
+                "transactions",
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name="transactions", postgresql_concurrently=True, if_exists=True)
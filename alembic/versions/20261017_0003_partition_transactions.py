@@ -0,0 +1,155 @@
+"""partition transactions by created_at with a global transaction_keys dedup table
+
+Revision ID: 20261017_0003
+Revises: 20261017_0002
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0003"
+down_revision: str | None = "20261017_0002"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# Months created ahead of now; the app's partition maintenance keeps extending this afterwards.
+_PREMAKE_MONTHS = 3
+
+_COLUMNS = (
+    "id, transaction_id, source_account, destination_account, amount, currency, status, created_at, updated_at,"
+    " processed_at, processing_started_at, error_message, payload_hash, duplicate_conflict_count, last_conflict_at"
+)
+
+# (name, columns, where) for the secondary indexes, shared by the partitioned and plain layouts.
+_INDEXES = (
+    ("ix_transactions_status", ["status"], None),
+    ("ix_transactions_status_processing_started_at", ["status", "processing_started_at"], None),
+    ("ix_transactions_created_at_id", ["created_at", "id"], None),
+    ("ix_transactions_source_account_created_at_id", ["source_account", "created_at", "id"], None),
+    ("ix_transactions_destination_account_created_at_id", ["destination_account", "created_at", "id"], None),
+    ("ix_transactions_unsettled_status_created_at_id", ["status", "created_at", "id"], "status <> 'PROCESSED'"),
+)
+
+transaction_status = postgresql.ENUM(
+    "PROCESSING",
+    "PROCESSED",
+    "FAILED",
+    name="transaction_status",
+    create_type=False,
+)
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("transaction_id", sa.String(length=128), nullable=False),
+        sa.Column("source_account", sa.String(length=128), nullable=False),
+        sa.Column("destination_account", sa.String(length=128), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("status", transaction_status, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("processing_started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("payload_hash", sa.String(length=64), nullable=False),
+        sa.Column("duplicate_conflict_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_conflict_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _create_secondary_indexes() -> None:
+    for name, columns, where in _INDEXES:
+        op.create_index(name, "transactions", columns, postgresql_where=sa.text(where) if where else None)
+
+
+def _drop_secondary_indexes(table: str) -> None:
+    for name, _, _ in _INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.drop_index("ix_transactions_transaction_id", table_name=table, if_exists=True)
+
+
+def _month_start(value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade() -> None:
+    # Copies every row in one transaction. On very large tables, run it in a maintenance window.
+    bind = op.get_bind()
+    op.rename_table("transactions", "transactions_unpartitioned")
+    op.execute("ALTER TABLE transactions_unpartitioned DROP CONSTRAINT IF EXISTS transactions_transaction_id_key")
+    op.execute(
+        "ALTER TABLE transactions_unpartitioned RENAME CONSTRAINT transactions_pkey TO transactions_unpartitioned_pkey"
+    )
+    _drop_secondary_indexes("transactions_unpartitioned")
+
+    op.create_table(
+        "transactions",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index("ix_transactions_transaction_id", "transactions", ["transaction_id"])
+    _create_secondary_indexes()
+    op.create_table(
+        "transaction_keys",
+        sa.Column("transaction_id", sa.String(length=128), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("transaction_id"),
+    )
+    op.create_index("ix_transaction_keys_created_at", "transaction_keys", ["created_at"])
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM transactions_unpartitioned")).scalar()
+    now = datetime.now(timezone.utc)
+    month = _month_start(oldest or now)
+    last = _add_months(_month_start(now), _PREMAKE_MONTHS)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE transactions_p{month.year:04d}{month.month:02d} PARTITION OF transactions"
+            f" FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    op.execute(f"INSERT INTO transactions ({_COLUMNS}) SELECT {_COLUMNS} FROM transactions_unpartitioned")
+    op.execute(
+        "INSERT INTO transaction_keys (transaction_id, created_at)"
+        " SELECT transaction_id, created_at FROM transactions_unpartitioned"
+    )
+    op.drop_table("transactions_unpartitioned")
+
+
+def downgrade() -> None:
+    op.rename_table("transactions", "transactions_partitioned")
+    op.execute(
+        "ALTER TABLE transactions_partitioned RENAME CONSTRAINT transactions_pkey TO transactions_partitioned_pkey"
+    )
+    _drop_secondary_indexes("transactions_partitioned")
+
+    op.create_table(
+        "transactions",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("transaction_id"),
+    )
+    op.create_index("ix_transactions_transaction_id", "transactions", ["transaction_id"], unique=True)
+    _create_secondary_indexes()
+
+    op.execute(f"INSERT INTO transactions ({_COLUMNS}) SELECT {_COLUMNS} FROM transactions_partitioned")
+    # Drops every attached partition with it; partitions detached by retention are left alone.
+    op.drop_table("transactions_partitioned")
+    op.drop_index("ix_transaction_keys_created_at", table_name="transaction_keys")
+    op.drop_table("transaction_keys")
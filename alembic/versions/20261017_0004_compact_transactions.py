@@ -0,0 +1,117 @@
+"""compact transactions rows: BYTEA hash, minor-unit amounts, transaction_id key, HOT-friendly indexes
+
+Revision ID: 20261017_0004
+Revises: 20261017_0003
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0004"
+down_revision: str | None = "20261017_0003"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# Matches the TRANSACTIONS_FILLFACTOR default; the app uses its setting for partitions it creates later.
+_FILLFACTOR = 70
+
+# Indexes that mention status (blocking HOT updates on every transition) or duplicate the primary key.
+_DROPPED_INDEXES = (
+    ("ix_transactions_transaction_id", ["transaction_id"], None),
+    ("ix_transactions_status", ["status"], None),
+    ("ix_transactions_status_processing_started_at", ["status", "processing_started_at"], None),
+    ("ix_transactions_unsettled_status_created_at_id", ["status", "created_at", "id"], "status <> 'PROCESSED'"),
+)
+
+_TRACK_PENDING_FUNCTION = """
+CREATE OR REPLACE FUNCTION track_pending_transactions() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.status = 'PROCESSING' THEN
+            INSERT INTO pending_transactions (transaction_id, created_at)
+            VALUES (NEW.transaction_id, NEW.created_at)
+            ON CONFLICT (transaction_id) DO NOTHING;
+        END IF;
+    ELSIF OLD.status = 'PROCESSING' AND (TG_OP = 'DELETE' OR NEW.status <> 'PROCESSING') THEN
+        DELETE FROM pending_transactions WHERE transaction_id = OLD.transaction_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _partitions() -> list[str]:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT child.relname FROM pg_inherits AS i"
+            " JOIN pg_class AS child ON child.oid = i.inhrelid"
+            " WHERE i.inhparent = 'transactions'::regclass"
+        )
+    )
+    return list(result.scalars().all())
+
+
+def upgrade() -> None:
+    # Fillfactor first, so the rewrite below already leaves room on every page.
+    for partition in _partitions():
+        op.execute(f"ALTER TABLE {partition} SET (fillfactor = {_FILLFACTOR})")
+    # One rewrite of every partition. On very large tables, run it in a maintenance window.
+    op.execute(
+        "ALTER TABLE transactions"
+        " ALTER COLUMN payload_hash TYPE BYTEA USING decode(payload_hash, 'hex'),"
+        " ALTER COLUMN amount TYPE BIGINT USING round(amount * 100)::bigint"
+    )
+    op.alter_column("transactions", "amount", new_column_name="amount_minor")
+
+    op.drop_constraint("transactions_pkey", "transactions", type_="primary")
+    op.create_primary_key("transactions_pkey", "transactions", ["transaction_id", "created_at"])
+    for name, _, _ in _DROPPED_INDEXES:
+        op.drop_index(name, table_name="transactions")
+    op.create_index(
+        "ix_transactions_errored_created_at_id",
+        "transactions",
+        ["created_at", "id"],
+        postgresql_where=sa.text("error_message IS NOT NULL"),
+    )
+
+    op.create_table(
+        "pending_transactions",
+        sa.Column("transaction_id", sa.String(length=128), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("transaction_id"),
+    )
+    op.execute(_TRACK_PENDING_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER trg_transactions_pending AFTER INSERT OR UPDATE OF status OR DELETE ON transactions"
+        " FOR EACH ROW EXECUTE FUNCTION track_pending_transactions()"
+    )
+    op.execute(
+        "INSERT INTO pending_transactions (transaction_id, created_at)"
+        " SELECT transaction_id, created_at FROM transactions WHERE status = 'PROCESSING'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_pending ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS track_pending_transactions()")
+    op.drop_table("pending_transactions")
+
+    op.drop_index("ix_transactions_errored_created_at_id", table_name="transactions")
+    for name, columns, where in _DROPPED_INDEXES:
+        op.create_index(name, "transactions", columns, postgresql_where=sa.text(where) if where else None)
+    op.drop_constraint("transactions_pkey", "transactions", type_="primary")
+    op.create_primary_key("transactions_pkey", "transactions", ["id", "created_at"])
+
+    op.alter_column("transactions", "amount_minor", new_column_name="amount")
+    for partition in _partitions():
+        op.execute(f"ALTER TABLE {partition} RESET (fillfactor)")
+    op.execute(
+        "ALTER TABLE transactions"
+        " ALTER COLUMN payload_hash TYPE VARCHAR(64) USING encode(payload_hash, 'hex'),"
+        " ALTER COLUMN amount TYPE NUMERIC(18, 2) USING amount / 100.0"
+    )
@@ -0,0 +1,53 @@
+from pydantic import BaseModel
+
+
+class ProcessingQueueStats(BaseModel):
+    mode: str
+    runner: str
+    overflow_policy: str
+    in_flight: int
+    pending: int
+    worker_count: int
+    dispatch_batch_size: int
+    max_pending: int
+    max_in_flight: int
+    background_tasks: int
+    overflow_total: int
+    rejected_total: int
+
+
+class CacheStats(BaseModel):
+    enabled: bool
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class StatusNotifierStats(BaseModel):
+    enabled: bool
+    listening: bool
+    subscribers: int
+
+
+class DbPoolStats(BaseModel):
+    mode: str
+    external_pooler: bool
+    size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    resizes: int
+
+
+class RuntimeStatsResponse(BaseModel):
+    processing: ProcessingQueueStats
+    transaction_cache: CacheStats
+    duplicate_filter: CacheStats
+    status_notifier: StatusNotifierStats
+    db_pool: DbPoolStats
@@ -1,5 +1,8 @@
+from collections.abc import Iterable
 from datetime import datetime
 from decimal import Decimal
+from json.encoder import encode_basestring
+from typing import NamedTuple
 
 from pydantic import BaseModel, ConfigDict, field_serializer
 
@@ -24,3 +27,71 @@ class TransactionOut(BaseModel):
         if value is None:
             return None
         return value.astimezone(IST)
+
+
+class TransactionRow(NamedTuple):
+    """TransactionOut's fields as a plain row, for read paths that skip ORM instances and model validation."""
+
+    transaction_id: str
+    source_account: str
+    destination_account: str
+    amount: Decimal
+    currency: str
+    status: TransactionStatus
+    created_at: datetime
+    processed_at: datetime | None
+
+
+_ROW_JSON = (
+    '{"transaction_id":%s,"source_account":%s,"destination_account":%s,"amount":"%s","currency":%s,'
+    '"status":"%s","created_at":"%s","processed_at":%s}'
+)
+
+
+def dump_transaction_rows_json(rows: Iterable[TransactionRow]) -> bytes:
+    """Encode rows to exactly the bytes a `List[TransactionOut]` TypeAdapter would dump.
+
+    Timestamps are converted to IST and formatted in the same single pass over the rows. `isoformat()` and
+    `str(Decimal)` match pydantic's JSON forms, and `encode_basestring` escapes strings as its writer does.
+    """
+    return (
+        "["
+        + ",".join(
+            [
+                _ROW_JSON
+                % (
+                    encode_basestring(transaction_id),
+                    encode_basestring(source_account),
+                    encode_basestring(destination_account),
+                    amount,
+                    encode_basestring(currency),
+                    status.value,
+                    created_at.astimezone(IST).isoformat(),
+                    "null" if processed_at is None else f'"{processed_at.astimezone(IST).isoformat()}"',
+                )
+                for (
+                    transaction_id,
+                    source_account,
+                    destination_account,
+                    amount,
+                    currency,
+                    status,
+                    created_at,
+                    processed_at,
+                ) in rows
+            ]
+        )
+        + "]"
+    ).encode()
+
+
+class TransactionLookupOut(BaseModel):
+    transactions: list[TransactionOut]
+    # Requested IDs with no stored transaction, in request order.
+    missing: list[str]
+
+
+class TransactionPage(BaseModel):
+    items: list[TransactionOut]
+    # Opaque cursor for the next (older) page; None on the last page.
+    next_cursor: str | None
@@ -2,6 +2,8 @@ from decimal import Decimal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from app.utils.enums import WebhookIngestOutcome
+
 
 class TransactionWebhookIn(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -23,3 +25,7 @@ class TransactionWebhookAck(BaseModel):
     acknowledged: bool = True
     transaction_id: str
     response_time_ms: float
+
+
+class TransactionWebhookBatchAck(TransactionWebhookAck):
+    outcome: WebhookIngestOutcome
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -6,12 +5,23 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.router.routes_health import router as health_router
+from app.router.routes_metrics import router as metrics_router
+from app.router.routes_runtime import router as runtime_router
 from app.router.routes_transactions import router as transactions_router
 from app.router.routes_webhooks import router as webhooks_router
+from app.router.webhook_fast_path import WebhookFastPathMiddleware
 from app.utils.config import settings
-from app.utils.db import check_db_connection, engine, ensure_tables_exist
+from app.utils.db import engine
 from app.utils.logging import configure_logging
+from app.utils.timing import ServerTimingMiddleware
 from app.utils.runtime import clear_shutdown_signal, drain_background_tasks, set_shutdown_signal
+from app.services.partition_maintenance import start_partition_maintainer
+from app.services.pool_autoscaler import start_pool_autoscaler
+from app.services.processor import interrupt_pending_processing
+from app.services.queue_worker import start_queue_workers
+from app.services.stale_sweeper import start_stale_sweeper
+from app.services.startup import preload_request_path, prepare_database
+from app.services.status_notifier import close_status_notifier
 from app.models.transaction import Transaction  # noqa: F401
 
 logger = logging.getLogger(__name__)
@@ -20,22 +30,42 @@ logger = logging.getLogger(__name__)
 async def lifespan(_: FastAPI):
     configure_logging()
     clear_shutdown_signal()
-    logger.info("Starting app and validating DB connectivity")
-    await asyncio.wait_for(check_db_connection(), timeout=settings.db_operation_timeout_seconds)
-    logger.info("Database connection check successful")
-    # Always keep schema bootstrapped for local/dev usage when Alembic was not run.
-    await ensure_tables_exist()
-    logger.info("Schema ensure step completed")
+    preload_request_path()
+    if settings.repository_backend == "memory":
+        logger.warning("REPOSITORY_BACKEND=memory: transactions are kept in process memory and never persisted")
+    else:
+        logger.info("Starting app")
+        await prepare_database()
+        if settings.db_pool_mode == "adaptive":
+            start_pool_autoscaler()
+    if settings.processing_runner == "worker":
+        logger.info("PROCESSING_RUNNER=worker: this process only ingests; run `python -m app.worker` to process")
+    else:
+        if settings.processing_mode == "queue":
+            start_queue_workers(settings.queue_worker_count)
+            logger.info("Started %s durable queue workers", settings.queue_worker_count)
+        if settings.stale_sweep_enabled:
+            start_stale_sweeper()
+        if settings.partition_maintenance_enabled and settings.repository_backend != "memory":
+            start_partition_maintainer()
     try:
         yield
     finally:
         set_shutdown_signal()
+        await interrupt_pending_processing()
         await drain_background_tasks()
+        await close_status_notifier()
         # Only close pooled DB connections; this does not drop tables.
         await engine.dispose()
 
 
 app = FastAPI(title="Confluencr Webhook Processor", lifespan=lifespan)
+# Pass-through unless WEBHOOK_FAST_PATH_ENABLED; added first so Server-Timing still wraps it.
+app.add_middleware(WebhookFastPathMiddleware)
+# Pass-through unless SERVER_TIMING_ENABLED; checked per request so it can be toggled at runtime.
+app.add_middleware(ServerTimingMiddleware)
 app.include_router(health_router)
 app.include_router(webhooks_router)
 app.include_router(transactions_router)
+app.include_router(runtime_router)
+app.include_router(metrics_router)
@@ -1,34 +1,159 @@
 from datetime import datetime
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, Enum, Integer, Numeric, String, Text, func
+from sqlalchemy import DDL, BigInteger, DateTime, Enum, Index, Integer, LargeBinary, String, Text, event, func, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
 
+from app.utils.config import settings
 from app.utils.db import Base
 from app.utils.enums import TransactionStatus
 
+# NUMERIC(18, 2) held values below 10^16; the same bound in minor units.
+_MAX_MINOR_UNITS = 10**18
+
+
+def to_minor_units(value: Decimal | int) -> int:
+    # Rounds half away from zero, as casting to NUMERIC(18, 2) did.
+    minor = int((Decimal(value) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    if abs(minor) >= _MAX_MINOR_UNITS:
+        raise ValueError("amount out of range")
+    return minor
+
+
+def quantize_amount(value: Decimal | int) -> Decimal:
+    """The amount as it reads back from the database: rounded to hundredths, scale 2."""
+    return Decimal(to_minor_units(value)).scaleb(-2)
+
+
+class MinorUnits(TypeDecorator):
+    """Decimal amounts in Python, BIGINT hundredths (8 bytes, no varlena header) in the database."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Decimal | int | None, dialect) -> int | None:
+        if value is None:
+            return None
+        return to_minor_units(value)
+
+    def process_result_value(self, value: int | None, dialect) -> Decimal | None:
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-2)
+
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # No index mentions status, processed_at or updated_at, so PROCESSING -> PROCESSED is a HOT update: the new
+    # row version stays on its page and no index gets a new entry. Unfinished rows are found through
+    # pending_transactions instead, which a trigger keeps in step (see below).
+    __table_args__ = (
+        # Keyset listing indexes: every filter path ends in (created_at, id) so pages are index range scans.
+        Index("ix_transactions_created_at_id", "created_at", "id"),
+        Index("ix_transactions_source_account_created_at_id", "source_account", "created_at", "id"),
+        Index("ix_transactions_destination_account_created_at_id", "destination_account", "created_at", "id"),
+        # FAILED (and interrupted) rows carry an error message; listing them by status walks this small index.
+        Index(
+            "ix_transactions_errored_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("error_message IS NOT NULL"),
+        ),
+        # Monthly range partitions keep every index (and vacuum) proportional to one month of rows;
+        # see app/services/partition_maintenance.py. Uniqueness of transaction_id lives in transaction_keys.
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
-    transaction_id: Mapped[str] = mapped_column(String(128), unique=True, index=True, nullable=False)
+    # Keyset tie-breaker only; transaction_id is the key, so id carries no index of its own.
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False, default=uuid4)
+    transaction_id: Mapped[str] = mapped_column(String(128), primary_key=True)
     source_account: Mapped[str] = mapped_column(String(128), nullable=False)
     destination_account: Mapped[str] = mapped_column(String(128), nullable=False)
-    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    amount: Mapped[Decimal] = mapped_column("amount_minor", MinorUnits(), nullable=False)
     currency: Mapped[str] = mapped_column(String(3), nullable=False)
     status: Mapped[TransactionStatus] = mapped_column(
-        Enum(TransactionStatus, name="transaction_status"), nullable=False, index=True
+        Enum(TransactionStatus, name="transaction_status"), nullable=False
+    )
+    # Part of the primary key because a partitioned table's unique constraints must include the partition key.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
     processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     processing_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
-    payload_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Raw SHA-256 digest (32 bytes) rather than its 64-character hex form.
+    payload_hash: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     duplicate_conflict_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     last_conflict_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class TransactionKey(Base):
+    """Global dedup index: one small row per transaction_id, pointing at the partition (created_at) holding it."""
+
+    __tablename__ = "transaction_keys"
+
+    transaction_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+
+
+class PendingTransaction(Base):
+    """Transactions still in PROCESSING, maintained by trigger; serves queue claims and the stale sweeper."""
+
+    __tablename__ = "pending_transactions"
+
+    transaction_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    # Locates the row's partition, like TransactionKey.created_at.
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+@event.listens_for(Transaction.__table__, "after_create")
+def _create_default_partition(target, connection, **_kw) -> None:
+    # Catch-all so inserts never fail for want of a partition; maintenance creates the monthly ones ahead of time.
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS transactions_default PARTITION OF transactions DEFAULT"
+            f" WITH (fillfactor = {settings.transactions_fillfactor})"
+        )
+    )
+
+
+# Only statements that set status fire the UPDATE trigger, i.e. final transitions; duplicate bookkeeping,
+# re-opens and start stamps do not.
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION track_pending_transactions() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                IF NEW.status = 'PROCESSING' THEN
+                    INSERT INTO pending_transactions (transaction_id, created_at)
+                    VALUES (NEW.transaction_id, NEW.created_at)
+                    ON CONFLICT (transaction_id) DO NOTHING;
+                END IF;
+            ELSIF OLD.status = 'PROCESSING' AND (TG_OP = 'DELETE' OR NEW.status <> 'PROCESSING') THEN
+                DELETE FROM pending_transactions WHERE transaction_id = OLD.transaction_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    ),
+)
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER trg_transactions_pending AFTER INSERT OR UPDATE OF status OR DELETE ON transactions"
+        " FOR EACH ROW EXECUTE FUNCTION track_pending_transactions()"
+    ),
+)
@@ -0,0 +1,14 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.config import settings
+from app.repositories.memory_repository import InMemoryTransactionRepository
+from app.repositories.transaction_repository import TransactionRepository
+
+AnyTransactionRepository = TransactionRepository | InMemoryTransactionRepository
+
+
+def get_transaction_repository(db: AsyncSession, *, notify_final_transitions: bool = False) -> AnyTransactionRepository:
+    # Chosen per call so REPOSITORY_BACKEND (or a test flipping settings) applies without re-importing services.
+    if settings.repository_backend == "memory":
+        return InMemoryTransactionRepository(db, notify_final_transitions=notify_final_transitions)
+    return TransactionRepository(db, notify_final_transitions=notify_final_transitions)
@@ -0,0 +1,290 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, List
+from uuid import UUID, uuid4
+
+from app.utils.enums import TransactionStatus
+from app.dto.transaction import TransactionRow
+from app.utils.metrics import processing_lag_seconds
+from app.utils.time import utcnow
+from app.models.transaction import Transaction, quantize_amount
+from app.repositories.transaction_repository import IngestResult, is_stale
+
+
+class InMemoryTransactionStore:
+    """Process-local stand-in for the transactions table, keyed by the unique transaction_id.
+
+    Unbounded and not shared between processes: meant for profiling the application layer, not production.
+    """
+
+    def __init__(self):
+        self.rows: dict[str, Transaction] = {}
+
+    def clear(self) -> None:
+        self.rows.clear()
+
+
+memory_store = InMemoryTransactionStore()
+
+
+class InMemoryTransactionRepository:
+    """Same contract as TransactionRepository, backed by `memory_store` instead of Postgres.
+
+    Methods never await between reading and writing a row, so each call is atomic on the event loop,
+    which gives the same guarantees as the guarded single-statement SQL (unique IDs, one transition
+    out of PROCESSING, stale re-open only for non-final rows).
+    """
+
+    def __init__(
+        self,
+        db: Any = None,
+        *,
+        notify_final_transitions: bool = False,
+        store: InMemoryTransactionStore | None = None,
+    ):
+        # `db` is accepted for signature parity with TransactionRepository and ignored.
+        self.db = db
+        self.notify_final_transitions = notify_final_transitions
+        self.store = store if store is not None else memory_store
+
+    async def ingest(
+        self,
+        *,
+        transaction_id: str,
+        source_account: str,
+        destination_account: str,
+        amount: Decimal,
+        currency: str,
+        payload_hash: bytes,
+        now: datetime,
+        stale_timeout_seconds: int,
+    ) -> IngestResult:
+        existing = self.store.rows.get(transaction_id)
+        if existing is None:
+            self._insert(
+                {
+                    "transaction_id": transaction_id,
+                    "source_account": source_account,
+                    "destination_account": destination_account,
+                    "amount": amount,
+                    "currency": currency,
+                    "status": TransactionStatus.PROCESSING,
+                    "processing_started_at": now,
+                    "payload_hash": payload_hash,
+                },
+                now=now,
+            )
+            return IngestResult(True, None, None, False, False)
+
+        conflict = existing.payload_hash != payload_hash
+        reopened = is_stale(existing, now - timedelta(seconds=stale_timeout_seconds))
+        if conflict:
+            existing.duplicate_conflict_count += 1
+            existing.last_conflict_at = now
+        if reopened:
+            existing.processing_started_at = now
+            existing.error_message = None
+        if conflict or reopened:
+            existing.updated_at = now
+        return IngestResult(False, existing.payload_hash, existing.status, conflict, reopened)
+
+    async def create_many_if_not_exists(self, rows: List[dict[str, Any]]) -> set[str]:
+        return await self.insert_many_if_not_exists(rows)
+
+    async def insert_many_if_not_exists(self, rows: List[dict[str, Any]]) -> set[str]:
+        inserted_transaction_ids: set[str] = set()
+        for row in rows:
+            if row["transaction_id"] not in self.store.rows:
+                self._insert(row, now=row.get("processing_started_at") or utcnow())
+                inserted_transaction_ids.add(row["transaction_id"])
+        return inserted_transaction_ids
+
+    async def get_rows_by_transaction_id(self, transaction_id: str) -> List[TransactionRow]:
+        transaction = self.store.rows.get(transaction_id)
+        return [_output_row(transaction)] if transaction is not None else []
+
+    async def get_rows_by_transaction_ids(self, transaction_ids: List[str]) -> List[TransactionRow]:
+        return [_output_row(transaction) for transaction in await self.get_many_by_transaction_ids(transaction_ids)]
+
+    async def get_one_by_transaction_id(self, transaction_id: str) -> Transaction | None:
+        return self.store.rows.get(transaction_id)
+
+    async def get_many_by_transaction_ids(self, transaction_ids: List[str]) -> List[Transaction]:
+        rows = self.store.rows
+        return [rows[transaction_id] for transaction_id in dict.fromkeys(transaction_ids) if transaction_id in rows]
+
+    async def list_page(
+        self,
+        *,
+        status: TransactionStatus | None = None,
+        source_account: str | None = None,
+        destination_account: str | None = None,
+        currency: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        limit: int,
+    ) -> List[Transaction]:
+        matches = [
+            txn
+            for txn in self.store.rows.values()
+            if (status is None or txn.status == status)
+            and (source_account is None or txn.source_account == source_account)
+            and (destination_account is None or txn.destination_account == destination_account)
+            and (currency is None or txn.currency == currency)
+            and (created_from is None or txn.created_at >= created_from)
+            and (created_to is None or txn.created_at < created_to)
+            and (after is None or (txn.created_at, txn.id) < after)
+        ]
+        matches.sort(key=lambda txn: (txn.created_at, txn.id), reverse=True)
+        return matches[:limit]
+
+    async def record_duplicate_conflict(self, transaction: Transaction, *, now: datetime) -> None:
+        transaction.duplicate_conflict_count += 1
+        transaction.last_conflict_at = now
+
+    async def record_batch_duplicates(
+        self,
+        transactions: List[Transaction],
+        *,
+        conflict_counts: dict[str, int],
+        reopen_ids: set[str],
+        now: datetime,
+        stale_timeout_seconds: int,
+    ) -> set[str]:
+        stale_cutoff = now - timedelta(seconds=stale_timeout_seconds)
+        reopened_transaction_ids: set[str] = set()
+        for transaction in transactions:
+            conflicts = conflict_counts.get(transaction.transaction_id, 0)
+            if conflicts:
+                transaction.duplicate_conflict_count += conflicts
+                transaction.last_conflict_at = now
+            if transaction.transaction_id in reopen_ids and is_stale(transaction, stale_cutoff):
+                transaction.processing_started_at = now
+                transaction.error_message = None
+                reopened_transaction_ids.add(transaction.transaction_id)
+        return reopened_transaction_ids
+
+    async def mark_for_retry_if_stale(
+        self,
+        transaction: Transaction,
+        *,
+        now: datetime,
+        stale_timeout_seconds: int,
+    ) -> bool:
+        # Only PROCESSING rows without final timestamp are eligible for retry checks.
+        if not is_stale(transaction, now - timedelta(seconds=stale_timeout_seconds)):
+            return False
+        transaction.processing_started_at = now
+        transaction.error_message = None
+        return True
+
+    async def claim_due_for_processing(self, *, due_before: datetime, limit: int) -> List[str]:
+        due = [
+            txn
+            for txn in self.store.rows.values()
+            if txn.status == TransactionStatus.PROCESSING
+            and txn.processing_started_at is not None
+            and txn.processing_started_at <= due_before
+        ]
+        due.sort(key=lambda txn: txn.processing_started_at)
+        return [txn.transaction_id for txn in due[:limit]]
+
+    async def reclaim_stale(self, *, now: datetime, stale_cutoff: datetime, limit: int) -> List[str]:
+        stale = [txn for txn in self.store.rows.values() if is_stale(txn, stale_cutoff)]
+        # NULL start stamps first, matching the SQL's nulls_first ordering.
+        stale.sort(key=lambda txn: (txn.processing_started_at is not None, txn.processing_started_at or now))
+        reclaimed_transaction_ids = []
+        for txn in stale[:limit]:
+            txn.processing_started_at = now
+            txn.error_message = None
+            reclaimed_transaction_ids.append(txn.transaction_id)
+        return reclaimed_transaction_ids
+
+    async def start_processing(self, transaction_id: str, *, now: datetime) -> bool:
+        def _stamp(txn: Transaction) -> None:
+            if txn.processing_started_at is None:
+                txn.processing_started_at = now
+
+        return bool(self._transition_processing([transaction_id], _stamp))
+
+    async def mark_interrupted(self, transaction_id: str, *, message: str) -> bool:
+        return bool(await self.mark_many_interrupted([transaction_id], message=message))
+
+    async def mark_many_interrupted(self, transaction_ids: List[str], *, message: str) -> List[str]:
+        def _interrupt(txn: Transaction) -> None:
+            txn.processing_started_at = None
+            txn.error_message = message
+
+        return self._transition_processing(transaction_ids, _interrupt)
+
+    async def mark_processed(self, transaction_id: str, *, processed_at: datetime) -> bool:
+        return bool(await self.mark_many_processed([transaction_id], processed_at=processed_at))
+
+    async def mark_many_processed(self, transaction_ids: List[str], *, processed_at: datetime) -> List[str]:
+        def _process(txn: Transaction) -> None:
+            txn.status = TransactionStatus.PROCESSED
+            txn.processed_at = processed_at
+            txn.error_message = None
+            processing_lag_seconds.observe((processed_at - txn.created_at).total_seconds())
+
+        return self._transition_processing(transaction_ids, _process, final_status=TransactionStatus.PROCESSED)
+
+    async def mark_failed(self, transaction_id: str, *, error_message: str) -> bool:
+        return bool(await self.mark_many_failed([transaction_id], error_message=error_message))
+
+    async def mark_many_failed(self, transaction_ids: List[str], *, error_message: str) -> List[str]:
+        def _fail(txn: Transaction) -> None:
+            txn.status = TransactionStatus.FAILED
+            txn.error_message = error_message
+
+        return self._transition_processing(transaction_ids, _fail, final_status=TransactionStatus.FAILED)
+
+    def _transition_processing(
+        self, transaction_ids: List[str], apply, *, final_status: TransactionStatus | None = None
+    ) -> List[str]:
+        # Same guard as the SQL: only rows still in PROCESSING move, each at most once per call.
+        transitioned_transaction_ids = []
+        for transaction_id in dict.fromkeys(transaction_ids):
+            txn = self.store.rows.get(transaction_id)
+            if txn is None or txn.status != TransactionStatus.PROCESSING:
+                continue
+            apply(txn)
+            txn.updated_at = utcnow()
+            transitioned_transaction_ids.append(transaction_id)
+        if final_status is not None and self.notify_final_transitions and transitioned_transaction_ids:
+            # No Postgres NOTIFY here; wake this process's waiters directly.
+            from app.services.status_notifier import get_status_notifier
+
+            notifier = get_status_notifier()
+            for transaction_id in transitioned_transaction_ids:
+                notifier.publish(final_status.value, transaction_id)
+        return transitioned_transaction_ids
+
+    def _insert(self, row: dict[str, Any], *, now: datetime) -> Transaction:
+        transaction = Transaction(
+            id=uuid4(),
+            created_at=now,
+            updated_at=now,
+            processed_at=None,
+            error_message=None,
+            duplicate_conflict_count=0,
+            last_conflict_at=None,
+            # Stored as Postgres would return it, so both backends serialize the same amount.
+            **{**row, "amount": quantize_amount(row["amount"])},
+        )
+        self.store.rows[transaction.transaction_id] = transaction
+        return transaction
+
+
+def _output_row(transaction: Transaction) -> TransactionRow:
+    return TransactionRow(
+        transaction.transaction_id,
+        transaction.source_account,
+        transaction.destination_account,
+        transaction.amount,
+        transaction.currency,
+        transaction.status,
+        transaction.created_at,
+        transaction.processed_at,
+    )
@@ -1,20 +1,282 @@
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import List
+from functools import lru_cache
+from typing import Any, List, NamedTuple
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import (
+    BindParameter,
+    Boolean,
+    ColumnElement,
+    LargeBinary,
+    String,
+    Table,
+    and_,
+    any_,
+    bindparam,
+    Executable,
+    Integer,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.utils.enums import TransactionStatus
-from app.models.transaction import Transaction
+from app.dto.transaction import TransactionRow
+from app.utils.metrics import processing_lag_seconds
+from app.utils.timing import stage
+from app.models.transaction import PendingTransaction, Transaction, TransactionKey
+
+
+# Plain SQL rather than pg_insert(...).cte(): PostgreSQL INSERT constructs are not cacheable in
+# SQLAlchemy 2.0, so the Core form was recompiled on every call, costing more than the round trips it saved.
+# Staleness is evaluated on the row version the UPDATE locks, and RETURNING sees post-update values,
+# so a re-open shows up as the start stamp this statement just wrote.
+_STALE_CONDITION = (
+    "(t.status = 'PROCESSING' AND t.processed_at IS NULL"
+    " AND (t.processing_started_at IS NULL OR t.processing_started_at < :stale_cutoff))"
+)
+_INGEST_STMT = text(
+    f"""
+    WITH new_key AS (
+        INSERT INTO transaction_keys (transaction_id)
+        VALUES (:transaction_id)
+        ON CONFLICT (transaction_id) DO NOTHING
+        RETURNING transaction_id, created_at
+    ),
+    inserted AS (
+        INSERT INTO transactions (
+            id, transaction_id, source_account, destination_account, amount_minor, currency,
+            status, processing_started_at, payload_hash, created_at
+        )
+        SELECT
+            CAST(:id AS UUID), k.transaction_id, CAST(:source_account AS VARCHAR),
+            CAST(:destination_account AS VARCHAR), CAST(:amount AS BIGINT), CAST(:currency AS VARCHAR),
+            'PROCESSING'::transaction_status, CAST(:now AS TIMESTAMPTZ), CAST(:payload_hash AS BYTEA), k.created_at
+        FROM new_key AS k
+        RETURNING transaction_id
+    ),
+    existing AS (
+        -- The key's created_at, as a scalar sub-select, lets the executor prune to a single partition.
+        SELECT t.created_at, t.payload_hash, t.status, t.payload_hash <> :payload_hash AS is_conflict
+        FROM transactions AS t
+        WHERE t.transaction_id = :transaction_id
+          AND t.created_at = (SELECT created_at FROM transaction_keys WHERE transaction_id = :transaction_id)
+    ),
+    updated AS (
+        UPDATE transactions AS t
+        SET duplicate_conflict_count = t.duplicate_conflict_count + CASE WHEN e.is_conflict THEN 1 ELSE 0 END,
+            last_conflict_at = CASE WHEN e.is_conflict THEN :now ELSE t.last_conflict_at END,
+            processing_started_at = CASE WHEN {_STALE_CONDITION} THEN :now ELSE t.processing_started_at END,
+            error_message = CASE WHEN {_STALE_CONDITION} THEN NULL ELSE t.error_message END,
+            updated_at = now()
+        FROM existing AS e
+        WHERE t.transaction_id = :transaction_id
+          AND t.created_at = e.created_at
+          AND NOT EXISTS (SELECT 1 FROM inserted)
+          AND (e.is_conflict OR {_STALE_CONDITION})
+        RETURNING t.processing_started_at = :now AS reopened
+    )
+    SELECT
+        EXISTS (SELECT 1 FROM inserted) AS created,
+        (SELECT payload_hash FROM existing) AS existing_payload_hash,
+        (SELECT status FROM existing) AS existing_status,
+        COALESCE((SELECT is_conflict FROM existing), false) AS conflict,
+        COALESCE((SELECT reopened FROM updated), false) AS reopened
+    """
+).bindparams(
+    # Decimal -> minor units, through the column type.
+    bindparam("amount", type_=Transaction.__table__.c.amount_minor.type),
+).columns(
+    created=Boolean,
+    existing_payload_hash=LargeBinary,
+    existing_status=Transaction.__table__.c.status.type,
+    conflict=Boolean,
+    reopened=Boolean,
+)
+
+
+# Set-based duplicate bookkeeping for a batch, inside the batch's own transaction: increments are applied
+# by the UPDATE itself, so concurrent batches cannot lose each other's conflict counts, and staleness is
+# evaluated on the locked row version. created_at prunes each target to its partition.
+_BATCH_DUPLICATES_STMT = text(
+    f"""
+    UPDATE transactions AS t
+    SET duplicate_conflict_count = t.duplicate_conflict_count + d.conflicts,
+        last_conflict_at = CASE WHEN d.conflicts > 0 THEN :now ELSE t.last_conflict_at END,
+        processing_started_at = CASE WHEN d.reopen AND {_STALE_CONDITION} THEN :now ELSE t.processing_started_at END,
+        error_message = CASE WHEN d.reopen AND {_STALE_CONDITION} THEN NULL ELSE t.error_message END,
+        updated_at = now()
+    FROM unnest(
+        CAST(:transaction_ids AS VARCHAR[]),
+        CAST(:created_ats AS TIMESTAMPTZ[]),
+        CAST(:conflicts AS INTEGER[]),
+        CAST(:reopen AS BOOLEAN[])
+    ) AS d (transaction_id, created_at, conflicts, reopen)
+    WHERE t.transaction_id = d.transaction_id
+      AND t.created_at = d.created_at
+      AND (d.conflicts > 0 OR (d.reopen AND {_STALE_CONDITION}))
+    RETURNING t.transaction_id, d.reopen AND t.processing_started_at = :now AS reopened
+    """
+).columns(transaction_id=String, reopened=Boolean)
+
+
+# NOTIFY channel for final status transitions; payloads are "<STATUS>:<transaction_id>".
+TRANSACTION_STATUS_CHANNEL = "transaction_status"
+
+# Hot statements are built once, with every per-call value as a named bind. A module-level construct
+# memoizes its cache key, so a call skips statement construction and cache-key generation, and the
+# identical SQL string hits the dialect's per-connection prepared statement cache.
+_TRANSACTIONS = Transaction.__table__
+_PENDING = PendingTransaction.__table__
+_KEYS = TransactionKey.__table__
+_TRANSACTION_ID = bindparam("transaction_id", type_=String)
+# Single array bind keeps one statement shape regardless of how many IDs are passed.
+_TRANSACTION_IDS = bindparam("transaction_ids", type_=ARRAY(String))
+
+
+def _in_partitions_of(locator: Table, transaction_ids: BindParameter, *, many: bool) -> ColumnElement[bool]:
+    # transaction_id alone probes every partition's primary key. Taking created_at from a small locator table
+    # (transaction_keys, or pending_transactions for PROCESSING rows) lets the executor skip the partitions
+    # that hold no target: one ID is a scalar sub-select evaluated before the scan, many IDs a semi-join whose
+    # nested loop prunes the partitioned side per locator row.
+    if many:
+        return tuple_(_TRANSACTIONS.c.transaction_id, _TRANSACTIONS.c.created_at).in_(
+            select(locator.c.transaction_id, locator.c.created_at).where(
+                locator.c.transaction_id == any_(transaction_ids)
+            )
+        )
+    return and_(
+        _TRANSACTIONS.c.transaction_id == transaction_ids,
+        _TRANSACTIONS.c.created_at
+        == select(locator.c.created_at).where(locator.c.transaction_id == transaction_ids).scalar_subquery(),
+    )
+
+
+_BY_TRANSACTION_ID = _in_partitions_of(_KEYS, _TRANSACTION_ID, many=False)
+_BY_TRANSACTION_IDS = _in_partitions_of(_KEYS, _TRANSACTION_IDS, many=True)
+_SELECT_BY_TRANSACTION_ID = select(Transaction).where(_BY_TRANSACTION_ID)
+_SELECT_BY_TRANSACTION_IDS = select(Transaction).where(_BY_TRANSACTION_IDS)
+# Read endpoints need only TransactionRow's columns, as Core rows: no ORM instances or identity map.
+_OUTPUT_COLUMNS = (
+    _TRANSACTIONS.c.transaction_id,
+    _TRANSACTIONS.c.source_account,
+    _TRANSACTIONS.c.destination_account,
+    _TRANSACTIONS.c.amount_minor.label("amount"),
+    _TRANSACTIONS.c.currency,
+    _TRANSACTIONS.c.status,
+    _TRANSACTIONS.c.created_at,
+    _TRANSACTIONS.c.processed_at,
+)
+_SELECT_ROWS_BY_TRANSACTION_ID = select(*_OUTPUT_COLUMNS).where(_BY_TRANSACTION_ID)
+_SELECT_ROWS_BY_TRANSACTION_IDS = select(*_OUTPUT_COLUMNS).where(_BY_TRANSACTION_IDS)
+
+# INSERT ... SELECT unnest(...) is one statement for any batch size; see _INGEST_STMT on pg_insert caching.
+_CLAIM_KEYS_STMT = text(
+    """
+    INSERT INTO transaction_keys (transaction_id)
+    SELECT unnest(CAST(:transaction_ids AS VARCHAR[]))
+    ON CONFLICT (transaction_id) DO NOTHING
+    RETURNING transaction_id, created_at
+    """
+).columns(transaction_id=String, created_at=_TRANSACTIONS.c.created_at.type)
+# Executed with one parameter set per row; rows use the model's attribute name "amount".
+_INSERT_ROWS_STMT = insert(_TRANSACTIONS).values(
+    amount_minor=bindparam("amount", type_=_TRANSACTIONS.c.amount_minor.type)
+)
+
+_PENDING_JOIN = and_(
+    # created_at lets each lookup prune to the one partition holding the row.
+    _PENDING.c.transaction_id == _TRANSACTIONS.c.transaction_id,
+    _PENDING.c.created_at == _TRANSACTIONS.c.created_at,
+)
+_IS_PROCESSING = _TRANSACTIONS.c.status == TransactionStatus.PROCESSING
+_CLAIM_DUE_STMT = (
+    select(_TRANSACTIONS.c.transaction_id)
+    .join(_PENDING, _PENDING_JOIN)
+    .where(
+        _IS_PROCESSING,
+        _TRANSACTIONS.c.processing_started_at
+        <= bindparam("due_before", type_=_TRANSACTIONS.c.processing_started_at.type),
+    )
+    .order_by(_TRANSACTIONS.c.processing_started_at)
+    .limit(bindparam("limit", type_=Integer))
+    .with_for_update(of=_TRANSACTIONS, skip_locked=True)
+)
+_RECLAIM_STALE_STMT = (
+    update(_TRANSACTIONS)
+    .where(
+        tuple_(_TRANSACTIONS.c.transaction_id, _TRANSACTIONS.c.created_at).in_(
+            select(_TRANSACTIONS.c.transaction_id, _TRANSACTIONS.c.created_at)
+            .join(_PENDING, _PENDING_JOIN)
+            .where(
+                _IS_PROCESSING,
+                _TRANSACTIONS.c.processed_at.is_(None),
+                or_(
+                    _TRANSACTIONS.c.processing_started_at.is_(None),
+                    _TRANSACTIONS.c.processing_started_at
+                    < bindparam("stale_cutoff", type_=_TRANSACTIONS.c.processing_started_at.type),
+                ),
+            )
+            .order_by(_TRANSACTIONS.c.processing_started_at.asc().nulls_first())
+            .limit(bindparam("limit", type_=Integer))
+            .with_for_update(of=_TRANSACTIONS, skip_locked=True)
+        )
+    )
+    .values(
+        processing_started_at=bindparam("now", type_=_TRANSACTIONS.c.processing_started_at.type),
+        error_message=None,
+    )
+    .returning(_TRANSACTIONS.c.transaction_id)
+)
+
+# SET clauses of the guarded transitions, by kind; the binds are filled in per call.
+_TRANSITION_VALUES: dict[str, dict[str, Any]] = {
+    "start": {
+        "processing_started_at": func.coalesce(
+            _TRANSACTIONS.c.processing_started_at,
+            bindparam("now", type_=_TRANSACTIONS.c.processing_started_at.type),
+        ),
+    },
+    "interrupt": {
+        "processing_started_at": None,
+        "error_message": bindparam("message", type_=_TRANSACTIONS.c.error_message.type),
+    },
+    "processed": {
+        "status": TransactionStatus.PROCESSED,
+        "processed_at": bindparam("completed_at", type_=_TRANSACTIONS.c.processed_at.type),
+        "error_message": None,
+    },
+    "failed": {
+        "status": TransactionStatus.FAILED,
+        "error_message": bindparam("message", type_=_TRANSACTIONS.c.error_message.type),
+    },
+}
+
+
+class IngestResult(NamedTuple):
+    created: bool
+    # None when the row was neither inserted nor visible to this statement's snapshot (concurrent insert).
+    existing_payload_hash: bytes | None
+    existing_status: TransactionStatus | None
+    conflict: bool
+    reopened: bool
 
 
 class TransactionRepository:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, *, notify_final_transitions: bool = False):
         self.db = db
+        # When set, PROCESSED/FAILED transitions also NOTIFY TRANSACTION_STATUS_CHANNEL.
+        self.notify_final_transitions = notify_final_transitions
 
-    async def create_if_not_exists(
+    async def ingest(
         self,
         *,
         transaction_id: str,
@@ -22,48 +284,151 @@ class TransactionRepository:
         destination_account: str,
         amount: Decimal,
         currency: str,
-        status: TransactionStatus,
-        processing_started_at: datetime,
-        payload_hash: str,
-    ) -> str | None:
-        # Use INSERT ... ON CONFLICT DO NOTHING for idempotent ingestion.
-        insert_stmt = (
-            pg_insert(Transaction)
-            .values(
-                transaction_id=transaction_id,
-                source_account=source_account,
-                destination_account=destination_account,
-                amount=amount,
-                currency=currency,
-                status=status,
-                processing_started_at=processing_started_at,
-                payload_hash=payload_hash,
+        payload_hash: bytes,
+        now: datetime,
+        stale_timeout_seconds: int,
+    ) -> IngestResult:
+        # One round trip for the whole ingest decision: insert-if-absent, and for an existing row
+        # count a conflicting payload and re-open a stale PROCESSING row in the same statement.
+        with stage("insert"):
+            result = await self.db.execute(
+                _INGEST_STMT,
+                {
+                    "id": uuid4(),
+                    "transaction_id": transaction_id,
+                    "source_account": source_account,
+                    "destination_account": destination_account,
+                    "amount": amount,
+                    "currency": currency,
+                    "payload_hash": payload_hash,
+                    "now": now,
+                    "stale_cutoff": now - timedelta(seconds=stale_timeout_seconds),
+                },
             )
-            .on_conflict_do_nothing(index_elements=["transaction_id"])
-            .returning(Transaction.transaction_id)
-        )
-        inserted_transaction_id = (await self.db.execute(insert_stmt)).scalar_one_or_none()
-        if inserted_transaction_id is None:
-            return None
-        await self.db.commit()
-        return inserted_transaction_id
+            row = result.one()
+        with stage("commit"):
+            await self.db.commit()
+        return IngestResult(*row)
 
-    async def get_by_transaction_id(self, transaction_id: str) -> List[Transaction]:
-        stmt = select(Transaction).where(Transaction.transaction_id == transaction_id)
-        result = await self.db.execute(stmt)
-        transactions = result.scalars().all()
-        return transactions
+    async def create_many_if_not_exists(self, rows: List[dict[str, Any]]) -> set[str]:
+        created_ids = await self.insert_many_if_not_exists(rows)
+        if created_ids:
+            with stage("commit"):
+                await self.db.commit()
+        return created_ids
+
+    async def insert_many_if_not_exists(self, rows: List[dict[str, Any]]) -> set[str]:
+        # Claim keys with one INSERT ... ON CONFLICT DO NOTHING (RETURNING lists only new keys), then insert
+        # the rows for those keys, without committing. Rows must have distinct transaction_ids.
+        with stage("insert"):
+            key_params = {"transaction_ids": [row["transaction_id"] for row in rows]}
+            created_at_by_id = dict((await self.db.execute(_CLAIM_KEYS_STMT, key_params)).all())
+            if created_at_by_id:
+                new_rows = [
+                    {**row, "created_at": created_at_by_id[row["transaction_id"]]}
+                    for row in rows
+                    if row["transaction_id"] in created_at_by_id
+                ]
+                await self.db.execute(_INSERT_ROWS_STMT, new_rows)
+        return set(created_at_by_id)
+
+    async def get_rows_by_transaction_id(self, transaction_id: str) -> List[TransactionRow]:
+        # Core rows unpack and read like TransactionRow.
+        result = await self.db.execute(_SELECT_ROWS_BY_TRANSACTION_ID, {"transaction_id": transaction_id})
+        return result.all()
+
+    async def get_rows_by_transaction_ids(self, transaction_ids: List[str]) -> List[TransactionRow]:
+        with stage("lookup"):
+            result = await self.db.execute(_SELECT_ROWS_BY_TRANSACTION_IDS, {"transaction_ids": list(transaction_ids)})
+        return result.all()
 
     async def get_one_by_transaction_id(self, transaction_id: str) -> Transaction | None:
-        stmt = select(Transaction).where(Transaction.transaction_id == transaction_id)
-        result = await self.db.execute(stmt)
+        with stage("lookup"):
+            result = await self.db.execute(_SELECT_BY_TRANSACTION_ID, {"transaction_id": transaction_id})
         return result.scalar_one_or_none()
 
+    async def get_many_by_transaction_ids(self, transaction_ids: List[str]) -> List[Transaction]:
+        with stage("lookup"):
+            result = await self.db.execute(_SELECT_BY_TRANSACTION_IDS, {"transaction_ids": list(transaction_ids)})
+        return list(result.scalars().all())
+
+    async def list_page(
+        self,
+        *,
+        status: TransactionStatus | None = None,
+        source_account: str | None = None,
+        destination_account: str | None = None,
+        currency: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        limit: int,
+    ) -> List[Transaction]:
+        # Newest first; the (created_at, id) row comparison keeps every page an index range scan (no OFFSET).
+        stmt = select(Transaction)
+        if status is not None:
+            stmt = stmt.where(Transaction.status == status)
+            # status itself is unindexed (see the model); narrow to the rows that can have it.
+            if status == TransactionStatus.PROCESSING:
+                stmt = stmt.where(_is_pending())
+            elif status == TransactionStatus.FAILED:
+                stmt = stmt.where(Transaction.error_message.is_not(None))
+        if source_account is not None:
+            stmt = stmt.where(Transaction.source_account == source_account)
+        if destination_account is not None:
+            stmt = stmt.where(Transaction.destination_account == destination_account)
+        if currency is not None:
+            stmt = stmt.where(Transaction.currency == currency)
+        if created_from is not None:
+            stmt = stmt.where(Transaction.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(Transaction.created_at < created_to)
+        if after is not None:
+            stmt = stmt.where(tuple_(Transaction.created_at, Transaction.id) < tuple_(*after))
+        stmt = stmt.order_by(Transaction.created_at.desc(), Transaction.id.desc()).limit(limit)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
     async def record_duplicate_conflict(self, transaction: Transaction, *, now: datetime) -> None:
         transaction.duplicate_conflict_count += 1
         transaction.last_conflict_at = now
-        await self.db.commit()
+        with stage("duplicate_update"):
+            await self.db.commit()
 
+    async def record_batch_duplicates(
+        self,
+        transactions: List[Transaction],
+        *,
+        conflict_counts: dict[str, int],
+        reopen_ids: set[str],
+        now: datetime,
+        stale_timeout_seconds: int,
+    ) -> set[str]:
+        # Adds conflict_counts[id] conflicting deliveries and re-opens stale rows among reopen_ids, then
+        # commits the batch (including rows from insert_many_if_not_exists). Returns the re-opened IDs.
+        targets = [
+            txn
+            for txn in transactions
+            if conflict_counts.get(txn.transaction_id) or txn.transaction_id in reopen_ids
+        ]
+        reopened_transaction_ids: set[str] = set()
+        if targets:
+            with stage("duplicate_update"):
+                result = await self.db.execute(
+                    _BATCH_DUPLICATES_STMT,
+                    {
+                        "transaction_ids": [txn.transaction_id for txn in targets],
+                        "created_ats": [txn.created_at for txn in targets],
+                        "conflicts": [conflict_counts.get(txn.transaction_id, 0) for txn in targets],
+                        "reopen": [txn.transaction_id in reopen_ids for txn in targets],
+                        "now": now,
+                        "stale_cutoff": now - timedelta(seconds=stale_timeout_seconds),
+                    },
+                )
+                reopened_transaction_ids = {row.transaction_id for row in result if row.reopened}
+        with stage("commit"):
+            await self.db.commit()
+        return reopened_transaction_ids
 
     async def mark_for_retry_if_stale(
         self,
@@ -72,36 +437,127 @@ class TransactionRepository:
         now: datetime,
         stale_timeout_seconds: int,
     ) -> bool:
-        # Only PROCESSING rows without final timestamp are eligible for retry checks.
-        if transaction.status != TransactionStatus.PROCESSING or transaction.processed_at is not None:
-            return False
-
         stale_cutoff = now - timedelta(seconds=stale_timeout_seconds)
         # Re-open stuck rows so webhook ingestion can schedule processing again.
-        if transaction.processing_started_at is None or transaction.processing_started_at < stale_cutoff:
+        if is_stale(transaction, stale_cutoff):
             transaction.processing_started_at = now
             transaction.error_message = None
-            await self.db.commit()
+            with stage("duplicate_update"):
+                await self.db.commit()
             return True
         return False
 
-    async def ensure_processing_started(self, transaction: Transaction, *, now: datetime) -> None:
-        if transaction.processing_started_at is None:
-            transaction.processing_started_at = now
-            await self.db.commit()
+    async def claim_due_for_processing(self, *, due_before: datetime, limit: int) -> List[str]:
+        # Starts from pending_transactions, so only unfinished rows are read; SKIP LOCKED lets concurrent
+        # workers (in any process) claim disjoint batches without blocking on each other.
+        result = await self.db.execute(_CLAIM_DUE_STMT, {"due_before": due_before, "limit": limit})
+        return list(result.scalars().all())
 
-    async def mark_interrupted(self, transaction: Transaction, *, message: str) -> None:
-        transaction.processing_started_at = None
-        transaction.error_message = message
+    async def reclaim_stale(self, *, now: datetime, stale_cutoff: datetime, limit: int) -> List[str]:
+        # One UPDATE ... RETURNING per batch; the locked sub-select reads only pending rows and skips those
+        # another sweeper or worker already holds.
+        result = await self.db.execute(
+            _RECLAIM_STALE_STMT, {"now": now, "stale_cutoff": stale_cutoff, "limit": limit}
+        )
+        reclaimed_transaction_ids = list(result.scalars().all())
         await self.db.commit()
+        return reclaimed_transaction_ids
 
-    async def mark_processed(self, transaction: Transaction, *, processed_at: datetime) -> None:
-        transaction.status = TransactionStatus.PROCESSED
-        transaction.processed_at = processed_at
-        transaction.error_message = None
-        await self.db.commit()
+    async def start_processing(self, transaction_id: str, *, now: datetime) -> bool:
+        # Stamp start time once so stale retries can be detected; False means the row is gone or final.
+        started = await self._transition_processing("start", {"target_id": transaction_id, "now": now})
+        return bool(started)
+
+    async def mark_interrupted(self, transaction_id: str, *, message: str) -> bool:
+        interrupted = await self._transition_processing(
+            "interrupt", {"target_id": transaction_id, "message": message}
+        )
+        return bool(interrupted)
+
+    async def mark_many_interrupted(self, transaction_ids: List[str], *, message: str) -> List[str]:
+        return await self._transition_processing(
+            "interrupt", {"target_ids": list(transaction_ids), "message": message}
+        )
 
-    async def mark_failed(self, transaction: Transaction, *, error_message: str) -> None:
-        transaction.status = TransactionStatus.FAILED
-        transaction.error_message = error_message
+    async def mark_processed(self, transaction_id: str, *, processed_at: datetime) -> bool:
+        processed = await self._transition_processing(
+            "processed",
+            {"target_id": transaction_id, "completed_at": processed_at},
+            notify=self.notify_final_transitions,
+        )
+        return bool(processed)
+
+    async def mark_many_processed(self, transaction_ids: List[str], *, processed_at: datetime) -> List[str]:
+        return await self._transition_processing(
+            "processed",
+            {"target_ids": list(transaction_ids), "completed_at": processed_at},
+            notify=self.notify_final_transitions,
+        )
+
+    async def mark_failed(self, transaction_id: str, *, error_message: str) -> bool:
+        failed = await self._transition_processing(
+            "failed",
+            {"target_id": transaction_id, "message": error_message},
+            notify=self.notify_final_transitions,
+        )
+        return bool(failed)
+
+    async def mark_many_failed(self, transaction_ids: List[str], *, error_message: str) -> List[str]:
+        return await self._transition_processing(
+            "failed",
+            {"target_ids": list(transaction_ids), "message": error_message},
+            notify=self.notify_final_transitions,
+        )
+
+    async def _transition_processing(self, kind: str, params: dict[str, Any], *, notify: bool = False) -> List[str]:
+        # Guarded UPDATE ... WHERE status = 'PROCESSING' RETURNING: one round trip per transition, and
+        # concurrent processors cannot both move the same row out of PROCESSING.
+        stmt = _transition_stmt(kind, many="target_ids" in params, notify=notify)
+        rows = (await self.db.execute(stmt, params)).all()
         await self.db.commit()
+        if kind == "processed":
+            for row in rows:
+                processing_lag_seconds.observe(float(row[1]))
+        return [row[0] for row in rows]
+
+
+@lru_cache(maxsize=None)
+def _transition_stmt(kind: str, *, many: bool, notify: bool) -> Executable:
+    # Built on the Core table: the processor never holds these rows in its session, so the ORM's
+    # bulk-update bookkeeping (session synchronization) would be pure per-call overhead.
+    returning: list[ColumnElement[Any]] = [_TRANSACTIONS.c.transaction_id]
+    if kind == "processed":
+        returning.append(
+            func.extract("epoch", _TRANSACTIONS.c.processed_at - _TRANSACTIONS.c.created_at).label("lag_seconds")
+        )
+    # Bind names must differ from the SET columns, hence target_id(s) rather than transaction_id(s).
+    # Only PROCESSING rows can transition, and each has a pending_transactions row locating its partition.
+    if many:
+        condition = _in_partitions_of(_PENDING, bindparam("target_ids", type_=ARRAY(String)), many=True)
+    else:
+        condition = _in_partitions_of(_PENDING, bindparam("target_id", type_=String), many=False)
+    values = _TRANSITION_VALUES[kind]
+    stmt = update(_TRANSACTIONS).where(condition, _IS_PROCESSING).values(**values).returning(*returning)
+    if notify:
+        # pg_notify in the same statement: listeners hear about a transition only once it commits.
+        transitioned = stmt.cte("transitioned")
+        stmt = select(
+            *transitioned.c,
+            func.pg_notify(
+                TRANSACTION_STATUS_CHANNEL, literal(f"{values['status'].value}:") + transitioned.c.transaction_id
+            ),
+        )
+    return stmt
+
+
+def _is_pending() -> ColumnElement[bool]:
+    return tuple_(Transaction.transaction_id, Transaction.created_at).in_(
+        select(PendingTransaction.transaction_id, PendingTransaction.created_at)
+    )
+
+
+def is_stale(transaction: Transaction, stale_cutoff: datetime) -> bool:
+    # Only PROCESSING rows without final timestamp are eligible for retry checks.
+    if transaction.status != TransactionStatus.PROCESSING or transaction.processed_at is not None:
+        return False
+    return transaction.processing_started_at is None or transaction.processing_started_at < stale_cutoff
@@ -0,0 +1,52 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.pool import QueuePool
+
+from app.utils import db as db_core
+from app.utils.metrics import registry
+from app.utils.runtime import background_task_count
+from app.services.processor import get_processing_scheduler
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _queue_pool() -> QueuePool | None:
+    # Read through the module so tests/tools that swap the engine are reflected; NullPool has no stats.
+    pool = db_core.engine.pool
+    return pool if isinstance(pool, QueuePool) else None
+
+
+def _pool_stat(read):
+    def _read() -> float | None:
+        pool = _queue_pool()
+        return read(pool) if pool is not None else None
+
+    return _read
+
+
+registry.gauge("background_tasks", "Tasks in the runtime background-task registry.", background_task_count)
+registry.gauge(
+    "processing_pending",
+    "Transactions waiting in the in-memory delay scheduler.",
+    lambda: get_processing_scheduler().pending,
+)
+registry.gauge(
+    "processing_in_flight",
+    "Transactions handed to processing workers.",
+    lambda: get_processing_scheduler().in_flight,
+)
+registry.gauge("db_pool_size", "Configured pool size.", _pool_stat(lambda pool: pool.size()))
+registry.gauge("db_pool_checked_out", "Connections currently checked out.", _pool_stat(lambda pool: pool.checkedout()))
+registry.gauge("db_pool_checked_in", "Idle connections in the pool.", _pool_stat(lambda pool: pool.checkedin()))
+registry.gauge(
+    "db_pool_overflow",
+    "Overflow connections in use (negative while below pool size).",
+    _pool_stat(lambda pool: pool.overflow()),
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,88 @@
+from fastapi import APIRouter
+
+from app.utils import db as db_core
+from app.utils.cache import transaction_cache
+from app.utils.config import settings
+from app.utils.duplicate_filter import duplicate_filter
+from app.utils.runtime import background_task_count
+from app.dto.runtime import CacheStats, DbPoolStats, ProcessingQueueStats, RuntimeStatsResponse, StatusNotifierStats
+from app.services.processor import get_processing_scheduler, rejected_processing_total
+from app.services.status_notifier import get_status_notifier
+
+router = APIRouter(prefix="/v1/runtime", tags=["runtime"])
+
+
+def _db_pool_stats() -> DbPoolStats:
+    pool = db_core.instrumented_pool()
+    if pool is None:
+        # NullPool (DB_POOL_MODE=none) keeps nothing open between checkouts.
+        return DbPoolStats(
+            mode=settings.db_pool_mode,
+            external_pooler=settings.db_external_pooler,
+            size=0,
+            max_overflow=0,
+            checked_out=0,
+            idle=0,
+            checkouts=0,
+            timeouts=0,
+            avg_wait_ms=0.0,
+            max_wait_ms=0.0,
+            resizes=0,
+        )
+    return DbPoolStats(
+        mode=settings.db_pool_mode,
+        external_pooler=settings.db_external_pooler,
+        size=pool.size(),
+        max_overflow=pool.max_overflow,
+        checked_out=pool.checkedout(),
+        idle=pool.checkedin(),
+        checkouts=pool.checkouts_total,
+        timeouts=pool.timeouts_total,
+        avg_wait_ms=pool.wait_seconds_total * 1000 / pool.checkouts_total if pool.checkouts_total else 0.0,
+        max_wait_ms=pool.max_wait_seconds * 1000,
+        resizes=pool.resizes_total,
+    )
+
+
+@router.get("/stats", response_model=RuntimeStatsResponse)
+async def runtime_stats() -> RuntimeStatsResponse:
+    scheduler = get_processing_scheduler()
+    notifier = get_status_notifier()
+    return RuntimeStatsResponse(
+        processing=ProcessingQueueStats(
+            mode=settings.processing_mode,
+            runner=settings.processing_runner,
+            overflow_policy=settings.processing_overflow_policy,
+            in_flight=scheduler.in_flight,
+            pending=scheduler.pending,
+            worker_count=scheduler.worker_count,
+            dispatch_batch_size=scheduler.batch_size,
+            max_pending=scheduler.max_pending,
+            max_in_flight=scheduler.max_in_flight,
+            background_tasks=background_task_count(),
+            overflow_total=scheduler.overflow_total,
+            rejected_total=rejected_processing_total(),
+        ),
+        transaction_cache=CacheStats(
+            enabled=settings.transaction_cache_enabled,
+            entries=len(transaction_cache),
+            max_entries=transaction_cache.max_entries,
+            hits=transaction_cache.hits,
+            misses=transaction_cache.misses,
+            evictions=transaction_cache.evictions,
+        ),
+        duplicate_filter=CacheStats(
+            enabled=settings.duplicate_filter_enabled,
+            entries=len(duplicate_filter),
+            max_entries=duplicate_filter.max_entries,
+            hits=duplicate_filter.hits,
+            misses=duplicate_filter.misses,
+            evictions=duplicate_filter.evictions,
+        ),
+        status_notifier=StatusNotifierStats(
+            enabled=settings.status_notify_enabled,
+            listening=notifier.listening,
+            subscribers=notifier.subscriber_count,
+        ),
+        db_pool=_db_pool_stats(),
+    )
@@ -1,17 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
+from app.utils.config import settings
 from app.utils.db import get_db
-from app.dto.transaction import TransactionOut
-from app.services.transaction_service import TransactionService
+from app.utils.enums import TransactionStatus
+from app.dto.transaction import TransactionLookupOut, TransactionOut, TransactionPage
+from app.services.transaction_service import InvalidCursorError, TransactionService, stream_transaction_events
 
 router = APIRouter(prefix="/v1/transactions", tags=["transactions"])
 
 def get_service(db: AsyncSession = Depends(get_db)) -> TransactionService:
     return TransactionService(db)
 
+@router.get("", response_model=TransactionPage, status_code=status.HTTP_200_OK)
+async def list_transactions(
+    transaction_status: TransactionStatus | None = Query(default=None, alias="status"),
+    source_account: str | None = Query(default=None, max_length=128),
+    destination_account: str | None = Query(default=None, max_length=128),
+    currency: str | None = Query(default=None, min_length=3, max_length=3),
+    created_from: datetime | None = Query(default=None, description="Inclusive lower bound on created_at"),
+    created_to: datetime | None = Query(default=None, description="Exclusive upper bound on created_at"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=50, ge=1, le=settings.transaction_list_max_limit),
+    service: TransactionService = Depends(get_service),
+) -> TransactionPage:
+    try:
+        return await service.list_transactions(
+            status=transaction_status,
+            source_account=source_account,
+            destination_account=destination_account,
+            currency=currency,
+            created_from=created_from,
+            created_to=created_to,
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
 @router.get("/{transaction_id}", response_model=List[TransactionOut], status_code=status.HTTP_200_OK)
-async def get_transaction(transaction_id: str, service: TransactionService = Depends(get_service)) -> List[TransactionOut]:
-    transactions = await service.get_transaction_by_id(transaction_id)
-    return transactions
+async def get_transaction(
+    transaction_id: str,
+    wait: float | None = Query(
+        default=None,
+        gt=0,
+        le=settings.transaction_wait_max_seconds,
+        description="Long-poll: wait up to this many seconds for PROCESSED/FAILED before answering",
+    ),
+    service: TransactionService = Depends(get_service),
+) -> Response:
+    # Body is already serialized (and possibly cached); skip response_model re-validation.
+    if wait:
+        body = await service.wait_for_transaction_json(transaction_id, timeout=wait)
+    else:
+        body = await service.get_transaction_json_by_id(transaction_id)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/{transaction_id}/events", response_class=StreamingResponse)
+async def stream_transaction(
+    transaction_id: str,
+    wait: float = Query(
+        default=settings.transaction_wait_max_seconds,
+        gt=0,
+        le=settings.transaction_wait_max_seconds,
+        description="Close the stream after this many seconds if the transaction is still not final",
+    ),
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_transaction_events(transaction_id, timeout=wait),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(":lookup", response_model=TransactionLookupOut, status_code=status.HTTP_200_OK)
+async def lookup_transactions(
+    transaction_ids: List[str] = Body(embed=True, min_length=1, max_length=settings.transaction_lookup_max_ids),
+    service: TransactionService = Depends(get_service),
+) -> StreamingResponse:
+    body = await service.lookup_transactions_json(transaction_ids)
+    return StreamingResponse(body, media_type="application/json")
@@ -1,14 +1,21 @@
 import asyncio
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from time import perf_counter_ns
+from typing import List
 
 from app.utils.config import settings
 from app.utils.db import get_db
-from app.dto.webhook import TransactionWebhookAck, TransactionWebhookIn
-from app.services.processor import schedule_transaction_processing
+from app.utils.metrics import webhook_batch_ingest_seconds, webhook_batch_items_total, webhook_ingest_seconds
+from app.utils.timing import record_since_request_start, stage
+from app.dto.webhook import TransactionWebhookAck, TransactionWebhookBatchAck, TransactionWebhookIn
+from app.services.processor import (
+    ProcessingBackpressureError,
+    ensure_processing_capacity,
+    schedule_transaction_processing,
+)
 from app.services.webhook_service import WebhookService
 
 router = APIRouter(prefix="/v1/webhooks", tags=["webhooks"])
@@ -19,25 +26,46 @@ def get_service(db: AsyncSession = Depends(get_db)) -> WebhookService:
     return WebhookService(db)
 
 
-@router.post(
-    "/transactions",
-    response_model=TransactionWebhookAck,
-    status_code=status.HTTP_202_ACCEPTED,
-)
-async def receive_transaction_webhook(
-    payload: TransactionWebhookIn,
-    service: WebhookService = Depends(get_service),
-) -> TransactionWebhookAck:
-    started_ns = perf_counter_ns()
+def _elapsed_seconds(started_ns: int) -> float:
+    return (perf_counter_ns() - started_ns) / 1_000_000_000
+
+
+async def _check_processing_capacity() -> None:
     try:
-        transaction_id, should_schedule = await asyncio.wait_for(
-            service.ingest_transaction_webhook(payload),
+        await ensure_processing_capacity()
+    except ProcessingBackpressureError as exc:
+        logger.warning("Rejecting webhook: background processing saturated")
+        raise HTTPException(
+            status_code=settings.processing_overflow_status_code,
+            detail="Background processing saturated",
+            headers={"Retry-After": str(exc.retry_after_seconds)},
+        ) from exc
+
+
+async def ingest_single_webhook(
+    payload: TransactionWebhookIn, service: WebhookService, started_ns: int
+) -> tuple[str, float]:
+    """Capacity check, ingest, scheduling and metrics for one webhook; returns (transaction_id, response_time_ms).
+
+    Shared with the raw ASGI fast path (app/router/webhook_fast_path.py), so both report identical outcomes.
+    """
+    try:
+        with stage("capacity"):
+            await _check_processing_capacity()
+    except HTTPException:
+        webhook_ingest_seconds.observe(_elapsed_seconds(started_ns), "rejected")
+        raise
+    try:
+        transaction_id, outcome, should_schedule = await asyncio.wait_for(
+            service.ingest_transaction_webhook_with_outcome(payload),
             timeout=settings.db_operation_timeout_seconds,
         )
     except asyncio.TimeoutError as exc:
+        webhook_ingest_seconds.observe(_elapsed_seconds(started_ns), "timeout")
         logger.exception("Webhook ingest timed out")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database operation timed out") from exc
     except SQLAlchemyError as exc:
+        webhook_ingest_seconds.observe(_elapsed_seconds(started_ns), "db_error")
         logger.exception("Webhook ingest DB error")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database unavailable") from exc
 
@@ -49,8 +77,76 @@ async def receive_transaction_webhook(
         )
 
     elapsed_ms = (perf_counter_ns() - started_ns) / 1_000_000
+    webhook_ingest_seconds.observe(elapsed_ms / 1000, outcome.value.lower())
+    return transaction_id, round(elapsed_ms, 3)
+
+
+@router.post(
+    "/transactions",
+    response_model=TransactionWebhookAck,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def receive_transaction_webhook(
+    payload: TransactionWebhookIn,
+    service: WebhookService = Depends(get_service),
+) -> TransactionWebhookAck:
+    started_ns = perf_counter_ns()
+    record_since_request_start("validate")
+    transaction_id, response_time_ms = await ingest_single_webhook(payload, service, started_ns)
     return TransactionWebhookAck(
         transaction_id=transaction_id,
         status_code=202,
-        response_time_ms=round(elapsed_ms, 3),
+        response_time_ms=response_time_ms,
     )
+
+
+@router.post(
+    "/transactions:batch",
+    response_model=List[TransactionWebhookBatchAck],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def receive_transaction_webhook_batch(
+    payloads: List[TransactionWebhookIn] = Body(min_length=1, max_length=settings.webhook_batch_max_items),
+    service: WebhookService = Depends(get_service),
+) -> List[TransactionWebhookBatchAck]:
+    started_ns = perf_counter_ns()
+    record_since_request_start("validate")
+    try:
+        with stage("capacity"):
+            await _check_processing_capacity()
+    except HTTPException:
+        webhook_batch_ingest_seconds.observe(_elapsed_seconds(started_ns), "rejected")
+        raise
+    try:
+        results = await asyncio.wait_for(
+            service.ingest_transaction_webhooks(payloads),
+            timeout=settings.db_operation_timeout_seconds,
+        )
+    except asyncio.TimeoutError as exc:
+        webhook_batch_ingest_seconds.observe(_elapsed_seconds(started_ns), "timeout")
+        logger.exception("Webhook batch ingest timed out")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database operation timed out") from exc
+    except SQLAlchemyError as exc:
+        webhook_batch_ingest_seconds.observe(_elapsed_seconds(started_ns), "db_error")
+        logger.exception("Webhook batch ingest DB error")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database unavailable") from exc
+
+    for transaction_id, outcome, should_schedule in results:
+        webhook_batch_items_total.inc(outcome.value.lower())
+        if should_schedule:
+            schedule_transaction_processing(
+                transaction_id=transaction_id,
+                processing_delay_seconds=settings.processing_delay_seconds,
+            )
+
+    webhook_batch_ingest_seconds.observe(_elapsed_seconds(started_ns), "ok")
+    elapsed_ms = round((perf_counter_ns() - started_ns) / 1_000_000, 3)
+    return [
+        TransactionWebhookBatchAck(
+            transaction_id=transaction_id,
+            status_code=202,
+            response_time_ms=elapsed_ms,
+            outcome=outcome,
+        )
+        for transaction_id, outcome, _ in results
+    ]
@@ -0,0 +1,120 @@
+import logging
+from json.encoder import encode_basestring
+from time import perf_counter_ns
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from starlette.responses import JSONResponse
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.timing import record_since_request_start
+from app.dto.webhook import TransactionWebhookIn
+from app.router.routes_webhooks import ingest_single_webhook
+from app.services.webhook_service import WebhookService
+
+logger = logging.getLogger(__name__)
+
+_PATH = "/v1/webhooks/transactions"
+# pydantic-core parses the raw bytes itself (no json.loads into dicts first) with the model's compiled validator.
+_validate_json = TransactionWebhookIn.model_validate_json
+
+# The ack JSONResponse would render for TransactionWebhookAck, split around its two variable fields.
+_ACK_PREFIX = b'{"status_code":202,"acknowledged":true,"transaction_id":'
+_ACK_MIDDLE = b',"response_time_ms":'
+_ACK_SUFFIX = b"}"
+_CONTENT_TYPE = (b"content-type", b"application/json")
+
+
+def _is_json(headers: list[tuple[bytes, bytes]]) -> bool:
+    for name, value in headers:
+        if name == b"content-type":
+            return value.split(b";", 1)[0].strip().lower() == b"application/json"
+    return False
+
+
+def render_ack(transaction_id: str, response_time_ms: float) -> bytes:
+    # encode_basestring matches JSONResponse's ensure_ascii=False; repr(float) is what json.dumps writes.
+    return b"".join(
+        (
+            _ACK_PREFIX,
+            encode_basestring(transaction_id).encode("utf-8"),
+            _ACK_MIDDLE,
+            repr(response_time_ms).encode("ascii"),
+            _ACK_SUFFIX,
+        )
+    )
+
+
+class WebhookFastPathMiddleware:
+    """Pure ASGI fast path for `POST /v1/webhooks/transactions`, active when WEBHOOK_FAST_PATH_ENABLED.
+
+    Skips routing, dependency injection, ack model construction and generic JSON encoding. Requests it does
+    not accept as-is (other content types, payloads failing validation) are replayed into the regular route,
+    so error responses stay exactly the same.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.webhook_fast_path_enabled
+            or scope["path"] != _PATH
+            or scope["method"] != "POST"
+            or not _is_json(scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        chunks: list[bytes] = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+
+        try:
+            payload = _validate_json(body)
+        except ValidationError:
+            await self.app(scope, _replay(body, receive), send)
+            return
+
+        started_ns = perf_counter_ns()
+        record_since_request_start("validate")
+        try:
+            async with db_core.SessionLocal() as db:
+                transaction_id, response_time_ms = await ingest_single_webhook(
+                    payload, WebhookService(db), started_ns
+                )
+        except HTTPException as exc:
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+            await response(scope, receive, send)
+            return
+
+        ack = render_ack(transaction_id, response_time_ms)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 202,
+                "headers": [(b"content-length", str(len(ack)).encode("ascii")), _CONTENT_TYPE],
+            }
+        )
+        await send({"type": "http.response.body", "body": ack})
+
+
+def _replay(body: bytes, receive):
+    replayed = False
+
+    async def replay_receive():
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay_receive
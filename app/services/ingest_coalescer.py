@@ -0,0 +1,87 @@
+import asyncio
+import contextvars
+import logging
+from time import perf_counter
+from weakref import WeakKeyDictionary
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.enums import WebhookIngestOutcome
+from app.utils.runtime import register_background_task
+from app.utils.timing import record_stage
+from app.dto.webhook import TransactionWebhookIn
+from app.services.webhook_service import WebhookService
+
+logger = logging.getLogger(__name__)
+
+_coalescers: WeakKeyDictionary[asyncio.AbstractEventLoop, "IngestCoalescer"] = WeakKeyDictionary()
+
+
+class IngestCoalescer:
+    """Collects concurrent single-item ingests and flushes them as one multi-row insert/commit."""
+
+    def __init__(self, *, max_items: int, max_wait_seconds: float):
+        self.max_items = max_items
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: list[tuple[TransactionWebhookIn, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def submit(self, payload: TransactionWebhookIn) -> tuple[str, WebhookIngestOutcome, bool]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self.max_items:
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_seconds, self._start_flush)
+        started = perf_counter()
+        try:
+            return await future
+        finally:
+            # The shared flush runs outside every caller's context; each caller times its own wait.
+            record_stage("coalesce_wait", perf_counter() - started)
+
+    def _start_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        # Flush runs as its own task so a caller timing out never cancels the shared insert, and in an
+        # empty context so its stages are not charged to whichever request triggered it.
+        register_background_task(asyncio.create_task(self._flush(batch), context=contextvars.Context()))
+
+    async def _flush(self, batch: list[tuple[TransactionWebhookIn, asyncio.Future]]) -> None:
+        try:
+            async with db_core.SessionLocal() as db:
+                # Submitters already consulted the duplicate filter before queueing.
+                results = await WebhookService(db).ingest_transaction_webhooks(
+                    [payload for payload, _ in batch], use_duplicate_filter=False
+                )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Coalesced ingest flush failed. batch_size=%s", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def get_ingest_coalescer() -> IngestCoalescer:
+    loop = asyncio.get_running_loop()
+    coalescer = _coalescers.get(loop)
+    if coalescer is None:
+        coalescer = IngestCoalescer(
+            max_items=settings.ingest_coalesce_max_items,
+            max_wait_seconds=settings.ingest_coalesce_max_wait_ms / 1000,
+        )
+        _coalescers[loop] = coalescer
+    return coalescer
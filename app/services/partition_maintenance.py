@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import re
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.runtime import get_shutdown_event, register_background_task
+from app.utils.time import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Any constant works as long as every process uses the same one; only one maintains partitions at a time.
+_MAINTENANCE_LOCK_KEY = 7420190001
+_PARTITION_NAME = re.compile(r"^transactions_p(\d{4})(\d{2})$")
+
+
+class PartitioningNotInstalledError(RuntimeError):
+    pass
+
+
+def _month_start(value: datetime) -> datetime:
+    # Monthly bounds are UTC midnights so every process computes the same partition for a timestamp.
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"transactions_p{month.year:04d}{month.month:02d}"
+
+
+def is_partition_table(name: str) -> bool:
+    # Monthly partitions (attached, or detached for archiving) and the catch-all; none are declared in the models.
+    return name == "transactions_default" or _PARTITION_NAME.match(name) is not None
+
+
+def autogenerate_include_name(name: str | None, type_: str, parent_names: dict) -> bool:
+    """Alembic `include_name` hook: leaves partitions and their indexes out of autogenerate and `alembic check`."""
+    if type_ == "table":
+        return name is None or not is_partition_table(name)
+    table_name = parent_names.get("table_name")
+    return table_name is None or not is_partition_table(table_name)
+
+
+async def _existing_partitions(conn: AsyncConnection) -> set[str]:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits AS i"
+            " JOIN pg_class AS child ON child.oid = i.inhrelid"
+            " WHERE i.inhparent = 'transactions'::regclass"
+        )
+    )
+    return set(result.scalars().all())
+
+
+async def _ensure_partitioned(conn: AsyncConnection) -> None:
+    relkind = (
+        await conn.execute(text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass('transactions')"))
+    ).scalar_one_or_none()
+    if relkind != "p":
+        raise PartitioningNotInstalledError(
+            "transactions is not a partitioned table; run `alembic upgrade head` before starting the service"
+        )
+
+
+async def create_future_partitions(conn: AsyncConnection, *, now: datetime, premake_months: int) -> list[str]:
+    existing = await _existing_partitions(conn)
+    created: list[str] = []
+    month = _month_start(now)
+    for _ in range(premake_months + 1):
+        name = partition_name(month)
+        if name not in existing:
+            # A savepoint per partition: one that cannot be created (e.g. the default partition already holds
+            # rows in its range) must not roll back the others.
+            try:
+                async with conn.begin_nested():
+                    await conn.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF transactions"
+                            f" FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+                            # Free space on each page lets status transitions be HOT updates.
+                            f" WITH (fillfactor = {settings.transactions_fillfactor})"
+                        )
+                    )
+            except DBAPIError:
+                logger.exception("Could not create partition %s", name)
+            else:
+                created.append(name)
+        month = _add_months(month, 1)
+    return created
+
+
+async def retire_old_partitions(
+    conn: AsyncConnection, *, now: datetime, retention_months: int, action: str
+) -> list[str]:
+    if retention_months <= 0:
+        return []
+    # Keep the current month plus `retention_months` full months before it.
+    cutoff = _add_months(_month_start(now), -retention_months)
+    retired: list[str] = []
+    for name in sorted(await _existing_partitions(conn)):
+        match = _PARTITION_NAME.match(name)
+        if match is None:
+            continue
+        month = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+        if month >= cutoff:
+            continue
+        async with conn.begin_nested():
+            # Keys first, partition second, in one transaction: a redelivery of a retired ID waits on the
+            # deleted key rows and, once this commits, is ingested as new instead of matching a vanished row.
+            bounds = {"lower": month, "upper": _add_months(month, 1)}
+            await conn.execute(
+                text("DELETE FROM transaction_keys WHERE created_at >= :lower AND created_at < :upper"), bounds
+            )
+            # Dropping or detaching a partition fires no row triggers; unfinished rows leave the queue here.
+            await conn.execute(
+                text("DELETE FROM pending_transactions WHERE created_at >= :lower AND created_at < :upper"), bounds
+            )
+            if action == "drop":
+                await conn.execute(text(f"DROP TABLE {name}"))
+            else:
+                await conn.execute(text(f"ALTER TABLE transactions DETACH PARTITION {name}"))
+        retired.append(name)
+    return retired
+
+
+async def run_partition_maintenance(*, now: datetime | None = None) -> tuple[list[str], list[str]]:
+    now = now or utcnow()
+    async with db_core.engine.begin() as conn:
+        await _ensure_partitioned(conn)
+        locked = await conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _MAINTENANCE_LOCK_KEY})
+        if not locked.scalar():
+            return [], []
+        created = await create_future_partitions(conn, now=now, premake_months=settings.partition_premake_months)
+        retired = await retire_old_partitions(
+            conn,
+            now=now,
+            retention_months=settings.partition_retention_months,
+            action=settings.partition_retention_action,
+        )
+    if created:
+        logger.info("Created transaction partitions: %s", ", ".join(created))
+    if retired:
+        logger.info("Retired (%s) transaction partitions: %s", settings.partition_retention_action, ", ".join(retired))
+    return created, retired
+
+
+async def run_partition_maintainer() -> None:
+    shutdown_event = get_shutdown_event()
+    while True:
+        try:
+            await asyncio.wait_for(shutdown_event.wait(), timeout=settings.partition_maintenance_interval_seconds)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await run_partition_maintenance()
+        except Exception:  # noqa: BLE001
+            logger.exception("Partition maintenance failed")
+
+
+def start_partition_maintainer() -> None:
+    # The first run happens synchronously at startup; this loop covers month rollovers and retention.
+    register_background_task(asyncio.create_task(run_partition_maintainer()))
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+
+from sqlalchemy.util import greenlet_spawn
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.runtime import get_shutdown_event, register_background_task
+
+logger = logging.getLogger(__name__)
+
+# Grow when at least this share of a window's checkouts were slow; one slow checkout in 20 is noise.
+_SLOW_SHARE_TO_GROW = 0.05
+
+
+def next_pool_size(size: int, window: db_core.PoolWaitWindow, *, min_size: int, max_size: int) -> int:
+    """Grow fast while checkouts wait, shrink one connection at a time while the pool has idle headroom."""
+    if window.timeouts or (window.checkouts and window.slow_checkouts >= window.checkouts * _SLOW_SHARE_TO_GROW):
+        # Keep what the window actually used, overflow included, so those connections stop being reopened.
+        target = max(size + max(1, size // 4), window.peak_checked_out)
+    elif window.peak_checked_out + 1 < size:
+        target = size - 1
+    else:
+        target = size
+    return min(max(target, min_size), max_size)
+
+
+async def autoscale_pool(pool: db_core.InstrumentedAsyncQueuePool) -> int:
+    size = pool.size()
+    target = next_pool_size(
+        size,
+        pool.take_window(),
+        min_size=settings.db_pool_adaptive_min_size,
+        max_size=settings.db_pool_adaptive_max_size,
+    )
+    if target != size:
+        pool.resize(target)
+        if target < size:
+            # Closing asyncpg connections goes through SQLAlchemy's sync pool API, hence the greenlet.
+            await greenlet_spawn(pool.close_surplus_idle)
+        logger.info("DB pool resized from %s to %s connections", size, target)
+    return target
+
+
+async def run_pool_autoscaler() -> None:
+    shutdown_event = get_shutdown_event()
+    while True:
+        try:
+            await asyncio.wait_for(shutdown_event.wait(), timeout=settings.db_pool_adaptive_interval_seconds)
+            return
+        except asyncio.TimeoutError:
+            pass
+        pool = db_core.instrumented_pool()
+        if pool is None:
+            continue
+        try:
+            await autoscale_pool(pool)
+        except Exception:  # noqa: BLE001
+            logger.exception("DB pool autoscaling failed")
+
+
+def start_pool_autoscaler() -> None:
+    register_background_task(asyncio.create_task(run_pool_autoscaler()))
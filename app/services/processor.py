@@ -1,79 +1,112 @@
 import asyncio
 import logging
+from time import perf_counter
+from weakref import WeakKeyDictionary
 
 from app.utils import db as db_core
-from app.utils.enums import TransactionStatus
-from app.utils.runtime import get_shutdown_event, register_background_task
+from app.utils.cache import transaction_cache
+from app.utils.config import settings
+from app.utils.metrics import processing_batch_seconds
+from app.utils.scheduler import DelayedBatchScheduler
 from app.utils.time import utcnow
-from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.factory import AnyTransactionRepository, get_transaction_repository
 
 logger = logging.getLogger(__name__)
 
+_schedulers: WeakKeyDictionary[asyncio.AbstractEventLoop, DelayedBatchScheduler] = WeakKeyDictionary()
+_rejected_totals: WeakKeyDictionary[asyncio.AbstractEventLoop, int] = WeakKeyDictionary()
 
-def schedule_transaction_processing(transaction_id: str, processing_delay_seconds: int) -> None:
-    task = asyncio.create_task(
-        process_transaction_background(
-            transaction_id=transaction_id,
-            processing_delay_seconds=processing_delay_seconds,
+
+class ProcessingBackpressureError(Exception):
+    def __init__(self, retry_after_seconds: int):
+        super().__init__("Background processing is saturated")
+        self.retry_after_seconds = retry_after_seconds
+
+
+def get_processing_scheduler() -> DelayedBatchScheduler:
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = DelayedBatchScheduler(
+            complete_transaction_processing_batch,
+            worker_count=settings.processing_worker_count,
+            batch_size=settings.processing_dispatch_batch_size,
+            max_pending=settings.processing_max_pending,
+            max_in_flight=settings.processing_max_in_flight,
         )
-    )
-    register_background_task(task)
+        _schedulers[loop] = scheduler
+    return scheduler
 
-    def _log_task_result(done_task: asyncio.Task) -> None:
-        try:
-            done_task.result()
-        except asyncio.CancelledError:
-            # Expected during graceful shutdown task draining.
-            return
-        except Exception:  # noqa: BLE001
-            logger.exception("Background processing task failed. transaction_id=%s", transaction_id)
 
-    task.add_done_callback(_log_task_result)
+def _final_transition_repository(db) -> AnyTransactionRepository:
+    # Final transitions wake status waiters (long-poll/SSE) through NOTIFY when enabled.
+    return get_transaction_repository(db, notify_final_transitions=settings.status_notify_enabled)
 
 
-async def process_transaction_background(
-    transaction_id: str, processing_delay_seconds: int, fail_for_testing: bool = False
-) -> None:
-    shutdown_event = get_shutdown_event()
-    async with db_core.SessionLocal() as db:
-        repository = TransactionRepository(db)
-        transaction = await repository.get_one_by_transaction_id(transaction_id)
-        if transaction is None or transaction.status != TransactionStatus.PROCESSING:
-            return
-        # Stamp start time once so stale retries can be detected.
-        await repository.ensure_processing_started(transaction, now=utcnow())
+def uses_durable_queue() -> bool:
+    # With separate worker processes the API holds nothing in memory; workers claim due rows from Postgres.
+    return settings.processing_mode == "queue" or settings.processing_runner == "worker"
 
-    try:
-        try:
-            # Wait for either shutdown signal or simulated processing delay.
-            await asyncio.wait_for(shutdown_event.wait(), timeout=processing_delay_seconds)
-            async with db_core.SessionLocal() as db:
-                repository = TransactionRepository(db)
-                transaction = await repository.get_one_by_transaction_id(transaction_id)
-                if transaction is not None and transaction.status == TransactionStatus.PROCESSING:
-                    # Leave row retryable when shutdown interrupts in-flight processing.
-                    await repository.mark_interrupted(
-                        transaction,
-                        message="Processing interrupted by shutdown; eligible for retry",
-                    )
-            return
-        except asyncio.TimeoutError:
-            pass
-
-        if fail_for_testing:
-            raise RuntimeError("Simulated processing failure")
 
+def rejected_processing_total() -> int:
+    return _rejected_totals.get(asyncio.get_running_loop(), 0)
+
+
+async def ensure_processing_capacity() -> None:
+    # Checked before ingest so a rejected webhook leaves no row behind for the sender's retry to trip over.
+    if uses_durable_queue() or settings.processing_overflow_policy == "defer":
+        return
+    scheduler = get_processing_scheduler()
+    if scheduler.has_capacity():
+        return
+    if settings.processing_overflow_policy == "block" and await scheduler.wait_for_capacity(
+        settings.processing_overflow_block_seconds
+    ):
+        return
+    loop = asyncio.get_running_loop()
+    _rejected_totals[loop] = _rejected_totals.get(loop, 0) + 1
+    raise ProcessingBackpressureError(settings.processing_overflow_retry_after_seconds)
+
+
+def schedule_transaction_processing(transaction_id: str, processing_delay_seconds: int) -> None:
+    if uses_durable_queue():
+        # Queue workers claim the persisted PROCESSING row once it is due; nothing to hold in memory.
+        return
+    # One heap entry per transaction behind a single timer instead of one sleeping task each.
+    if not get_processing_scheduler().submit(transaction_id, processing_delay_seconds):
+        # Row stays PROCESSING in Postgres and is picked up again by stale-row retry.
+        logger.warning("Processing scheduler saturated; deferred transaction_id=%s", transaction_id)
+
+
+async def complete_transaction_processing_batch(transaction_ids: list[str]) -> None:
+    started = perf_counter()
+    try:
         async with db_core.SessionLocal() as db:
-            repository = TransactionRepository(db)
-            transaction = await repository.get_one_by_transaction_id(transaction_id)
-            if transaction is None or transaction.status != TransactionStatus.PROCESSING:
-                return
-            await repository.mark_processed(transaction, processed_at=utcnow())
+            processed = await _final_transition_repository(db).mark_many_processed(
+                transaction_ids, processed_at=utcnow()
+            )
+        transaction_cache.invalidate_many(processed)
+        processing_batch_seconds.observe(perf_counter() - started, "processed")
     except Exception as exc:  # noqa: BLE001
+        logger.exception("Batch processing failed. batch_size=%s", len(transaction_ids))
         # Persist failures to avoid silent drops and aid debugging.
         async with db_core.SessionLocal() as db:
-            repository = TransactionRepository(db)
-            transaction = await repository.get_one_by_transaction_id(transaction_id)
-            if transaction is None or transaction.status != TransactionStatus.PROCESSING:
-                return
-            await repository.mark_failed(transaction, error_message=str(exc))
+            failed = await _final_transition_repository(db).mark_many_failed(transaction_ids, error_message=str(exc))
+        transaction_cache.invalidate_many(failed)
+        processing_batch_seconds.observe(perf_counter() - started, "failed")
+
+
+async def interrupt_pending_processing() -> None:
+    scheduler = _schedulers.get(asyncio.get_running_loop())
+    if scheduler is None:
+        return
+    transaction_ids = scheduler.take_pending()
+    if not transaction_ids:
+        return
+    async with db_core.SessionLocal() as db:
+        # Leave rows retryable when shutdown interrupts in-flight processing.
+        interrupted = await get_transaction_repository(db).mark_many_interrupted(
+            transaction_ids,
+            message="Processing interrupted by shutdown; eligible for retry",
+        )
+    logger.info("Marked %s pending transactions as interrupted", len(interrupted))
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from datetime import timedelta
+from time import perf_counter
+
+from app.utils import db as db_core
+from app.utils.cache import transaction_cache
+from app.utils.config import settings
+from app.utils.metrics import processing_batch_seconds
+from app.utils.runtime import get_shutdown_event, register_background_task
+from app.utils.time import utcnow
+from app.repositories.factory import get_transaction_repository
+
+logger = logging.getLogger(__name__)
+
+
+async def process_due_transactions(*, processing_delay_seconds: int, batch_size: int) -> int:
+    # Claim and finish in one DB transaction: a crash before commit releases the row locks
+    # and leaves the rows due for any other worker, so no work lives only in process memory.
+    async with db_core.SessionLocal() as db:
+        repository = get_transaction_repository(db, notify_final_transitions=settings.status_notify_enabled)
+        claimed = await repository.claim_due_for_processing(
+            due_before=utcnow() - timedelta(seconds=processing_delay_seconds),
+            limit=batch_size,
+        )
+        if not claimed:
+            return 0
+        started = perf_counter()
+        # The guarded bulk UPDATE commits, releasing the claim locks in the same round trip.
+        processed = await repository.mark_many_processed(claimed, processed_at=utcnow())
+    transaction_cache.invalidate_many(processed)
+    processing_batch_seconds.observe(perf_counter() - started, "processed")
+    return len(processed)
+
+
+async def run_queue_worker(worker_index: int) -> None:
+    shutdown_event = get_shutdown_event()
+    logger.info("Queue worker started. worker_index=%s", worker_index)
+    while not shutdown_event.is_set():
+        try:
+            processed = await process_due_transactions(
+                processing_delay_seconds=settings.processing_delay_seconds,
+                batch_size=settings.queue_claim_batch_size,
+            )
+        except Exception:  # noqa: BLE001
+            logger.exception("Queue worker batch failed. worker_index=%s", worker_index)
+            processed = 0
+
+        # A full batch means more rows are likely due; claim again without sleeping.
+        if processed >= settings.queue_claim_batch_size:
+            continue
+        try:
+            await asyncio.wait_for(shutdown_event.wait(), timeout=settings.queue_poll_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_queue_workers(worker_count: int) -> None:
+    for worker_index in range(worker_count):
+        register_background_task(asyncio.create_task(run_queue_worker(worker_index)))
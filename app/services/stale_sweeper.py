@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.runtime import get_shutdown_event, register_background_task
+from app.utils.time import utcnow
+from app.repositories.factory import get_transaction_repository
+from app.services.processor import get_processing_scheduler, schedule_transaction_processing, uses_durable_queue
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_stale_transactions(*, max_rows: int, batch_size: int) -> list[str]:
+    if not uses_durable_queue():
+        # Never reclaim more than the scheduler can hold, or reclaimed rows would just go stale again.
+        scheduler = get_processing_scheduler()
+        max_rows = min(max_rows, scheduler.max_pending - scheduler.pending)
+
+    reclaimed: list[str] = []
+    while len(reclaimed) < max_rows:
+        limit = min(batch_size, max_rows - len(reclaimed))
+        now = utcnow()
+        async with db_core.SessionLocal() as db:
+            batch = await get_transaction_repository(db).reclaim_stale(
+                now=now,
+                stale_cutoff=now - timedelta(seconds=settings.processing_stale_timeout_seconds),
+                limit=limit,
+            )
+        for transaction_id in batch:
+            schedule_transaction_processing(
+                transaction_id=transaction_id,
+                processing_delay_seconds=settings.processing_delay_seconds,
+            )
+        reclaimed.extend(batch)
+        if len(batch) < limit:
+            break
+    return reclaimed
+
+
+async def run_stale_sweeper() -> None:
+    shutdown_event = get_shutdown_event()
+    # First sweep runs at startup to recover rows left behind by a previous shutdown or crash.
+    while not shutdown_event.is_set():
+        try:
+            reclaimed = await sweep_stale_transactions(
+                max_rows=settings.stale_sweep_max_rows_per_sweep,
+                batch_size=settings.stale_sweep_batch_size,
+            )
+            if reclaimed:
+                logger.info("Stale sweeper reclaimed %s transactions", len(reclaimed))
+        except Exception:  # noqa: BLE001
+            logger.exception("Stale sweep failed")
+        try:
+            await asyncio.wait_for(shutdown_event.wait(), timeout=settings.stale_sweep_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_stale_sweeper() -> None:
+    register_background_task(asyncio.create_task(run_stale_sweeper()))
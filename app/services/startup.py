@@ -0,0 +1,53 @@
+import asyncio
+import logging
+
+import anyio
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.services.partition_maintenance import run_partition_maintenance
+
+logger = logging.getLogger(__name__)
+
+
+async def _prewarm_pool() -> None:
+    if settings.db_pool_prewarm_connections:
+        # Pay connection setup here, not inside the first burst of webhooks after a cold start.
+        opened = await db_core.prewarm_pool(settings.db_pool_prewarm_connections)
+        logger.info("Prewarmed %s pooled DB connections", opened)
+
+
+async def prepare_database() -> None:
+    """Startup DB work shared by the API lifespan and `python -m app.worker`, as DB_SCHEMA_CHECK selects."""
+    timeout = settings.db_operation_timeout_seconds
+    if settings.db_schema_check == "create":
+        logger.info("Validating DB connectivity")
+        await asyncio.wait_for(db_core.check_db_connection(), timeout=timeout)
+        logger.info("Database connection check successful")
+        if settings.db_auto_create:
+            # Reflects every table and enum; keeps local/dev databases usable without Alembic.
+            await db_core.ensure_tables_exist()
+            logger.info("Schema ensure step completed")
+        if settings.partition_maintenance_enabled:
+            # Before serving, so the current month's partition exists before its first insert.
+            await run_partition_maintenance()
+        await _prewarm_pool()
+        return
+
+    # The schema is managed elsewhere, so the probe and partition maintenance do not wait for each other.
+    if settings.db_schema_check == "alembic":
+        probe = db_core.verify_schema_revision()
+    else:
+        probe = db_core.check_db_connection()
+    steps = [asyncio.wait_for(probe, timeout=timeout)]
+    if settings.partition_maintenance_enabled:
+        steps.append(run_partition_maintenance())
+    await asyncio.gather(*steps)
+    # Afterwards, so the connections those steps left idle are among the ones warmed.
+    await _prewarm_pool()
+    logger.info("Database ready (DB_SCHEMA_CHECK=%s)", settings.db_schema_check)
+
+
+def preload_request_path() -> None:
+    # anyio imports its asyncio backend on first use, which would otherwise be inside the first request.
+    anyio.get_cancelled_exc_class()
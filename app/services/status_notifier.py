@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from weakref import WeakKeyDictionary
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.utils.cache import transaction_cache
+from app.utils.config import settings
+from app.utils.db import _to_async_database_url
+from app.repositories.transaction_repository import TRANSACTION_STATUS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+_notifiers: WeakKeyDictionary[asyncio.AbstractEventLoop, "StatusNotifier"] = WeakKeyDictionary()
+
+
+def _listen_dsn() -> str:
+    url = make_url(_to_async_database_url(settings.database_url)).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class StatusNotifier:
+    """One dedicated LISTEN connection per process, fanning final status notifications out to local waiters."""
+
+    def __init__(self):
+        self._connection: asyncpg.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        self._subscribers: dict[str, set[asyncio.Queue[str]]] = {}
+
+    @property
+    def listening(self) -> bool:
+        if settings.repository_backend == "memory":
+            # The in-memory repository publishes transitions directly; there is nothing to LISTEN to.
+            return settings.status_notify_enabled
+        return self._connection is not None and not self._connection.is_closed()
+
+    async def ensure_listening(self) -> bool:
+        if not settings.status_notify_enabled:
+            return False
+        if settings.db_external_pooler and settings.repository_backend != "memory":
+            # LISTEN is session state: through a transaction-mode pooler it can succeed and still never deliver.
+            return False
+        if self.listening:
+            return True
+        async with self._connect_lock:
+            if self.listening:
+                return True
+            try:
+                connection = await asyncio.wait_for(
+                    asyncpg.connect(_listen_dsn()), timeout=settings.db_operation_timeout_seconds
+                )
+                await connection.add_listener(TRANSACTION_STATUS_CHANNEL, self._on_notification)
+            except Exception:  # noqa: BLE001
+                # e.g. transaction-mode poolers do not support LISTEN; waiters fall back to re-reading.
+                logger.warning("Status LISTEN connection unavailable; waiters will poll", exc_info=True)
+                return False
+            connection.add_termination_listener(self._on_terminated)
+            self._connection = connection
+        return True
+
+    @contextmanager
+    def subscribe(self, transaction_id: str) -> Iterator[asyncio.Queue[str]]:
+        # Subscribe before reading current state so a transition between the read and the wait is not missed.
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        self._subscribers.setdefault(transaction_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(transaction_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[transaction_id]
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.close()
+
+    def publish(self, status: str, transaction_id: str) -> None:
+        # Final rows changed in another process too; drop any cached PROCESSING body for them.
+        transaction_cache.invalidate(transaction_id)
+        for queue in self._subscribers.get(transaction_id, ()):
+            queue.put_nowait(status)
+
+    def _on_notification(self, _connection, _pid: int, _channel: str, payload: str) -> None:
+        status, _, transaction_id = payload.partition(":")
+        self.publish(status, transaction_id)
+
+    def _on_terminated(self, _connection) -> None:
+        logger.warning("Status LISTEN connection closed; reconnecting on next wait")
+        self._connection = None
+        # Notifications may have been lost; wake everyone so they re-read the row.
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait("")
+
+
+def get_status_notifier() -> StatusNotifier:
+    loop = asyncio.get_running_loop()
+    notifier = _notifiers.get(loop)
+    if notifier is None:
+        notifier = StatusNotifier()
+        _notifiers[loop] = notifier
+    return notifier
+
+
+async def close_status_notifier() -> None:
+    notifier = _notifiers.pop(asyncio.get_running_loop(), None)
+    if notifier is not None:
+        await notifier.close()
@@ -1,14 +1,170 @@
+import asyncio
+import base64
+from collections.abc import AsyncIterator
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.dto.transaction import TransactionOut
-from app.repositories.transaction_repository import TransactionRepository
+from app.utils import db as db_core
+from app.utils.cache import transaction_cache
+from app.utils.config import settings
+from app.utils.enums import TransactionStatus
+from app.dto.transaction import TransactionOut, TransactionPage, TransactionRow, dump_transaction_rows_json
+from app.repositories.factory import get_transaction_repository
+from app.services.status_notifier import get_status_notifier
+
+_string_list_adapter = TypeAdapter(List[str])
+_LOOKUP_CHUNK_SIZE = 500
+# Re-read interval for waiters when no LISTEN connection is available.
+_WAIT_FALLBACK_POLL_SECONDS = 1.0
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except ValueError as exc:
+        raise InvalidCursorError("invalid cursor") from exc
+
+
+def _is_final(rows: List[TransactionRow]) -> bool:
+    return bool(rows) and all(row.status != TransactionStatus.PROCESSING for row in rows)
+
+
+async def _wait_for_change(changes: asyncio.Queue[str], remaining: float, listening: bool) -> None:
+    timeout = remaining if listening else min(remaining, _WAIT_FALLBACK_POLL_SECONDS)
+    try:
+        await asyncio.wait_for(changes.get(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
 
 
 class TransactionService:
     def __init__(self, db: AsyncSession):
-        self.repository = TransactionRepository(db)
+        self.db = db
+        self.repository = get_transaction_repository(db)
+
+    async def get_transaction_rows(self, transaction_id: str) -> List[TransactionRow]:
+        return await self.repository.get_rows_by_transaction_id(transaction_id)
+
+    async def get_transaction_json_by_id(self, transaction_id: str) -> bytes:
+        # Read-through: cached bodies are the exact JSON the endpoint would otherwise serialize.
+        if settings.transaction_cache_enabled:
+            cached = transaction_cache.get(transaction_id)
+            if cached is not None:
+                return cached
+
+        rows = await self.get_transaction_rows(transaction_id)
+        body = dump_transaction_rows_json(rows)
+        # Empty results are not cached: the row may be inserted at any moment.
+        if settings.transaction_cache_enabled and rows:
+            transaction_cache.put(transaction_id, body, final=_is_final(rows))
+        return body
+
+    async def wait_for_transaction_json(self, transaction_id: str, *, timeout: float) -> bytes:
+        # Long-poll: returns as soon as the row is PROCESSED/FAILED, or its current state after `timeout`.
+        notifier = get_status_notifier()
+        await notifier.ensure_listening()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        with notifier.subscribe(transaction_id) as changes:
+            rows = await self.get_transaction_rows(transaction_id)
+            while not _is_final(rows):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                # Give the pooled connection back while parked.
+                await self.db.rollback()
+                await _wait_for_change(changes, remaining, notifier.listening)
+                rows = await self.get_transaction_rows(transaction_id)
+        return dump_transaction_rows_json(rows)
+
+    async def list_transactions(
+        self,
+        *,
+        status: TransactionStatus | None,
+        source_account: str | None,
+        destination_account: str | None,
+        currency: str | None,
+        created_from: datetime | None,
+        created_to: datetime | None,
+        cursor: str | None,
+        limit: int,
+    ) -> TransactionPage:
+        # One extra row tells us whether another page exists without a COUNT.
+        rows = await self.repository.list_page(
+            status=status,
+            source_account=source_account,
+            destination_account=destination_account,
+            currency=currency.upper() if currency else None,
+            created_from=created_from,
+            created_to=created_to,
+            after=_decode_cursor(cursor) if cursor else None,
+            limit=limit + 1,
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+        return TransactionPage(items=[TransactionOut.model_validate(txn) for txn in rows], next_cursor=next_cursor)
+
+    async def lookup_transactions_json(self, transaction_ids: List[str]) -> AsyncIterator[bytes]:
+        # One ANY() query for the whole request; the body is then streamed in serialized chunks.
+        requested = list(dict.fromkeys(transaction_ids))
+        found = await self.repository.get_rows_by_transaction_ids(requested)
+        by_id = {row.transaction_id: row for row in found}
+        ordered = [by_id[tid] for tid in requested if tid in by_id]
+        missing = [tid for tid in requested if tid not in by_id]
+        return _stream_lookup_body(ordered, missing)
+
+
+async def _stream_lookup_body(rows: List[TransactionRow], missing: List[str]) -> AsyncIterator[bytes]:
+    yield b'{"transactions":['
+    for start in range(0, len(rows), _LOOKUP_CHUNK_SIZE):
+        chunk = dump_transaction_rows_json(rows[start : start + _LOOKUP_CHUNK_SIZE])
+        yield (b"," if start else b"") + chunk[1:-1]
+    yield b'],"missing":' + _string_list_adapter.dump_json(missing) + b"}"
+
+
+async def stream_transaction_events(transaction_id: str, *, timeout: float) -> AsyncIterator[bytes]:
+    """Server-Sent Events: one `transaction` event per observed state, ending once the row is final or at `timeout`.
 
-    async def get_transaction_by_id(self, transaction_id: str) -> List[TransactionOut]:
-        transactions = await self.repository.get_by_transaction_id(transaction_id)
-        return [TransactionOut.model_validate(txn) for txn in transactions]
+    Uses its own short sessions because the stream outlives the request's dependency scope.
+    """
+    notifier = get_status_notifier()
+    await notifier.ensure_listening()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    keepalive = settings.transaction_events_keepalive_seconds
+    last_body = None
+    last_sent = loop.time()
+    with notifier.subscribe(transaction_id) as changes:
+        while True:
+            async with db_core.SessionLocal() as db:
+                rows = await TransactionService(db).get_transaction_rows(transaction_id)
+            body = dump_transaction_rows_json(rows)
+            if body != last_body:
+                last_body = body
+                last_sent = loop.time()
+                yield b"event: transaction\ndata: " + body + b"\n\n"
+            elif loop.time() - last_sent >= keepalive:
+                last_sent = loop.time()
+                yield b": keepalive\n\n"
+            remaining = deadline - loop.time()
+            if _is_final(rows) or remaining <= 0:
+                return
+            # Also re-read every keepalive interval, so a lost notification costs at most one interval.
+            await _wait_for_change(changes, min(remaining, keepalive), notifier.listening)
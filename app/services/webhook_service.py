@@ -1,10 +1,16 @@
+from collections import Counter
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.utils.config import settings
-from app.utils.enums import TransactionStatus
+from app.utils.duplicate_filter import duplicate_filter
+from app.utils.enums import TransactionStatus, WebhookIngestOutcome
 from app.utils.time import utcnow
+from app.utils.timing import stage
 from app.dto.webhook import TransactionWebhookIn
-from app.repositories.transaction_repository import TransactionRepository
+from app.models.transaction import Transaction
+from app.repositories.factory import get_transaction_repository
 from app.utils.idempotency import payload_hash
 
 import logging
@@ -13,38 +19,78 @@ logger = logging.getLogger(__name__)
 
 class WebhookService:
     def __init__(self, db: AsyncSession):
-        self.repository = TransactionRepository(db)
+        self.repository = get_transaction_repository(db)
 
     async def ingest_transaction_webhook(self, payload: TransactionWebhookIn) -> tuple[str, bool]:
+        transaction_id, _, should_schedule = await self.ingest_transaction_webhook_with_outcome(payload)
+        return transaction_id, should_schedule
+
+    async def ingest_transaction_webhook_with_outcome(
+        self, payload: TransactionWebhookIn
+    ) -> tuple[str, WebhookIngestOutcome, bool]:
         # Hashing lets us distinguish true duplicates from conflicting duplicates.
-        payload_digest = payload_hash(payload)
+        with stage("hash"):
+            payload_digest = payload_hash(payload)
+        if settings.duplicate_filter_enabled and duplicate_filter.is_known_duplicate(
+            payload.transaction_id, payload_digest
+        ):
+            # Exact redelivery of a final transaction: nothing to write and nothing to schedule.
+            return payload.transaction_id, WebhookIngestOutcome.DUPLICATE, False
+
+        if settings.ingest_coalesce_enabled:
+            # Concurrent callers share one multi-row insert and commit instead of one each.
+            from app.services.ingest_coalescer import get_ingest_coalescer
+
+            return await get_ingest_coalescer().submit(payload)
+
         now = utcnow()
 
-        # First delivery wins: insert once by unique transaction_id.
-        created = await self.repository.create_if_not_exists(
+        # First delivery wins; duplicates get conflict tracking and stale re-open in the same statement.
+        result = await self.repository.ingest(
             transaction_id=payload.transaction_id,
             source_account=payload.source_account,
             destination_account=payload.destination_account,
             amount=payload.amount,
             currency=payload.currency,
-            status=TransactionStatus.PROCESSING,
-            processing_started_at=now,
             payload_hash=payload_digest,
+            now=now,
+            stale_timeout_seconds=settings.processing_stale_timeout_seconds,
         )
-        if created is not None:
-            return created, True
+        if result.created:
+            return payload.transaction_id, WebhookIngestOutcome.CREATED, True
+        if result.existing_payload_hash is None:
+            # A concurrent insert committed after our snapshot; decide against the committed row instead.
+            return await self._ingest_against_committed_row(payload, payload_digest, now)
 
+        if settings.duplicate_filter_enabled:
+            duplicate_filter.remember(payload.transaction_id, result.existing_payload_hash, result.existing_status)
+        if result.conflict:
+            logger.warning(
+                "Received webhook with duplicate transaction_id but different payload. "
+                "transaction_id=%s existing_payload_hash=%s new_payload_hash=%s",
+                payload.transaction_id,
+                result.existing_payload_hash.hex(),
+                payload_digest.hex(),
+            )
+            return payload.transaction_id, WebhookIngestOutcome.CONFLICT, result.reopened
+        return payload.transaction_id, WebhookIngestOutcome.DUPLICATE, result.reopened
+
+    async def _ingest_against_committed_row(
+        self, payload: TransactionWebhookIn, payload_digest: bytes, now: datetime
+    ) -> tuple[str, WebhookIngestOutcome, bool]:
         existing = await self.repository.get_one_by_transaction_id(payload.transaction_id)
         if existing is None:
             raise RuntimeError("transaction disappeared after conflict check")
 
+        outcome = WebhookIngestOutcome.DUPLICATE
         if existing.payload_hash != payload_digest:
+            outcome = WebhookIngestOutcome.CONFLICT
             logger.warning(
                 "Received webhook with duplicate transaction_id but different payload. "
                 "transaction_id=%s existing_payload_hash=%s new_payload_hash=%s",
                 payload.transaction_id,
-                existing.payload_hash,
-                payload_digest,
+                existing.payload_hash.hex(),
+                payload_digest.hex(),
             )
             # Do not overwrite original payload; only track conflict metadata.
             await self.repository.record_duplicate_conflict(existing, now=now)
@@ -55,4 +101,109 @@ class WebhookService:
             now=now,
             stale_timeout_seconds=settings.processing_stale_timeout_seconds,
         )
-        return existing.transaction_id, should_schedule
+        return existing.transaction_id, outcome, should_schedule
+
+    async def ingest_transaction_webhooks(
+        self, payloads: list[TransactionWebhookIn], *, use_duplicate_filter: bool = True
+    ) -> list[tuple[str, WebhookIngestOutcome, bool]]:
+        with stage("hash"):
+            digests = [payload_hash(payload) for payload in payloads]
+        if not (use_duplicate_filter and settings.duplicate_filter_enabled):
+            return await self._ingest_unfiltered_webhooks(payloads, digests)
+
+        # Exact redeliveries of final transactions are answered from memory; the rest go to the database.
+        known = [duplicate_filter.is_known_duplicate(p.transaction_id, d) for p, d in zip(payloads, digests)]
+        remaining = [index for index, is_known in enumerate(known) if not is_known]
+        if len(remaining) == len(payloads):
+            return await self._ingest_unfiltered_webhooks(payloads, digests)
+
+        results: list[tuple[str, WebhookIngestOutcome, bool]] = [
+            (payload.transaction_id, WebhookIngestOutcome.DUPLICATE, False) for payload in payloads
+        ]
+        if remaining:
+            unfiltered = await self._ingest_unfiltered_webhooks(
+                [payloads[index] for index in remaining], [digests[index] for index in remaining]
+            )
+            for index, result in zip(remaining, unfiltered):
+                results[index] = result
+        return results
+
+    async def _ingest_unfiltered_webhooks(
+        self, payloads: list[TransactionWebhookIn], digests: list[bytes]
+    ) -> list[tuple[str, WebhookIngestOutcome, bool]]:
+        now = utcnow()
+
+        # The first occurrence of a transaction_id inside the batch is its insert candidate.
+        first_index_by_id: dict[str, int] = {}
+        rows = []
+        for index, payload in enumerate(payloads):
+            if payload.transaction_id in first_index_by_id:
+                continue
+            first_index_by_id[payload.transaction_id] = index
+            rows.append(
+                {
+                    "transaction_id": payload.transaction_id,
+                    "source_account": payload.source_account,
+                    "destination_account": payload.destination_account,
+                    "amount": payload.amount,
+                    "currency": payload.currency,
+                    "status": TransactionStatus.PROCESSING,
+                    "processing_started_at": now,
+                    "payload_hash": digests[index],
+                }
+            )
+        # Claim, insert, duplicate bookkeeping and re-open share one transaction and one commit.
+        created_ids = await self.repository.insert_many_if_not_exists(rows)
+
+        # Rows are only re-read for pre-existing IDs and for IDs repeated within the batch.
+        repeated_ids = {
+            payload.transaction_id
+            for index, payload in enumerate(payloads)
+            if first_index_by_id[payload.transaction_id] != index
+        }
+        lookup_ids = [tid for tid in first_index_by_id if tid not in created_ids or tid in repeated_ids]
+        existing_by_id: dict[str, Transaction] = {}
+        if lookup_ids:
+            existing = await self.repository.get_many_by_transaction_ids(lookup_ids)
+            existing_by_id = {transaction.transaction_id: transaction for transaction in existing}
+            if settings.duplicate_filter_enabled:
+                for transaction in existing:
+                    duplicate_filter.remember(transaction.transaction_id, transaction.payload_hash, transaction.status)
+
+        results: list[tuple[str, WebhookIngestOutcome, bool]] = []
+        conflict_counts: Counter[str] = Counter()
+        for index, payload in enumerate(payloads):
+            transaction_id = payload.transaction_id
+            if transaction_id in created_ids and first_index_by_id[transaction_id] == index:
+                results.append((transaction_id, WebhookIngestOutcome.CREATED, True))
+                continue
+
+            existing = existing_by_id.get(transaction_id)
+            if existing is None:
+                raise RuntimeError("transaction disappeared after conflict check")
+            if existing.payload_hash != digests[index]:
+                logger.warning(
+                    "Received webhook with duplicate transaction_id but different payload. "
+                    "transaction_id=%s existing_payload_hash=%s new_payload_hash=%s",
+                    transaction_id,
+                    existing.payload_hash.hex(),
+                    digests[index].hex(),
+                )
+                conflict_counts[transaction_id] += 1
+                results.append((transaction_id, WebhookIngestOutcome.CONFLICT, False))
+            else:
+                results.append((transaction_id, WebhookIngestOutcome.DUPLICATE, False))
+
+        # Do not overwrite original payloads; only track conflict metadata. Re-queue only stale PROCESSING
+        # rows that existed before this batch, once per transaction_id.
+        reopened_ids = await self.repository.record_batch_duplicates(
+            list(existing_by_id.values()),
+            conflict_counts=conflict_counts,
+            reopen_ids={tid for tid in lookup_ids if tid not in created_ids},
+            now=now,
+            stale_timeout_seconds=settings.processing_stale_timeout_seconds,
+        )
+        for index, (transaction_id, outcome, _) in enumerate(results):
+            if transaction_id in reopened_ids and first_index_by_id[transaction_id] == index:
+                results[index] = (transaction_id, outcome, True)
+        return results
@@ -0,0 +1,67 @@
+import time
+from collections import OrderedDict
+
+from app.utils.config import settings
+
+
+class TransactionReadCache:
+    """Size-bounded LRU of pre-serialized transaction lookups.
+
+    Entries for final rows never expire; entries that still contain a PROCESSING row expire after
+    `processing_ttl_seconds` and are also invalidated by the processor's own state transitions.
+    """
+
+    def __init__(self, *, max_entries: int, processing_ttl_seconds: float):
+        self.max_entries = max_entries
+        self.processing_ttl_seconds = processing_ttl_seconds
+        # key -> (body, monotonic expiry or None for final rows)
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        body, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: str, body: bytes, *, final: bool) -> None:
+        if final:
+            expires_at = None
+        elif self.processing_ttl_seconds > 0:
+            expires_at = time.monotonic() + self.processing_ttl_seconds
+        else:
+            return
+        self._entries[key] = (body, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_many(self, keys: list[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+transaction_cache = TransactionReadCache(
+    max_entries=settings.transaction_cache_max_entries,
+    processing_ttl_seconds=settings.transaction_cache_processing_ttl_seconds,
+)
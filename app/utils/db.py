@@ -1,10 +1,23 @@
+import asyncio
+import logging
 from collections.abc import AsyncGenerator
+from time import perf_counter
+from typing import Any, NamedTuple
+from uuid import uuid4
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import Enum, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.util import memoized_property
+from sqlalchemy.util.queue import AsyncAdaptedQueue, Full
 
 from app.utils.config import settings
+from app.utils.metrics import db_pool_checkout_seconds, db_pool_timeouts_total
+from app.utils.timing import record_stage
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -21,17 +34,181 @@ def _to_async_database_url(url: str) -> str:
     return url
 
 
+# Resizing in place relies on SQLAlchemy internals: AsyncAdaptedQueue's memoized `_queue` and QueuePool's
+# `_pool`, `_overflow`, `_overflow_lock` and `_dec_overflow`. tests/test_db_pool.py checks they still exist,
+# so an upgrade past the pinned version fails there rather than mis-sizing the pool at runtime.
+class _ResizableAsyncQueue(AsyncAdaptedQueue):
+    # Bounded by `maxsize` here rather than by the asyncio.Queue, so the bound can change after creation.
+    @memoized_property
+    def _queue(self) -> asyncio.Queue:
+        return asyncio.LifoQueue() if self.use_lifo else asyncio.Queue()
+
+    def full(self) -> bool:
+        return self.qsize() >= self.maxsize
+
+    def put_nowait(self, item) -> None:
+        if self.full():
+            raise Full()
+        self._queue.put_nowait(item)
+
+
+class PoolWaitWindow(NamedTuple):
+    checkouts: int
+    slow_checkouts: int
+    timeouts: int
+    peak_checked_out: int
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout latency and timeouts for /metrics, and can be resized while running."""
+
+    _queue_class = _ResizableAsyncQueue
+    # SQLAlchemy names pool loggers after the class's module. Keep pool messages ("Pool disposed", ...) under
+    # sqlalchemy.pool, where echo_pool and SQLAlchemy's logging configuration apply, not under app.utils.db.
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.InstrumentedAsyncQueuePool"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts_total = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts_total = 0
+        self.resizes_total = 0
+        # Checkouts at or above this count as slow in the adaptive window.
+        self.slow_checkout_seconds = settings.db_pool_adaptive_target_wait_ms / 1000
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._window_checkouts = 0
+        self._window_slow = 0
+        self._window_timeouts = 0
+        self._window_peak = self.checkedout()
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            record = super()._do_get()
+        except sa_exc.TimeoutError:
+            db_pool_timeouts_total.inc()
+            self.timeouts_total += 1
+            self._window_timeouts += 1
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            db_pool_checkout_seconds.observe(elapsed)
+            record_stage("db_checkout", elapsed)
+            self.checkouts_total += 1
+            self.wait_seconds_total += elapsed
+            self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+            self._window_checkouts += 1
+            if elapsed >= self.slow_checkout_seconds:
+                self._window_slow += 1
+        self._window_peak = max(self._window_peak, self.checkedout())
+        return record
+
+    @property
+    def max_overflow(self) -> int:
+        return self._max_overflow
+
+    def take_window(self) -> PoolWaitWindow:
+        """Checkout counters since the previous call, for the adaptive resizer."""
+        window = PoolWaitWindow(
+            checkouts=self._window_checkouts,
+            slow_checkouts=self._window_slow,
+            timeouts=self._window_timeouts,
+            peak_checked_out=self._window_peak,
+        )
+        self._reset_window()
+        return window
+
+    def resize(self, size: int) -> None:
+        """Change how many connections the pool keeps open; max_overflow still applies on top."""
+        if size <= 0:
+            raise ValueError("pool size must be > 0")
+        with self._overflow_lock:
+            # _overflow counts open connections beyond the pool size, so it shifts with the size.
+            self._overflow -= size - self._pool.maxsize
+            self._pool.maxsize = size
+        self.resizes_total += 1
+
+    def close_surplus_idle(self) -> int:
+        """Close idle connections left above the pool size by a shrink. Runs inside greenlet_spawn."""
+        closed = 0
+        while self._pool.qsize() > self._pool.maxsize:
+            record = self._pool.get_nowait()
+            try:
+                record.close()
+            finally:
+                self._dec_overflow()
+            closed += 1
+        return closed
+
+
+def _connect_args() -> dict[str, Any]:
+    connect_args: dict[str, Any] = {"server_settings": {"timezone": settings.db_timezone}}
+    if settings.db_external_pooler:
+        # Transaction-mode poolers hand each transaction to any server connection: cached prepared statements
+        # may not exist there, and asyncpg's default statement names can collide with another client's.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    return connect_args
+
+
+def _pool_options() -> dict[str, Any]:
+    if settings.db_pool_mode == "none":
+        return {"poolclass": NullPool, "pool_pre_ping": settings.db_pool_pre_ping}
+    pool_size = settings.db_pool_size
+    if settings.db_pool_mode == "adaptive":
+        pool_size = min(max(pool_size, settings.db_pool_adaptive_min_size), settings.db_pool_adaptive_max_size)
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_size": pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+
+
 engine: AsyncEngine = create_async_engine(
     _to_async_database_url(settings.database_url),
-    pool_pre_ping=False,
-    pool_size=10,
-    max_overflow=20,
-    pool_recycle=1800,
-    connect_args={"server_settings": {"timezone": settings.db_timezone}},
+    connect_args=_connect_args(),
+    **_pool_options(),
 )
 SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
 
 
+def instrumented_pool() -> InstrumentedAsyncQueuePool | None:
+    # Read through the module so tests/tools that swap the engine are reflected.
+    pool = engine.pool
+    return pool if isinstance(pool, InstrumentedAsyncQueuePool) else None
+
+
+# Alembic head this code expects. Bump it with every new revision; tests compare it with alembic/versions.
+SCHEMA_REVISION = "20261017_0004"
+
+
+class SchemaRevisionError(RuntimeError):
+    pass
+
+
+async def verify_schema_revision() -> None:
+    """One-query schema check for DB_SCHEMA_CHECK=alembic; it doubles as the connectivity probe."""
+    async with engine.connect() as conn:
+        try:
+            revisions = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars().all()
+        except sa_exc.ProgrammingError as exc:
+            raise SchemaRevisionError(
+                "alembic_version not found: run `alembic upgrade head` or set DB_SCHEMA_CHECK=create"
+            ) from exc
+    if revisions != [SCHEMA_REVISION]:
+        raise SchemaRevisionError(
+            f"Database is at Alembic revision {', '.join(revisions) or 'none'}, this build expects {SCHEMA_REVISION}:"
+            " run `alembic upgrade head`"
+        )
+
+
 async def ensure_tables_exist() -> None:
     # checkfirst=True is the default: creates only missing objects.
     async with engine.begin() as conn:
@@ -44,6 +221,49 @@ async def check_db_connection() -> None:
         await conn.execute(text("SELECT 1"))
 
 
+def _enum_type_names() -> list[str]:
+    names = {
+        column.type.name
+        for table in Base.metadata.tables.values()
+        for column in table.columns
+        if isinstance(column.type, Enum) and column.type.name
+    }
+    return sorted(names)
+
+
+async def _warm_connection(conn: AsyncConnection) -> None:
+    await conn.start()
+    enum_names = _enum_type_names()
+    if enum_names:
+        # asyncpg introspects each custom type once per connection, on the first statement that uses it;
+        # that costs more than opening the connection, so resolve them here too.
+        casts = ", ".join(f"CAST(NULL AS {name})" for name in enum_names)
+        await conn.execute(text(f"SELECT {casts}"))
+    await conn.rollback()
+
+
+async def prewarm_pool(connections: int) -> int:
+    """Open up to `connections` pooled connections at once, resolve custom types on each, leave them idle.
+
+    Capped at the pool size, since connections above it are closed again on return. Returns how many opened;
+    failures are logged rather than raised, the pool simply opens the rest on demand.
+    """
+    pool = instrumented_pool()
+    if pool is None or connections <= 0:
+        return 0
+    # All held at once, otherwise each checkout would just reuse the previous connection.
+    conns = [engine.connect() for _ in range(min(connections, pool.size()))]
+    results = await asyncio.gather(*(_warm_connection(conn) for conn in conns), return_exceptions=True)
+    for conn in conns:
+        if conn.sync_connection is not None:
+            await conn.close()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    opened = len(conns) - len(errors)
+    if errors:
+        logger.warning("Pool prewarm opened %s of %s connections", opened, len(conns), exc_info=errors[0])
+    return opened
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with SessionLocal() as db:
         yield db
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+
+from app.utils.config import settings
+from app.utils.enums import TransactionStatus
+
+
+class RecentFinalTransactionFilter:
+    """Size-bounded LRU of `transaction_id -> payload_hash` for transactions already in a final status.
+
+    A redelivery whose ID and hash match an entry is an exact duplicate of a PROCESSED/FAILED row:
+    the database would neither insert, flag a conflict nor re-open it, so it can be acknowledged
+    without a round trip. Anything else (unknown ID, different hash) is not certain and goes to the database.
+    """
+
+    def __init__(self, *, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_known_duplicate(self, transaction_id: str, payload_hash: bytes) -> bool:
+        known_hash = self._entries.get(transaction_id)
+        if known_hash is None or known_hash != payload_hash:
+            self.misses += 1
+            return False
+        self._entries.move_to_end(transaction_id)
+        self.hits += 1
+        return True
+
+    def remember(self, transaction_id: str, payload_hash: bytes, status: TransactionStatus | None) -> None:
+        # Only final rows are safe to answer from memory; PROCESSING rows may still need a stale re-open.
+        if status not in (TransactionStatus.PROCESSED, TransactionStatus.FAILED):
+            return
+        self._entries[transaction_id] = payload_hash
+        self._entries.move_to_end(transaction_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+duplicate_filter = RecentFinalTransactionFilter(max_entries=settings.duplicate_filter_max_entries)
@@ -1,6 +1,6 @@
 import hashlib
-import json
 from decimal import Decimal
+from json.encoder import encode_basestring_ascii
 
 from app.dto.webhook import TransactionWebhookIn
 
@@ -20,7 +20,24 @@ def canonical_payload(data: TransactionWebhookIn) -> dict[str, str]:
     }
 
 
-def payload_hash(data: TransactionWebhookIn) -> str:
-    payload = canonical_payload(data)
-    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+def payload_hash_from_fields(
+    transaction_id: str, source_account: str, destination_account: str, amount: Decimal, currency: str
+) -> bytes:
+    # Byte-for-byte the same as json.dumps(canonical_payload(...), sort_keys=True, separators=(",", ":")),
+    # written out in sorted key order so no dict or generic encoder is involved.
+    serialized = (
+        '{"amount":' + encode_basestring_ascii(_normalize_decimal(amount))
+        + ',"currency":' + encode_basestring_ascii(currency.upper().strip())
+        + ',"destination_account":' + encode_basestring_ascii(destination_account.strip())
+        + ',"source_account":' + encode_basestring_ascii(source_account.strip())
+        + ',"transaction_id":' + encode_basestring_ascii(transaction_id.strip())
+        + "}"
+    )
+    # The raw 32-byte digest; stored as BYTEA, half the size of the hex text.
+    return hashlib.sha256(serialized.encode("utf-8")).digest()
+
+
+def payload_hash(data: TransactionWebhookIn) -> bytes:
+    return payload_hash_from_fields(
+        data.transaction_id, data.source_account, data.destination_account, data.amount, data.currency
+    )
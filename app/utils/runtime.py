@@ -36,6 +36,10 @@ def register_background_task(task: asyncio.Task) -> None:
     task.add_done_callback(_discard)
 
 
+def background_task_count() -> int:
+    return len(_background_tasks.get(asyncio.get_running_loop(), ()))
+
+
 async def drain_background_tasks() -> None:
     loop = asyncio.get_running_loop()
     tasks = list(_background_tasks.get(loop, set()))
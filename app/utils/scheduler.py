@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from app.utils.runtime import register_background_task
+
+logger = logging.getLogger(__name__)
+
+BatchHandler = Callable[[list[str]], Awaitable[None]]
+
+
+class _DelayedEntry:
+    __slots__ = ("due", "seq", "key")
+
+    def __init__(self, due: float, seq: int, key: str):
+        self.due = due
+        self.seq = seq
+        self.key = key
+
+    def __lt__(self, other: "_DelayedEntry") -> bool:
+        if self.due != other.due:
+            return self.due < other.due
+        return self.seq < other.seq
+
+
+class DelayedBatchScheduler:
+    """Holds delayed keys in one heap behind a single timer and hands due keys in batches to a fixed worker pool.
+
+    Pending keys (waiting for their due time or for an in-flight slot) are bounded by `max_pending`;
+    keys handed to the handler and not yet finished are bounded by `max_in_flight`
+    (default `worker_count * batch_size`).
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        *,
+        worker_count: int,
+        batch_size: int,
+        max_pending: int,
+        max_in_flight: int | None = None,
+    ):
+        self.worker_count = worker_count
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.max_in_flight = max_in_flight or worker_count * batch_size
+        self._handler = handler
+        self._heap: list[_DelayedEntry] = []
+        self._ready: deque[str] = deque()
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._ready_signal = asyncio.Event()
+        self._capacity_freed = asyncio.Event()
+        self._workers_started = False
+        self._in_flight = 0
+        self.overflow_total = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap) + len(self._ready)
+
+    def has_capacity(self) -> bool:
+        return self.pending < self.max_pending
+
+    def submit(self, key: str, delay_seconds: float) -> bool:
+        if not self.has_capacity():
+            self.overflow_total += 1
+            return False
+        loop = asyncio.get_running_loop()
+        if not self._workers_started:
+            self._start_workers()
+        entry = _DelayedEntry(loop.time() + delay_seconds, next(self._seq), key)
+        heapq.heappush(self._heap, entry)
+        # Only a new earliest entry needs the single timer re-armed.
+        if self._heap[0] is entry:
+            self._arm_timer(loop)
+        return True
+
+    async def wait_for_capacity(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.has_capacity():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            self._capacity_freed.clear()
+            try:
+                await asyncio.wait_for(self._capacity_freed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return self.has_capacity()
+        return True
+
+    def take_pending(self) -> list[str]:
+        # Removes every key not yet handed to a worker, e.g. to persist them as interrupted on shutdown.
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        keys = list(self._ready) + [entry.key for entry in self._heap]
+        self._ready.clear()
+        self._heap.clear()
+        return keys
+
+    def _arm_timer(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(self._heap[0].due, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        heap = self._heap
+        while heap and heap[0].due <= now:
+            self._ready.append(heapq.heappop(heap).key)
+        if self._ready:
+            self._ready_signal.set()
+        if heap:
+            self._arm_timer(loop)
+
+    def _start_workers(self) -> None:
+        self._workers_started = True
+        for _ in range(self.worker_count):
+            # Long-lived workers must not inherit the submitting request's context (e.g. its stage timer).
+            task = asyncio.create_task(self._run_worker(), context=contextvars.Context())
+            register_background_task(task)
+            task.add_done_callback(self._on_worker_done)
+
+    def _on_worker_done(self, _: asyncio.Task) -> None:
+        # Workers only exit on cancellation (shutdown drain); restart lazily on the next submit.
+        self._workers_started = False
+
+    async def _run_worker(self) -> None:
+        ready = self._ready
+        while True:
+            # Due keys wait in `ready` (still counted as pending) until an in-flight slot frees up.
+            while not ready or self._in_flight >= self.max_in_flight:
+                self._ready_signal.clear()
+                await self._ready_signal.wait()
+            take = min(self.batch_size, len(ready), self.max_in_flight - self._in_flight)
+            batch = [ready.popleft() for _ in range(take)]
+            self._in_flight += len(batch)
+            self._capacity_freed.set()
+            try:
+                await self._handler(batch)
+            except Exception:  # noqa: BLE001
+                logger.exception("Delayed batch handler failed. batch_size=%s", len(batch))
+            finally:
+                self._in_flight -= len(batch)
+                if ready:
+                    self._ready_signal.set()
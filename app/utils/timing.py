@@ -0,0 +1,104 @@
+import logging
+import random
+from contextlib import nullcontext
+from contextvars import ContextVar
+from time import perf_counter
+
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_timer: ContextVar["StageTimer | None"] = ContextVar("stage_timer", default=None)
+_NULL_STAGE = nullcontext()
+
+
+class StageTimer:
+    """Accumulates named stage durations for one request; repeated stages add up."""
+
+    __slots__ = ("started", "stages")
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.stages: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def server_timing(self, total_seconds: float) -> str:
+        parts = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={total_seconds * 1000:.3f}")
+        return ", ".join(parts)
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer: StageTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = perf_counter()
+
+    def __exit__(self, *_exc) -> None:
+        self.timer.add(self.name, perf_counter() - self.started)
+
+
+def stage(name: str):
+    # Outside a timed request this is one ContextVar lookup returning a shared no-op context manager.
+    timer = _current_timer.get()
+    if timer is None:
+        return _NULL_STAGE
+    return _Stage(timer, name)
+
+
+def record_stage(name: str, seconds: float) -> None:
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add(name, seconds)
+
+
+def record_since_request_start(name: str) -> None:
+    # Used at handler entry: everything before it is body read, JSON decode and Pydantic validation.
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add(name, perf_counter() - timer.started)
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware adding a `Server-Timing` header (and sampled timing logs) when enabled."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.server_timing_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timer = StageTimer()
+        token = _current_timer.set(timer)
+        status_code = 0
+
+        async def send_with_timing(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                header = timer.server_timing(perf_counter() - timer.started).encode("latin-1")
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timer.reset(token)
+            sample_rate = settings.server_timing_log_sample_rate
+            if sample_rate > 0 and random.random() < sample_rate:
+                logger.info(
+                    "Request timing method=%s path=%s status=%s total_ms=%.3f stages=%s",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    (perf_counter() - timer.started) * 1000,
+                    ",".join(f"{name}:{seconds * 1000:.3f}" for name, seconds in timer.stages.items()),
+                )
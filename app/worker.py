@@ -0,0 +1,71 @@
+"""Standalone transaction processor: `python -m app.worker`.
+
+Runs durable queue workers, the stale sweeper and partition maintenance against the shared database,
+with no HTTP server.
+Pair it with API processes started with PROCESSING_RUNNER=worker so each tier scales and restarts on its own.
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.logging import configure_logging
+from app.utils.runtime import clear_shutdown_signal, drain_background_tasks, get_shutdown_event, set_shutdown_signal
+from app.services.partition_maintenance import start_partition_maintainer
+from app.services.pool_autoscaler import start_pool_autoscaler
+from app.services.queue_worker import start_queue_workers
+from app.services.stale_sweeper import start_stale_sweeper
+from app.services.startup import prepare_database
+from app.services.status_notifier import close_status_notifier
+from app.models.transaction import Transaction  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+def _install_signal_handlers() -> None:
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, set_shutdown_signal)
+        except (NotImplementedError, RuntimeError):
+            # Windows event loops and non-main threads; Ctrl+C still ends asyncio.run.
+            pass
+
+
+async def run_worker() -> None:
+    clear_shutdown_signal()
+    if settings.repository_backend == "memory":
+        raise RuntimeError("REPOSITORY_BACKEND=memory is process-local; a separate worker cannot see the API's rows")
+    if settings.processing_runner != "worker":
+        logger.warning("PROCESSING_RUNNER=%s: API processes still process in-process too", settings.processing_runner)
+
+    await prepare_database()
+    if settings.partition_maintenance_enabled:
+        start_partition_maintainer()
+    if settings.db_pool_mode == "adaptive":
+        start_pool_autoscaler()
+    _install_signal_handlers()
+    # Claims run in one DB transaction each, so a stopped or crashed worker leaves nothing behind in memory.
+    start_queue_workers(settings.queue_worker_count)
+    if settings.stale_sweep_enabled:
+        start_stale_sweeper()
+    logger.info("Processing worker started. queue_workers=%s", settings.queue_worker_count)
+    try:
+        await get_shutdown_event().wait()
+    finally:
+        set_shutdown_signal()
+        await drain_background_tasks()
+        await close_status_notifier()
+        await db_core.engine.dispose()
+        logger.info("Processing worker stopped")
+
+
+def main() -> None:
+    configure_logging()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
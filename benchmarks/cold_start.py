@@ -0,0 +1,211 @@
+"""Import time and time-to-first-202 of a fresh API process, per DB_SCHEMA_CHECK mode.
+
+Run with: python -m benchmarks.cold_start [--runs 5] [--modes create,alembic,skip] [--db-latency-ms 0] \
+    [--prewarm-connections 0]
+
+Import time is `import app.main` in a fresh interpreter. Each run then spawns `uvicorn app.main:app` and
+polls a POST to /v1/webhooks/transactions until it returns 202. It reports the time from spawn until the
+server first accepts a connection (uvicorn binds only after lifespan startup), the time until the first 202,
+and how long that first POST itself took.
+
+A local Postgres answers in microseconds, which hides how many round trips startup makes.
+`--db-latency-ms` sends the app's database traffic through an in-process TCP proxy that delays every chunk
+by that much in each direction, approximating a database in another region. For the alembic mode the
+benchmark writes `alembic_version` at the expected revision when the database has none (for example one
+built by create_all), and drops it again afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.models.transaction import Transaction  # noqa: F401
+from benchmarks.run import _cleanup
+
+_PREFIX = "bench_cold_start"
+_PATH = "/v1/webhooks/transactions"
+_IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def _import_seconds() -> float:
+    output = subprocess.run([sys.executable, "-c", _IMPORT_SNIPPET], capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, delay: float) -> None:
+    try:
+        while data := await reader.read(65536):
+            await asyncio.sleep(delay)
+            writer.write(data)
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def _start_latency_proxy(host: str, port: int, delay: float) -> asyncio.Server:
+    async def _handle(client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        # A TCP handshake costs one round trip before the first byte.
+        await asyncio.sleep(2 * delay)
+        upstream_reader, upstream_writer = await asyncio.open_connection(host, port)
+        await asyncio.gather(
+            _pipe(client_reader, upstream_writer, delay),
+            _pipe(upstream_reader, client_writer, delay),
+            return_exceptions=True,
+        )
+
+    return await asyncio.start_server(_handle, "127.0.0.1", 0)
+
+
+async def _post(port: int, transaction_id: str) -> int:
+    body = json.dumps(
+        {
+            "transaction_id": transaction_id,
+            "source_account": "acc_user_1",
+            "destination_account": "acc_merchant_1",
+            "amount": 100,
+            "currency": "INR",
+        }
+    ).encode()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(
+            f"POST {_PATH} HTTP/1.1\r\nHost: benchmark\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+    finally:
+        writer.close()
+    return int(status_line.split()[1])
+
+
+async def _time_to_first_202(mode: str, database_url: str, prewarm: int, run: int) -> dict[str, float]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DB_SCHEMA_CHECK": mode,
+        "DB_POOL_PREWARM_CONNECTIONS": str(prewarm),
+    }
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    accepted_at = None
+    try:
+        while True:
+            if process.returncode is not None:
+                raise RuntimeError(f"uvicorn exited with {process.returncode} in DB_SCHEMA_CHECK={mode}")
+            request_started = time.perf_counter()
+            try:
+                status = await _post(port, f"{_PREFIX}_{mode}_{run}")
+            except (ConnectionRefusedError, ConnectionResetError, IndexError):
+                await asyncio.sleep(0.005)
+                continue
+            accepted_at = accepted_at or request_started
+            if status == 202:
+                finished = time.perf_counter()
+                break
+    finally:
+        process.terminate()
+        await process.wait()
+    return {
+        "ready_ms": (accepted_at - started) * 1000,
+        "first_202_ms": (finished - started) * 1000,
+        "first_request_ms": (finished - request_started) * 1000,
+    }
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {"median": round(statistics.median(samples), 1), "max": round(max(samples), 1)}
+
+
+async def _stamp_alembic_version() -> bool:
+    async with db_core.engine.begin() as conn:
+        exists = (await conn.execute(text("SELECT to_regclass('alembic_version') IS NOT NULL"))).scalar_one()
+        if exists:
+            return False
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+        await conn.execute(
+            text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": db_core.SCHEMA_REVISION}
+        )
+    return True
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    imports = [_import_seconds() * 1000 for _ in range(args.runs)]
+    results: dict = {
+        "runs": args.runs,
+        "db_latency_ms": args.db_latency_ms,
+        "prewarm_connections": args.prewarm_connections,
+        "import_ms": _summary(imports),
+    }
+
+    await db_core.ensure_tables_exist()
+    stamped = "alembic" in modes and await _stamp_alembic_version()
+    await db_core.engine.dispose()
+    database_url = settings.database_url
+    proxy = None
+    if args.db_latency_ms:
+        url = make_url(database_url)
+        proxy = await _start_latency_proxy(url.host or "localhost", url.port or 5432, args.db_latency_ms / 1000)
+        database_url = url.set(host="127.0.0.1", port=proxy.sockets[0].getsockname()[1]).render_as_string(
+            hide_password=False
+        )
+    try:
+        for mode in modes:
+            samples = [
+                await _time_to_first_202(mode, database_url, args.prewarm_connections, run) for run in range(args.runs)
+            ]
+            results[mode] = {key: _summary([sample[key] for sample in samples]) for key in samples[0]}
+    finally:
+        if proxy is not None:
+            proxy.close()
+        if stamped:
+            async with db_core.engine.begin() as conn:
+                await conn.execute(text("DROP TABLE alembic_version"))
+        await _cleanup(_PREFIX)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", default="create,alembic,skip")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0)
+    parser.add_argument("--prewarm-connections", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
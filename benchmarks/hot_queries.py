@@ -0,0 +1,182 @@
+"""Per-call statement build + execute overhead of the hot repository queries, per-call built vs prebuilt.
+
+Run with: python -m benchmarks.hot_queries [--iterations 2000] [--batch 10] [--repeats 3]
+
+"per_call" rebuilds each statement the way the repository used to (a fresh select()/update()/pg_insert()
+per call); "prebuilt" executes the repository's module-level statements with a parameter dict. Both run on
+one session against the same seeded rows, so the database work is identical and the difference is client
+CPU: statement construction, cache-key generation, ORM execution bookkeeping and, for the pg_insert forms,
+compilation. "build_us" is construction + cache key alone, without a round trip. Updates and inserts run
+inside one transaction per measurement that is rolled back, and the best of --repeats runs is reported.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from decimal import Decimal
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import String, any_, bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils import db as db_core
+from app.utils.enums import TransactionStatus
+from app.utils.time import utcnow
+from app.repositories import transaction_repository as repo
+from app.repositories.factory import get_transaction_repository
+from app.models.transaction import Transaction, TransactionKey
+from benchmarks.run import _cleanup
+
+_PREFIX = "bench_hot_queries"
+
+
+def _ids_in(transaction_ids: list[str]):
+    return Transaction.transaction_id == any_(
+        bindparam("transaction_ids", value=list(transaction_ids), type_=ARRAY(String))
+    )
+
+
+def _rows(tag: str, count: int) -> list[dict[str, Any]]:
+    now = utcnow()
+    return [
+        {
+            "transaction_id": f"{_PREFIX}_{tag}_{i}",
+            "source_account": "acc_user_1",
+            "destination_account": "acc_merchant_1",
+            "amount": Decimal("15.00"),
+            "currency": "INR",
+            "status": TransactionStatus.PROCESSING,
+            "processing_started_at": now,
+            "payload_hash": hashlib.sha256(f"{tag}_{i}".encode()).digest(),
+        }
+        for i in range(count)
+    ]
+
+
+def _cases(one: str, many: list[str], batch: int) -> dict[str, dict[str, Callable[[int], tuple[Any, Any]]]]:
+    # Each builder returns (statement, parameters) for iteration i.
+    now = utcnow()
+    insert_counter = iter(range(10**9))
+
+    def _legacy_insert(_: int):
+        tag = f"ins{next(insert_counter)}"
+        rows = _rows(tag, batch)
+        stmt = (
+            pg_insert(TransactionKey)
+            .values([{"transaction_id": row["transaction_id"]} for row in rows])
+            .on_conflict_do_nothing(index_elements=["transaction_id"])
+            .returning(TransactionKey.transaction_id, TransactionKey.created_at)
+        )
+        return stmt, None
+
+    def _prebuilt_insert(_: int):
+        tag = f"ins{next(insert_counter)}"
+        return repo._CLAIM_KEYS_STMT, {"transaction_ids": [row["transaction_id"] for row in _rows(tag, batch)]}
+
+    return {
+        "lookup_one": {
+            "per_call": lambda _: (select(Transaction).where(Transaction.transaction_id == one), None),
+            "prebuilt": lambda _: (repo._SELECT_BY_TRANSACTION_ID, {"transaction_id": one}),
+        },
+        "lookup_many": {
+            "per_call": lambda _: (select(Transaction).where(_ids_in(many)), None),
+            "prebuilt": lambda _: (repo._SELECT_BY_TRANSACTION_IDS, {"transaction_ids": many}),
+        },
+        "start_processing": {
+            "per_call": lambda _: (
+                update(Transaction)
+                .where(Transaction.transaction_id == one, Transaction.status == TransactionStatus.PROCESSING)
+                .values(processing_started_at=func.coalesce(Transaction.processing_started_at, now))
+                .returning(Transaction.transaction_id),
+                None,
+            ),
+            "prebuilt": lambda _: (
+                repo._transition_stmt("start", many=False, notify=False),
+                {"target_id": one, "now": now},
+            ),
+        },
+        "interrupt_many": {
+            "per_call": lambda _: (
+                update(Transaction)
+                .where(_ids_in(many), Transaction.status == TransactionStatus.PROCESSING)
+                .values(processing_started_at=None, error_message="interrupted")
+                .returning(Transaction.transaction_id),
+                None,
+            ),
+            "prebuilt": lambda _: (
+                repo._transition_stmt("interrupt", many=True, notify=False),
+                {"target_ids": many, "message": "interrupted"},
+            ),
+        },
+        "claim_keys": {"per_call": _legacy_insert, "prebuilt": _prebuilt_insert},
+    }
+
+
+async def _timed(db: AsyncSession, build: Callable[[int], tuple[Any, Any]], iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        stmt, params = build(i)
+        await db.execute(stmt, params)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _build_seconds(build: Callable[[int], tuple[Any, Any]], iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        stmt, _ = build(i)
+        stmt._generate_cache_key()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def _best(run: Callable[[], Awaitable[float]], repeats: int) -> float:
+    return min([await run() for _ in range(repeats)])
+
+
+async def _measure(build: Callable[[int], tuple[Any, Any]], args: argparse.Namespace) -> dict[str, float]:
+    async def _run() -> float:
+        async with db_core.SessionLocal() as db:
+            await _timed(db, build, min(100, args.iterations))
+            elapsed = await _timed(db, build, args.iterations)
+            await db.rollback()
+        return elapsed
+
+    return {
+        "execute_us": round(await _best(_run, args.repeats), 1),
+        "build_us": round(min(_build_seconds(build, args.iterations) for _ in range(args.repeats)), 2),
+    }
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    results: dict = {"iterations": args.iterations, "batch": args.batch}
+    await db_core.ensure_tables_exist()
+    try:
+        seeded = _rows("seed", args.batch)
+        async with db_core.SessionLocal() as db:
+            await get_transaction_repository(db).create_many_if_not_exists(seeded)
+        many = [row["transaction_id"] for row in seeded]
+        for name, variants in _cases(many[0], many, args.batch).items():
+            measured = {variant: await _measure(build, args) for variant, build in variants.items()}
+            measured["execute_speedup"] = round(
+                measured["per_call"]["execute_us"] / measured["prebuilt"]["execute_us"], 2
+            )
+            results[name] = measured
+    finally:
+        await _cleanup(_PREFIX)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Duplicate-heavy ingest benchmark: legacy multi-round-trip path vs the single-statement ingest.
+
+Run against a real Postgres (uses DATABASE_URL from settings):
+
+    python -m benchmarks.ingest_duplicates --webhooks 5000 --duplicate-ratio 0.4 --conflict-ratio 0.05
+
+Rows written by the benchmark use a unique transaction_id prefix and are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.enums import TransactionStatus
+from app.utils.idempotency import payload_hash
+from app.utils.time import utcnow
+from app.dto.webhook import TransactionWebhookIn
+from app.models.transaction import Transaction, TransactionKey
+from app.repositories.transaction_repository import TransactionRepository
+from app.services.webhook_service import WebhookService
+
+
+def _workload(prefix: str, webhooks: int, duplicate_ratio: float, conflict_ratio: float) -> list[TransactionWebhookIn]:
+    rng = random.Random(42)
+    payloads: list[TransactionWebhookIn] = []
+    originals: list[TransactionWebhookIn] = []
+    for index in range(webhooks):
+        if originals and rng.random() < duplicate_ratio:
+            original = rng.choice(originals)
+            if rng.random() < conflict_ratio:
+                payloads.append(original.model_copy(update={"amount": original.amount + 1}))
+            else:
+                payloads.append(original)
+            continue
+        payload = TransactionWebhookIn(
+            transaction_id=f"{prefix}_{index}",
+            source_account="acc_user_789",
+            destination_account="acc_merchant_456",
+            amount=1000 + index,
+            currency="INR",
+        )
+        originals.append(payload)
+        payloads.append(payload)
+    return payloads
+
+
+async def _legacy_ingest(payload: TransactionWebhookIn) -> None:
+    # The pre-CTE sequence: INSERT ... ON CONFLICT, then SELECT, conflict UPDATE and stale UPDATE as needed.
+    payload_digest = payload_hash(payload)
+    now = utcnow()
+    async with db_core.SessionLocal() as db:
+        repository = TransactionRepository(db)
+        # Uniqueness lives in transaction_keys since partitioning; claim the key, then insert the row.
+        key_stmt = (
+            pg_insert(TransactionKey)
+            .values(transaction_id=payload.transaction_id)
+            .on_conflict_do_nothing(index_elements=["transaction_id"])
+            .returning(TransactionKey.created_at)
+        )
+        created_at = (await db.execute(key_stmt)).scalar_one_or_none()
+        if created_at is not None:
+            await db.execute(
+                pg_insert(Transaction).values(
+                    transaction_id=payload.transaction_id,
+                    source_account=payload.source_account,
+                    destination_account=payload.destination_account,
+                    amount=payload.amount,
+                    currency=payload.currency,
+                    status=TransactionStatus.PROCESSING,
+                    processing_started_at=now,
+                    payload_hash=payload_digest,
+                    created_at=created_at,
+                )
+            )
+            await db.commit()
+            return
+        existing = await repository.get_one_by_transaction_id(payload.transaction_id)
+        if existing.payload_hash != payload_digest:
+            await repository.record_duplicate_conflict(existing, now=now)
+        await repository.mark_for_retry_if_stale(
+            existing, now=now, stale_timeout_seconds=settings.processing_stale_timeout_seconds
+        )
+
+
+async def _current_ingest(payload: TransactionWebhookIn) -> None:
+    async with db_core.SessionLocal() as db:
+        await WebhookService(db).ingest_transaction_webhook(payload)
+
+
+async def _run(ingest, payloads: list[TransactionWebhookIn], concurrency: int) -> dict[str, float]:
+    counters = {"statements": 0, "commits": 0}
+
+    def _count_statement(*_) -> None:
+        counters["statements"] += 1
+
+    def _count_commit(*_) -> None:
+        counters["commits"] += 1
+
+    sync_engine = db_core.engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _count_statement)
+    event.listen(sync_engine, "commit", _count_commit)
+
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(payload: TransactionWebhookIn) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await ingest(payload)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    try:
+        started = time.perf_counter()
+        # Keep delivery order per transaction_id so duplicates follow their original.
+        for offset in range(0, len(payloads), concurrency):
+            chunk = payloads[offset : offset + concurrency]
+            seen: set[str] = set()
+            ordered = [payload for payload in chunk if not (payload.transaction_id in seen or seen.add(payload.transaction_id))]
+            repeats = [payload for payload in chunk if payload not in ordered]
+            await asyncio.gather(*(_one(payload) for payload in ordered))
+            for payload in repeats:
+                await _one(payload)
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _count_statement)
+        event.remove(sync_engine, "commit", _count_commit)
+
+    latencies.sort()
+    return {
+        "webhooks_per_second": len(payloads) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "statements_per_webhook": counters["statements"] / len(payloads),
+        "commits_per_webhook": counters["commits"] / len(payloads),
+    }
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    await db_core.ensure_tables_exist()
+    run_id = uuid.uuid4().hex[:8]
+    results = {
+        "webhooks": args.webhooks,
+        "duplicate_ratio": args.duplicate_ratio,
+        "conflict_ratio": args.conflict_ratio,
+        "concurrency": args.concurrency,
+    }
+    try:
+        for name, ingest in (("legacy", _legacy_ingest), ("single_statement", _current_ingest)):
+            payloads = _workload(f"bench_{run_id}_{name}", args.webhooks, args.duplicate_ratio, args.conflict_ratio)
+            results[name] = await _run(ingest, payloads, args.concurrency)
+    finally:
+        async with db_core.SessionLocal() as db:
+            for model in (Transaction, TransactionKey):
+                await db.execute(delete(model).where(model.transaction_id.like(f"bench_{run_id}_%")))
+            await db.commit()
+        await db_core.engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--webhooks", type=int, default=5000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.4)
+    parser.add_argument("--conflict-ratio", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
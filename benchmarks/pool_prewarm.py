@@ -0,0 +1,120 @@
+"""Cold-start webhook burst latency with and without DB_POOL_PREWARM_CONNECTIONS.
+
+Run with: python -m benchmarks.pool_prewarm [--rounds 5] [--burst 10] [--pool-size 10]
+
+Each round builds a fresh engine (nothing connected, as after an instance idles out), optionally prewarms it,
+then fires one burst of concurrent single-row ingests through the repository and commits each. The "warm"
+rows are a second burst on the same engine, for reference. Against a local Postgres connection setup is a few
+milliseconds; over TLS to a managed database it is tens, and the cold/prewarmed gap grows with it.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import statistics
+import time
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.time import utcnow
+from app.repositories.factory import get_transaction_repository
+from app.models.transaction import Transaction  # noqa: F401
+from benchmarks.run import _cleanup
+
+_PREFIX = "bench_pool_prewarm"
+
+
+async def _ingest(index: str) -> float:
+    transaction_id = f"{_PREFIX}_{index}"
+    started = time.perf_counter()
+    async with db_core.SessionLocal() as db:
+        await get_transaction_repository(db).ingest(
+            transaction_id=transaction_id,
+            source_account="acc_user_1",
+            destination_account="acc_merchant_1",
+            amount=Decimal("15.00"),
+            currency="INR",
+            payload_hash=hashlib.sha256(transaction_id.encode()).digest(),
+            now=utcnow(),
+            stale_timeout_seconds=settings.processing_stale_timeout_seconds,
+        )
+        await db.commit()
+    return (time.perf_counter() - started) * 1000
+
+
+async def _burst(tag: str, size: int) -> list[float]:
+    return list(await asyncio.gather(*(_ingest(f"{tag}_{i}") for i in range(size))))
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+async def _round(index: int, args: argparse.Namespace, prewarm: bool) -> tuple[list[float], list[float], float]:
+    engine = create_async_engine(
+        db_core._to_async_database_url(settings.database_url),
+        poolclass=db_core.InstrumentedAsyncQueuePool,
+        pool_size=args.pool_size,
+        max_overflow=args.burst,
+        connect_args=db_core._connect_args(),
+    )
+    db_core.engine = engine
+    db_core.SessionLocal = async_sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+    )
+    prewarm_ms = 0.0
+    try:
+        if prewarm:
+            started = time.perf_counter()
+            await db_core.prewarm_pool(args.pool_size)
+            prewarm_ms = (time.perf_counter() - started) * 1000
+        tag = f"{'prewarmed' if prewarm else 'cold'}_{index}"
+        first = await _burst(tag, args.burst)
+        second = await _burst(f"{tag}_warm", args.burst)
+    finally:
+        await engine.dispose()
+    return first, second, prewarm_ms
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    results: dict = {"rounds": args.rounds, "burst": args.burst, "pool_size": args.pool_size}
+    await db_core.ensure_tables_exist()
+    try:
+        for prewarm in (False, True):
+            first: list[float] = []
+            warm: list[float] = []
+            prewarm_ms: list[float] = []
+            for index in range(args.rounds):
+                burst, second, elapsed = await _round(index, args, prewarm)
+                first.extend(burst)
+                warm.extend(second)
+                prewarm_ms.append(elapsed)
+            scenario = {"first_burst": _summary(first), "warm_burst": _summary(warm)}
+            if prewarm:
+                scenario["prewarm_ms"] = round(statistics.mean(prewarm_ms), 3)
+            results["prewarmed" if prewarm else "cold"] = scenario
+    finally:
+        await _cleanup(_PREFIX)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
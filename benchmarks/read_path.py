@@ -0,0 +1,137 @@
+"""Per-request CPU of the transaction read endpoints: ORM instances + TransactionOut vs Core rows encoded directly.
+
+Run with: python -m benchmarks.read_path [--requests 2000] [--lookup-ids 100] [--repeats 3]
+
+"orm" is the previous read path: load full Transaction instances, build one TransactionOut per row with
+model_validate(from_attributes) and dump them with a List[TransactionOut] TypeAdapter (per-field IST
+serializer). "rows" is the current TransactionService path: the eight output columns as Core rows,
+encoded straight to bytes. Both produce the same bytes; the benchmark checks that before timing.
+
+Each request opens its own session, as a request does. CPU is this process's CPU time (time.process_time)
+per request, so it excludes Postgres' own work; wall time is reported next to it. The read-through cache
+is disabled for the run. "single" is GET /v1/transactions/{id}, "lookup" is POST /v1/transactions:lookup
+with --lookup-ids IDs.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from decimal import Decimal
+from typing import Awaitable, Callable, List
+
+from pydantic import TypeAdapter
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.enums import TransactionStatus
+from app.utils.time import utcnow
+from app.dto.transaction import TransactionOut
+from app.repositories import transaction_repository as repo
+from app.repositories.factory import get_transaction_repository
+from app.services.transaction_service import TransactionService
+from benchmarks.run import _cleanup
+
+_PREFIX = "bench_read_path"
+_ORM_ADAPTER = TypeAdapter(List[TransactionOut])
+
+
+async def _orm_single(transaction_id: str) -> bytes:
+    async with db_core.SessionLocal() as db:
+        result = await db.execute(repo._SELECT_BY_TRANSACTION_ID, {"transaction_id": transaction_id})
+        transactions = result.scalars().all()
+    return _ORM_ADAPTER.dump_json([TransactionOut.model_validate(txn) for txn in transactions])
+
+
+async def _orm_lookup(transaction_ids: list[str]) -> bytes:
+    async with db_core.SessionLocal() as db:
+        found = await get_transaction_repository(db).get_many_by_transaction_ids(transaction_ids)
+    by_id = {txn.transaction_id: TransactionOut.model_validate(txn) for txn in found}
+    body = _ORM_ADAPTER.dump_json([by_id[tid] for tid in transaction_ids if tid in by_id])
+    return b'{"transactions":[' + body[1:-1] + b'],"missing":[]}'
+
+
+async def _rows_single(transaction_id: str) -> bytes:
+    async with db_core.SessionLocal() as db:
+        return await TransactionService(db).get_transaction_json_by_id(transaction_id)
+
+
+async def _rows_lookup(transaction_ids: list[str]) -> bytes:
+    async with db_core.SessionLocal() as db:
+        chunks = await TransactionService(db).lookup_transactions_json(transaction_ids)
+        return b"".join([chunk async for chunk in chunks])
+
+
+async def _seed(count: int) -> list[str]:
+    now = utcnow()
+    rows = [
+        {
+            "transaction_id": f"{_PREFIX}_{i}",
+            "source_account": "acc_user_1",
+            "destination_account": "acc_merchant_1",
+            "amount": Decimal("15.00") + i,
+            "currency": "INR",
+            "status": TransactionStatus.PROCESSING,
+            "processing_started_at": now,
+            "payload_hash": hashlib.sha256(str(i).encode()).digest(),
+        }
+        for i in range(count)
+    ]
+    ids = [row["transaction_id"] for row in rows]
+    async with db_core.SessionLocal() as db:
+        repository = get_transaction_repository(db)
+        await repository.create_many_if_not_exists(rows)
+        # Half final, so processed_at is serialized too.
+        await repository.mark_many_processed(ids[::2], processed_at=utcnow())
+    return ids
+
+
+async def _per_request(call: Callable[[], Awaitable[bytes]], requests: int) -> tuple[float, float]:
+    for _ in range(min(100, requests)):
+        await call()
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return (
+        (time.process_time() - cpu_started) / requests * 1e6,
+        (time.perf_counter() - wall_started) / requests * 1e6,
+    )
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    results: dict = {"requests": args.requests, "lookup_ids": args.lookup_ids}
+    settings.transaction_cache_enabled = False
+    await db_core.ensure_tables_exist()
+    try:
+        ids = await _seed(args.lookup_ids)
+        cases = {
+            "single": {"orm": lambda: _orm_single(ids[0]), "rows": lambda: _rows_single(ids[0])},
+            "lookup": {"orm": lambda: _orm_lookup(ids), "rows": lambda: _rows_lookup(ids)},
+        }
+        for name, variants in cases.items():
+            if await variants["orm"]() != await variants["rows"]():
+                raise RuntimeError(f"{name}: response bodies differ between the ORM and row paths")
+            measured: dict = {}
+            for variant, call in variants.items():
+                samples = [await _per_request(call, args.requests) for _ in range(args.repeats)]
+                cpu, wall = min(samples)
+                measured[variant] = {"cpu_us": round(cpu, 1), "wall_us": round(wall, 1)}
+            measured["cpu_speedup"] = round(measured["orm"]["cpu_us"] / measured["rows"]["cpu_us"], 2)
+            results[name] = measured
+    finally:
+        await _cleanup(_PREFIX)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--lookup-ids", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Webhook load benchmark: concurrent ack latency, throughput, processing lag and DB statements per webhook.
+
+Drive the app in-process (ASGI, against DATABASE_URL) or a running server over HTTP:
+
+    python -m benchmarks.run --requests 5000 --concurrency 64 --duplicate-ratio 0.3 --conflict-ratio 0.05
+    python -m benchmarks.run --target http --base-url http://localhost:8000 --payloads recorded.jsonl
+    python -m benchmarks.run --output results/after.json --compare results/before.json
+    python -m benchmarks.run --backend memory   # application-layer ceiling, no database round-trips
+
+`--payloads` replays a JSONL file with one webhook payload object per line; lines that are not valid
+payloads are skipped and counted. Transaction IDs are prefixed per run so runs never collide, and
+in-process runs delete their rows afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from pydantic import ValidationError
+from sqlalchemy import delete, event
+
+from app.dto.webhook import TransactionWebhookIn
+
+# Metrics compared by --compare, with the direction that counts as an improvement.
+_COMPARED = {
+    "ack_p50_ms": "lower",
+    "ack_p95_ms": "lower",
+    "ack_p99_ms": "lower",
+    "requests_per_second": "higher",
+    "lag_p50_ms": "lower",
+    "lag_p95_ms": "lower",
+    "db_statements_per_webhook": "lower",
+}
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float | None:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return round(sorted_values[index], 3)
+
+
+def _load_payloads(path: Path | None) -> tuple[list[dict], int]:
+    if path is None:
+        return [], 0
+    payloads: list[dict] = []
+    skipped = 0
+    for line in path.read_text().splitlines():
+        if not line.strip():
+            continue
+        try:
+            payloads.append(TransactionWebhookIn.model_validate_json(line).model_dump(mode="json"))
+        except ValidationError:
+            skipped += 1
+    return payloads, skipped
+
+
+def build_workload(
+    *,
+    prefix: str,
+    requests: int,
+    recorded: list[dict],
+    duplicate_ratio: float,
+    conflict_ratio: float,
+    seed: int,
+) -> list[dict]:
+    """`requests` deliveries: recorded (or synthetic) originals, plus exact and conflicting redeliveries."""
+    rng = random.Random(seed)
+    deliveries: list[dict] = []
+    originals: list[dict] = []
+    for index in range(requests):
+        if originals and rng.random() < duplicate_ratio:
+            original = rng.choice(originals)
+            if rng.random() < conflict_ratio:
+                deliveries.append({**original, "amount": str(float(original["amount"]) + 1)})
+            else:
+                deliveries.append(original)
+            continue
+        if recorded:
+            source = recorded[len(originals) % len(recorded)]
+            cycle = len(originals) // len(recorded)
+            payload = {**source, "transaction_id": f"{prefix}_{cycle}_{source['transaction_id']}"[:128]}
+        else:
+            payload = {
+                "transaction_id": f"{prefix}_{index}",
+                "source_account": f"acc_user_{index % 1000}",
+                "destination_account": "acc_merchant_456",
+                "amount": str(1000 + index),
+                "currency": "INR",
+            }
+        originals.append(payload)
+        deliveries.append(payload)
+    return deliveries
+
+
+async def _send_all(client: httpx.AsyncClient, deliveries: list[dict], concurrency: int) -> dict:
+    latencies: list[float] = []
+    status_codes: dict[str, int] = {}
+    queue: asyncio.Queue[dict] = asyncio.Queue()
+    for payload in deliveries:
+        queue.put_nowait(payload)
+
+    async def _client_loop() -> None:
+        while not queue.empty():
+            payload = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.post("/v1/webhooks/transactions", json=payload)
+                code = str(response.status_code)
+            except httpx.HTTPError as exc:
+                code = type(exc).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            status_codes[code] = status_codes.get(code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(deliveries),
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(deliveries) / elapsed, 1),
+        "ack_p50_ms": _percentile(latencies, 0.50),
+        "ack_p95_ms": _percentile(latencies, 0.95),
+        "ack_p99_ms": _percentile(latencies, 0.99),
+        "ack_max_ms": round(latencies[-1], 3) if latencies else None,
+        "status_codes": status_codes,
+    }
+
+
+async def _processing_lag(client: httpx.AsyncClient, transaction_ids: list[str], timeout: float) -> dict:
+    # One bulk lookup per round instead of a GET per transaction; stops when every row is final.
+    lags: list[float] = []
+    pending = list(transaction_ids)
+    deadline = time.perf_counter() + timeout
+    while pending and time.perf_counter() < deadline:
+        still_pending: list[str] = []
+        for offset in range(0, len(pending), 5000):
+            chunk = pending[offset : offset + 5000]
+            response = await client.post("/v1/transactions:lookup", json={"transaction_ids": chunk})
+            response.raise_for_status()
+            by_id = {txn["transaction_id"]: txn for txn in response.json()["transactions"]}
+            for transaction_id in chunk:
+                txn = by_id.get(transaction_id)
+                if txn is None or txn["status"] == "PROCESSING":
+                    still_pending.append(transaction_id)
+                elif txn["status"] == "PROCESSED" and txn["processed_at"]:
+                    created = datetime.fromisoformat(txn["created_at"])
+                    processed = datetime.fromisoformat(txn["processed_at"])
+                    lags.append((processed - created).total_seconds() * 1000)
+        pending = still_pending
+        if pending:
+            await asyncio.sleep(0.25)
+    lags.sort()
+    return {
+        "lag_p50_ms": _percentile(lags, 0.50),
+        "lag_p95_ms": _percentile(lags, 0.95),
+        "lag_p99_ms": _percentile(lags, 0.99),
+        "processed": len(lags),
+        "not_final_at_timeout": len(pending),
+    }
+
+
+@asynccontextmanager
+async def _asgi_client(processing_delay_seconds: int, backend: str = "postgres"):
+    from app.main import app
+    from app.utils import db as db_core
+    from app.utils.config import settings
+
+    settings.processing_delay_seconds = processing_delay_seconds
+    settings.repository_backend = backend
+    statements = {"count": 0}
+
+    def _count_statement(*_) -> None:
+        statements["count"] += 1
+
+    # ASGITransport does not run lifespan events, so enter the app's lifespan explicitly.
+    async with app.router.lifespan_context(app):
+        sync_engine = db_core.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _count_statement)
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                yield client, statements
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", _count_statement)
+
+
+async def _cleanup(prefix: str, backend: str = "postgres") -> None:
+    from app.utils import db as db_core
+    from app.models.transaction import Transaction, TransactionKey
+    from app.repositories.memory_repository import memory_store
+
+    if backend == "memory":
+        memory_store.clear()
+        return
+    async with db_core.SessionLocal() as db:
+        for model in (Transaction, TransactionKey):
+            await db.execute(delete(model).where(model.transaction_id.like(f"{prefix}_%")))
+        await db.commit()
+    await db_core.engine.dispose()
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    prefix = f"bench_{uuid.uuid4().hex[:8]}"
+    recorded, skipped = _load_payloads(args.payloads)
+    deliveries = build_workload(
+        prefix=prefix,
+        requests=args.requests,
+        recorded=recorded,
+        duplicate_ratio=args.duplicate_ratio,
+        conflict_ratio=args.conflict_ratio,
+        seed=args.seed,
+    )
+    created_ids = list(dict.fromkeys(payload["transaction_id"] for payload in deliveries))
+    results: dict = {
+        "git_commit": _git_commit(),
+        "started_at": datetime.now().astimezone().isoformat(),
+        "target": args.target,
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "duplicate_ratio": args.duplicate_ratio,
+            "conflict_ratio": args.conflict_ratio,
+            "payloads": str(args.payloads) if args.payloads else None,
+            "payloads_skipped": skipped,
+            "seed": args.seed,
+            "unique_transactions": len(created_ids),
+        },
+    }
+
+    if args.target == "http":
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.request_timeout) as client:
+            results["ack"] = await _send_all(client, deliveries, args.concurrency)
+            results["processing"] = await _processing_lag(client, created_ids, args.drain_timeout)
+        # Statement counts live in the server process; not observable over HTTP.
+        results["db_statements_per_webhook"] = None
+        return results
+
+    results["config"]["processing_delay_seconds"] = args.processing_delay
+    results["config"]["backend"] = args.backend
+    try:
+        async with _asgi_client(args.processing_delay, args.backend) as (client, statements):
+            results["ack"] = await _send_all(client, deliveries, args.concurrency)
+            results["db_statements_per_webhook"] = round(statements["count"] / len(deliveries), 3)
+            results["processing"] = await _processing_lag(client, created_ids, args.drain_timeout)
+    finally:
+        await _cleanup(prefix, args.backend)
+    return results
+
+
+def _flatten(results: dict) -> dict[str, float | None]:
+    return {**results.get("ack", {}), **results.get("processing", {}), **results}
+
+
+def compare(previous: dict, current: dict) -> dict[str, dict]:
+    before, after = _flatten(previous), _flatten(current)
+    comparison: dict[str, dict] = {}
+    for metric, better in _COMPARED.items():
+        old, new = before.get(metric), after.get(metric)
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old == 0:
+            continue
+        change = (new - old) / old * 100
+        improved = change < 0 if better == "lower" else change > 0
+        comparison[metric] = {"before": old, "after": new, "change_pct": round(change, 1), "improved": improved}
+    return comparison
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=("asgi", "http"), default="asgi")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--backend", choices=("postgres", "memory"), default="postgres", help="In-process repository backend"
+    )
+    parser.add_argument("--payloads", type=Path, help="JSONL file with one webhook payload per line to replay")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2)
+    parser.add_argument("--conflict-ratio", type=float, default=0.05, help="Share of duplicates that conflict")
+    parser.add_argument("--processing-delay", type=int, default=0, help="In-process PROCESSING_DELAY_SECONDS")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="Max seconds to wait for processing")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write the JSON results here")
+    parser.add_argument("--compare", type=Path, help="Previous results JSON to diff against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+    if args.compare:
+        results["comparison"] = compare(json.loads(args.compare.read_text()), results)
+    rendered = json.dumps(results, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n")
+    print(rendered)
+
+
+if __name__ == "__main__":
+    main()
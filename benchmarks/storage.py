@@ -0,0 +1,214 @@
+"""Storage and write-throughput benchmark: the previous transactions layout vs the compact one.
+
+Run against a real Postgres (uses DATABASE_URL from settings):
+
+    python -m benchmarks.storage --rows 200000 --batch-size 100 [--fillfactor 70]
+
+Each layout is built in its own scratch schema (`bench_storage_legacy`, `bench_storage_compact`) and
+dropped afterwards. The compact layout is created from the app's own metadata, the legacy one from the DDL
+it replaced. Rows are inserted set-based, then moved PROCESSING -> PROCESSED in committed batches the way
+`mark_many_processed` does, so the numbers isolate row and index cost from client round trips.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.models.transaction import Transaction  # noqa: F401
+
+_LEGACY_SCHEMA = "bench_storage_legacy"
+_COMPACT_SCHEMA = "bench_storage_compact"
+
+# The layout before compaction: hex hash, NUMERIC amount, (id, created_at) key plus a transaction_id index,
+# and status in three indexes.
+_LEGACY_DDL = (
+    "CREATE TYPE transaction_status AS ENUM ('PROCESSING', 'PROCESSED', 'FAILED')",
+    """
+    CREATE TABLE transactions (
+        id UUID NOT NULL,
+        transaction_id VARCHAR(128) NOT NULL,
+        source_account VARCHAR(128) NOT NULL,
+        destination_account VARCHAR(128) NOT NULL,
+        amount NUMERIC(18, 2) NOT NULL,
+        currency VARCHAR(3) NOT NULL,
+        status transaction_status NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        processed_at TIMESTAMPTZ NULL,
+        processing_started_at TIMESTAMPTZ NULL,
+        error_message TEXT NULL,
+        payload_hash VARCHAR(64) NOT NULL,
+        duplicate_conflict_count INTEGER NOT NULL DEFAULT 0,
+        last_conflict_at TIMESTAMPTZ NULL,
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at)
+    """,
+    "CREATE TABLE transactions_default PARTITION OF transactions DEFAULT",
+    "CREATE INDEX ix_transactions_transaction_id ON transactions (transaction_id)",
+    "CREATE INDEX ix_transactions_status ON transactions (status)",
+    "CREATE INDEX ix_transactions_status_processing_started_at ON transactions (status, processing_started_at)",
+    "CREATE INDEX ix_transactions_created_at_id ON transactions (created_at, id)",
+    "CREATE INDEX ix_transactions_source_account_created_at_id ON transactions (source_account, created_at, id)",
+    "CREATE INDEX ix_transactions_destination_account_created_at_id"
+    " ON transactions (destination_account, created_at, id)",
+    "CREATE INDEX ix_transactions_unsettled_status_created_at_id ON transactions (status, created_at, id)"
+    " WHERE status <> 'PROCESSED'",
+)
+
+# Realistic value widths: provider IDs, account IDs and amounts with cents.
+_LEGACY_INSERT = """
+    INSERT INTO transactions (
+        id, transaction_id, source_account, destination_account, amount, currency,
+        status, processing_started_at, payload_hash
+    )
+    SELECT gen_random_uuid(), 'txn_' || lpad(n::text, 12, '0'), 'acc_user_' || (n % 5000),
+        'acc_merchant_' || (n % 200), (1000 + n % 100000) / 100.0, 'INR',
+        'PROCESSING', now(), encode(sha256(n::text::bytea), 'hex')
+    FROM generate_series(CAST(:start AS BIGINT), CAST(:stop AS BIGINT)) AS n
+"""
+_COMPACT_INSERT = """
+    INSERT INTO transactions (
+        id, transaction_id, source_account, destination_account, amount_minor, currency,
+        status, processing_started_at, payload_hash
+    )
+    SELECT gen_random_uuid(), 'txn_' || lpad(n::text, 12, '0'), 'acc_user_' || (n % 5000),
+        'acc_merchant_' || (n % 200), 1000 + n % 100000, 'INR',
+        'PROCESSING', now(), sha256(n::text::bytea)
+    FROM generate_series(CAST(:start AS BIGINT), CAST(:stop AS BIGINT)) AS n
+"""
+# What `_transition_processing` sends for PROCESSED (updated_at comes from the column's onupdate).
+_PROCESS = """
+    UPDATE transactions
+    SET status = 'PROCESSED', processed_at = now(), error_message = NULL, updated_at = now()
+    WHERE transaction_id = ANY(CAST(:ids AS VARCHAR[])) AND status = 'PROCESSING'
+"""
+
+
+async def _use_schema(conn: AsyncConnection, schema: str) -> None:
+    await conn.execute(text(f"SET search_path TO {schema}, public"))
+
+
+async def _create_legacy(conn: AsyncConnection) -> None:
+    for statement in _LEGACY_DDL:
+        await conn.execute(text(statement))
+
+
+async def _create_compact(conn: AsyncConnection) -> None:
+    await conn.run_sync(db_core.Base.metadata.create_all)
+
+
+async def _relation_bytes(conn: AsyncConnection) -> dict[str, int]:
+    # Heap (with TOAST) and indexes of every transactions partition, plus the pending queue when present.
+    heap, indexes = (
+        await conn.execute(
+            text(
+                "SELECT COALESCE(sum(pg_table_size(inhrelid)), 0), COALESCE(sum(pg_indexes_size(inhrelid)), 0)"
+                " FROM pg_inherits WHERE inhparent = to_regclass('transactions')"
+            )
+        )
+    ).one()
+    queue = (
+        await conn.execute(text("SELECT COALESCE(pg_total_relation_size(to_regclass('pending_transactions')), 0)"))
+    ).scalar_one()
+    return {"heap_bytes": int(heap), "index_bytes": int(indexes), "queue_bytes": int(queue)}
+
+
+async def _hot_ratio(conn: AsyncConnection, schema: str) -> float:
+    stats = await conn.execute(
+        text(
+            "SELECT COALESCE(sum(n_tup_upd), 0), COALESCE(sum(n_tup_hot_upd), 0) FROM pg_stat_user_tables"
+            " WHERE schemaname = :schema AND relname LIKE 'transactions%'"
+        ),
+        {"schema": schema},
+    )
+    updated, hot = stats.one()
+    return float(hot) / float(updated) if updated else 0.0
+
+
+async def _run_layout(schema: str, create, insert_sql: str, rows: int, batch_size: int) -> dict[str, float]:
+    async with db_core.engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+        await _use_schema(conn, schema)
+        await create(conn)
+
+    async with db_core.engine.connect() as conn:
+        await _use_schema(conn, schema)
+        await conn.commit()
+        started = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            await conn.execute(text(insert_sql), {"start": start, "stop": min(start + batch_size, rows) - 1})
+            await conn.commit()
+        insert_seconds = time.perf_counter() - started
+
+        await conn.execute(text("ANALYZE transactions"))
+        await conn.commit()
+        sizes = await _relation_bytes(conn)
+
+        ids = [f"txn_{n:012d}" for n in range(rows)]
+        started = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            await conn.execute(text(_PROCESS), {"ids": ids[start : start + batch_size]})
+            await conn.commit()
+        update_seconds = time.perf_counter() - started
+        after_update = await _relation_bytes(conn)
+        # Make this backend's counters visible in pg_stat_user_tables right away (PostgreSQL 15+).
+        await conn.execute(text("SELECT pg_stat_force_next_flush()"))
+        await conn.commit()
+
+    async with db_core.engine.connect() as conn:
+        hot_ratio = await _hot_ratio(conn, schema)
+
+    per_million = 1_000_000 / rows
+    return {
+        "insert_rows_per_second": rows / insert_seconds,
+        "process_rows_per_second": rows / update_seconds,
+        "hot_update_ratio": hot_ratio,
+        "mib_per_million_rows": {
+            "heap": sizes["heap_bytes"] * per_million / 2**20,
+            "indexes": sizes["index_bytes"] * per_million / 2**20,
+            "total": (sizes["heap_bytes"] + sizes["index_bytes"]) * per_million / 2**20,
+        },
+        "mib_per_million_rows_after_processing": {
+            "heap": after_update["heap_bytes"] * per_million / 2**20,
+            "indexes": after_update["index_bytes"] * per_million / 2**20,
+            "total": (after_update["heap_bytes"] + after_update["index_bytes"] + after_update["queue_bytes"])
+            * per_million
+            / 2**20,
+        },
+    }
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    settings.transactions_fillfactor = args.fillfactor
+    results: dict = {"rows": args.rows, "batch_size": args.batch_size, "fillfactor": args.fillfactor}
+    try:
+        results["legacy"] = await _run_layout(_LEGACY_SCHEMA, _create_legacy, _LEGACY_INSERT, args.rows, args.batch_size)
+        results["compact"] = await _run_layout(
+            _COMPACT_SCHEMA, _create_compact, _COMPACT_INSERT, args.rows, args.batch_size
+        )
+    finally:
+        async with db_core.engine.begin() as conn:
+            for schema in (_LEGACY_SCHEMA, _COMPACT_SCHEMA):
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await db_core.engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--fillfactor", type=int, default=settings.transactions_fillfactor)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Compare the regular FastAPI webhook route against WEBHOOK_FAST_PATH_ENABLED.
+
+Run with: python -m benchmarks.webhook_fast_path [--requests 20000] [--backend memory|postgres]
+
+Requests are raw ASGI calls into the full app (middleware included) with no HTTP client or server in
+between, sequentially, so the numbers are per-request server CPU. The memory backend (default) takes the
+database out; with `--backend postgres` the database round-trips dominate and the difference shrinks.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.utils.config import settings
+from benchmarks.run import _cleanup
+
+_PATH = "/v1/webhooks/transactions"
+
+
+def _scope() -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": _PATH,
+        "raw_path": _PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+
+
+async def _call(app, body: bytes) -> tuple[int, dict, bytes]:
+    sent = False
+    response: dict = {"body": b""}
+
+    async def receive() -> dict:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = dict(message["headers"])
+        else:
+            response["body"] += message.get("body", b"")
+
+    await app(_scope(), receive, send)
+    return response["status"], response["headers"], response["body"]
+
+
+def _body(prefix: str, index: int) -> bytes:
+    return json.dumps(
+        {
+            "transaction_id": f"{prefix}_{index}",
+            "source_account": "acc_user_789",
+            "destination_account": "acc_merchant_456",
+            "amount": 1500.5,
+            "currency": "INR",
+        }
+    ).encode()
+
+
+async def _run(app, fast: bool, requests: int) -> dict[str, float]:
+    settings.webhook_fast_path_enabled = fast
+    prefix = f"bench_fast_path_{int(fast)}_{time.time_ns()}"
+    bodies = [_body(prefix, index) for index in range(requests)]
+    # Warm-up outside the measurement.
+    for index in range(min(200, requests)):
+        await _call(app, _body(f"{prefix}_warm", index))
+
+    started_wall = time.perf_counter()
+    started_cpu = time.process_time()
+    for body in bodies:
+        status, _, _ = await _call(app, body)
+        assert status == 202, status
+    cpu = time.process_time() - started_cpu
+    wall = time.perf_counter() - started_wall
+    return {"cpu_us_per_request": cpu / requests * 1e6, "wall_us_per_request": wall / requests * 1e6}
+
+
+async def _parity(app) -> dict[str, bool]:
+    body = _body(f"bench_fast_path_parity_{time.time_ns()}", 0)
+    responses = {}
+    for fast in (False, True):
+        settings.webhook_fast_path_enabled = fast
+        status, headers, raw = await _call(app, body)
+        parsed = json.loads(raw)
+        parsed.pop("response_time_ms")
+        responses[fast] = (status, headers.get(b"content-type"), list(json.loads(raw)), parsed)
+    invalid = b'{"transaction_id": ""}'
+    errors = {}
+    for fast in (False, True):
+        settings.webhook_fast_path_enabled = fast
+        errors[fast] = await _call(app, invalid)
+    return {
+        "ack_identical_except_timing": responses[False] == responses[True],
+        "validation_error_identical": errors[False][0] == errors[True][0] and errors[False][2] == errors[True][2],
+    }
+
+
+async def _main(requests: int, backend: str) -> dict:
+    from app.main import app
+
+    settings.repository_backend = backend
+    # Accepted rows stay PROCESSING for the whole run; processing is not what is measured here.
+    settings.processing_delay_seconds = 3600
+    async with app.router.lifespan_context(app):
+        try:
+            regular = await _run(app, fast=False, requests=requests)
+            fast = await _run(app, fast=True, requests=requests)
+            parity = await _parity(app)
+        finally:
+            settings.webhook_fast_path_enabled = False
+    await _cleanup("bench_fast_path", backend)
+    return {
+        "backend": backend,
+        "requests": requests,
+        "regular": regular,
+        "fast_path": fast,
+        "cpu_speedup": regular["cpu_us_per_request"] / fast["cpu_us_per_request"],
+        **parity,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--backend", choices=("memory", "postgres"), default="memory")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args.requests, args.backend)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
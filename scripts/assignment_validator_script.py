@@ -42,18 +42,31 @@ def get_transaction(client: httpx.Client, base_url: str, txn_id: str):
     return client.get(f"{base_url}/v1/transactions/{txn_id}")
 
 
+LONG_POLL_MAX_SECONDS = 30
+
+
 def poll_processed(
     client: httpx.Client, base_url: str, txn_id: str, max_wait_seconds: int, poll_interval_seconds: float
 ) -> tuple[bool, str | None]:
+    # Long-poll: the server answers as soon as the transaction is final, so one request usually suffices.
+    # Servers without `wait` support answer immediately and this degrades to interval polling.
     deadline = time.time() + max_wait_seconds
     last_status = None
     while time.time() < deadline:
-        resp = get_transaction(client, base_url, txn_id)
+        wait = max(1, min(LONG_POLL_MAX_SECONDS, int(deadline - time.time())))
+        resp = client.get(
+            f"{base_url}/v1/transactions/{txn_id}",
+            params={"wait": wait},
+            timeout=client.timeout.read + wait if client.timeout.read else None,
+        )
         if resp.status_code == 200:
             status = extract_status(resp.json())
             last_status = status
             if status == "PROCESSED":
                 return True, status
+            if status == "FAILED":
+                # Final; waiting longer cannot turn it into PROCESSED.
+                return False, status
         time.sleep(poll_interval_seconds)
     return False, last_status
 
@@ -1,4 +1,4 @@
--- PostgreSQL schema for transactions table
+-- PostgreSQL schema for transactions and transaction_keys tables
 -- Mirrors app/models/transaction.py
 
 -- UUID generator for PRIMARY KEY default.
@@ -16,12 +16,17 @@ BEGIN
     END IF;
 END $$;
 
+-- Range-partitioned by created_at (one partition per UTC month, created ahead of time by the app's
+-- partition maintenance). Unique constraints on a partitioned table must include created_at, so the
+-- global uniqueness of transaction_id is enforced by transaction_keys below.
+-- Compact row: amounts in integer minor units, the payload hash as its raw 32-byte SHA-256 digest.
 CREATE TABLE IF NOT EXISTS transactions (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    -- Keyset pagination tie-breaker; not a key.
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     transaction_id VARCHAR(128) NOT NULL,
     source_account VARCHAR(128) NOT NULL,
     destination_account VARCHAR(128) NOT NULL,
-    amount NUMERIC(18, 2) NOT NULL,
+    amount_minor BIGINT NOT NULL,
     currency VARCHAR(3) NOT NULL,
     status transaction_status NOT NULL,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -29,19 +34,70 @@ CREATE TABLE IF NOT EXISTS transactions (
     processed_at TIMESTAMPTZ NULL,
     processing_started_at TIMESTAMPTZ NULL,
     error_message TEXT NULL,
-    payload_hash VARCHAR(64) NOT NULL,
+    payload_hash BYTEA NOT NULL,
     duplicate_conflict_count INTEGER NOT NULL DEFAULT 0,
-    last_conflict_at TIMESTAMPTZ NULL
+    last_conflict_at TIMESTAMPTZ NULL,
+    PRIMARY KEY (transaction_id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Catch-all for rows outside every monthly partition. Partitions leave 30% of each page free
+-- (TRANSACTIONS_FILLFACTOR) so status transitions can be HOT updates.
+CREATE TABLE IF NOT EXISTS transactions_default PARTITION OF transactions DEFAULT WITH (fillfactor = 70);
+
+-- Global dedup table: one row per transaction_id, with the created_at that locates its partition.
+CREATE TABLE IF NOT EXISTS transaction_keys (
+    transaction_id VARCHAR(128) PRIMARY KEY,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Retention deletes keys by month range.
+CREATE INDEX IF NOT EXISTS ix_transaction_keys_created_at
+    ON transaction_keys (created_at);
+
+-- Unfinished transactions, kept by trg_transactions_pending below. Queue claims and the stale sweeper
+-- start here, so no index on transactions has to mention status.
+CREATE TABLE IF NOT EXISTS pending_transactions (
+    transaction_id VARCHAR(128) PRIMARY KEY,
+    created_at TIMESTAMPTZ NOT NULL
 );
 
-CREATE UNIQUE INDEX IF NOT EXISTS ix_transactions_transaction_id
-    ON transactions (transaction_id);
+-- Keyset listing indexes for GET /v1/transactions (order by created_at, id).
+CREATE INDEX IF NOT EXISTS ix_transactions_created_at_id
+    ON transactions (created_at, id);
+
+CREATE INDEX IF NOT EXISTS ix_transactions_source_account_created_at_id
+    ON transactions (source_account, created_at, id);
 
-CREATE INDEX IF NOT EXISTS ix_transactions_status
-    ON transactions (status);
+CREATE INDEX IF NOT EXISTS ix_transactions_destination_account_created_at_id
+    ON transactions (destination_account, created_at, id);
 
-CREATE INDEX IF NOT EXISTS ix_transactions_status_processing_started_at
-    ON transactions (status, processing_started_at);
+-- FAILED (and interrupted) rows for status-filtered listing.
+CREATE INDEX IF NOT EXISTS ix_transactions_errored_created_at_id
+    ON transactions (created_at, id)
+    WHERE error_message IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION track_pending_transactions()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.status = 'PROCESSING' THEN
+            INSERT INTO pending_transactions (transaction_id, created_at)
+            VALUES (NEW.transaction_id, NEW.created_at)
+            ON CONFLICT (transaction_id) DO NOTHING;
+        END IF;
+    ELSIF OLD.status = 'PROCESSING' AND (TG_OP = 'DELETE' OR NEW.status <> 'PROCESSING') THEN
+        DELETE FROM pending_transactions WHERE transaction_id = OLD.transaction_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_transactions_pending ON transactions;
+
+CREATE TRIGGER trg_transactions_pending
+AFTER INSERT OR UPDATE OF status OR DELETE ON transactions
+FOR EACH ROW
+EXECUTE FUNCTION track_pending_transactions();
 
 -- Keep updated_at in sync for UPDATE statements issued outside SQLAlchemy.
 CREATE OR REPLACE FUNCTION set_transactions_updated_at()
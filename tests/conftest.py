@@ -8,8 +8,11 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
 from app.utils import db as db_core
+from app.utils.cache import transaction_cache
+from app.utils.duplicate_filter import duplicate_filter
 from app.utils.config import settings
-from app.models.transaction import Transaction  # noqa: F401
+from app.utils.enums import TransactionStatus
+from app.models.transaction import Transaction
 
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -46,6 +49,9 @@ def setup_database(test_engine):
             await conn.run_sync(db_core.Base.metadata.drop_all)
 
     asyncio.run(_setup())
+    # Cached bodies refer to rows that the table reset just dropped.
+    transaction_cache.clear()
+    duplicate_filter.clear()
     yield
     asyncio.run(_teardown())
     asyncio.run(test_engine.dispose())
@@ -59,3 +65,52 @@ def client():
 
     with TestClient(app) as test_client:
         yield test_client
+
+
+@pytest.fixture
+def payload():
+    """Factory for webhook payload dicts; keyword arguments override single fields."""
+
+    def _payload(transaction_id: str = "txn_abc123def456", **overrides) -> dict:
+        return {
+            "transaction_id": transaction_id,
+            "source_account": "acc_user_789",
+            "destination_account": "acc_merchant_456",
+            "amount": 1500,
+            "currency": "INR",
+            **overrides,
+        }
+
+    return _payload
+
+
+@pytest.fixture
+def post_webhook(client, payload):
+    """POSTs one webhook built by `payload` and asserts it was acknowledged."""
+
+    def _post(transaction_id: str, **overrides) -> None:
+        response = client.post("/v1/webhooks/transactions", json=payload(transaction_id, **overrides))
+        assert response.status_code == 202
+
+    return _post
+
+
+@pytest.fixture
+def make_transaction():
+    """Factory for PROCESSING Transaction rows added straight to a session; keyword arguments override columns."""
+
+    def _make(transaction_id: str, **overrides) -> Transaction:
+        return Transaction(
+            **{
+                "transaction_id": transaction_id,
+                "source_account": "acc_user_1",
+                "destination_account": "acc_merchant_1",
+                "amount": 100,
+                "currency": "INR",
+                "status": TransactionStatus.PROCESSING,
+                "payload_hash": b"abc",
+                **overrides,
+            }
+        )
+
+    return _make
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from app.utils.config import settings
+from app.utils.runtime import drain_background_tasks
+from app.utils.scheduler import DelayedBatchScheduler
+from app.services import processor
+
+
+@pytest.mark.asyncio
+async def test_delayed_scheduler_batches_due_keys_and_bounds_pending():
+    handled: list[list[str]] = []
+
+    async def _handler(batch: list[str]) -> None:
+        handled.append(batch)
+
+    scheduler = DelayedBatchScheduler(_handler, worker_count=1, batch_size=2, max_pending=3)
+    accepted = [
+        scheduler.submit("txn_late", 0.2),
+        scheduler.submit("txn_early_1", 0.05),
+        scheduler.submit("txn_early_2", 0.05),
+        scheduler.submit("txn_overflow", 0.05),
+    ]
+
+    assert accepted == [True, True, True, False]
+    assert (scheduler.pending, scheduler.overflow_total) == (3, 1)
+    assert not scheduler.has_capacity()
+
+    assert await scheduler.wait_for_capacity(1.0)
+    await asyncio.sleep(0.3)
+    assert handled == [["txn_early_1", "txn_early_2"], ["txn_late"]]
+    assert (scheduler.in_flight, scheduler.pending) == (0, 0)
+    await drain_background_tasks()
+
+
+@pytest.mark.asyncio
+async def test_delayed_scheduler_take_pending_returns_unstarted_keys():
+    async def _handler(_: list[str]) -> None:
+        raise AssertionError("handler must not run for taken keys")
+
+    scheduler = DelayedBatchScheduler(_handler, worker_count=1, batch_size=10, max_pending=10)
+    scheduler.submit("txn_a", 5)
+    scheduler.submit("txn_b", 5)
+    assert sorted(scheduler.take_pending()) == ["txn_a", "txn_b"]
+    assert scheduler.pending == 0
+    await drain_background_tasks()
+
+
+@pytest.mark.asyncio
+async def test_delayed_scheduler_caps_in_flight_keys_across_workers():
+    release = asyncio.Event()
+    handled: list[list[str]] = []
+
+    async def _handler(batch: list[str]) -> None:
+        handled.append(batch)
+        await release.wait()
+
+    scheduler = DelayedBatchScheduler(_handler, worker_count=4, batch_size=2, max_pending=10, max_in_flight=3)
+    for i in range(6):
+        scheduler.submit(f"txn_{i}", 0)
+    await asyncio.sleep(0.05)
+    assert (scheduler.in_flight, scheduler.pending) == (3, 3)
+    assert handled == [["txn_0", "txn_1"], ["txn_2"]]
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert (scheduler.in_flight, scheduler.pending) == (0, 0)
+    assert sorted(key for batch in handled for key in batch) == [f"txn_{i}" for i in range(6)]
+    await drain_background_tasks()
+
+
+def test_saturated_processing_rejects_with_retry_after(client, monkeypatch, payload):
+    class _SaturatedScheduler:
+        def has_capacity(self) -> bool:
+            return False
+
+    monkeypatch.setattr(settings, "processing_overflow_policy", "reject")
+    monkeypatch.setattr(settings, "processing_overflow_retry_after_seconds", 7)
+    monkeypatch.setattr(processor, "get_processing_scheduler", lambda: _SaturatedScheduler())
+
+    response = client.post("/v1/webhooks/transactions", json=payload("txn_backpressure_1"))
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "7"
+    assert client.get("/v1/transactions/txn_backpressure_1").json() == []
+
+
+def test_runtime_stats_exposes_processing_queue_depth(client):
+    response = client.get("/v1/runtime/stats")
+    assert response.status_code == 200
+    stats = response.json()["processing"]
+    assert stats["mode"] == settings.processing_mode
+    assert stats["in_flight"] >= 0
+    assert stats["pending"] >= 0
+    assert stats["worker_count"] == settings.processing_worker_count
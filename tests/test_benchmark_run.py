@@ -0,0 +1,30 @@
+from benchmarks.run import build_workload, compare
+
+
+def test_workload_mixes_originals_duplicates_and_conflicts(payload):
+    recorded = [payload("rec_1", amount="1500")]
+    deliveries = build_workload(
+        prefix="bench_t", requests=500, recorded=recorded, duplicate_ratio=0.5, conflict_ratio=0.2, seed=1
+    )
+
+    ids = [delivery["transaction_id"] for delivery in deliveries]
+    assert len(deliveries) == 500
+    assert all(transaction_id.startswith("bench_t_") for transaction_id in ids)
+    assert 150 < len(set(ids)) < 350
+    amounts_by_id: dict[str, set[str]] = {}
+    for delivery in deliveries:
+        amounts_by_id.setdefault(delivery["transaction_id"], set()).add(delivery["amount"])
+    assert any(len(amounts) > 1 for amounts in amounts_by_id.values())
+    assert deliveries == build_workload(
+        prefix="bench_t", requests=500, recorded=recorded, duplicate_ratio=0.5, conflict_ratio=0.2, seed=1
+    )
+
+
+def test_compare_marks_direction_of_improvement():
+    before = {"ack": {"ack_p95_ms": 100.0, "requests_per_second": 200.0}}
+    after = {"ack": {"ack_p95_ms": 80.0, "requests_per_second": 150.0}}
+
+    comparison = compare(before, after)
+
+    assert comparison["ack_p95_ms"] == {"before": 100.0, "after": 80.0, "change_pct": -20.0, "improved": True}
+    assert comparison["requests_per_second"]["improved"] is False
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.utils import db as db_core
+from app.utils.config import settings
+
+
+def _set_alembic_version(test_engine, revision: str | None) -> None:
+    async def _run() -> None:
+        async with test_engine.begin() as conn:
+            await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+            if revision is not None:
+                await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+                await conn.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": revision})
+
+    asyncio.run(_run())
+
+
+@pytest.fixture
+def alembic_version(test_engine):
+    yield lambda revision: _set_alembic_version(test_engine, revision)
+    _set_alembic_version(test_engine, None)
+
+
+def test_schema_revision_matches_alembic_head():
+    assert db_core.SCHEMA_REVISION == ScriptDirectory.from_config(Config("alembic.ini")).get_current_head()
+
+
+def test_verify_schema_revision_requires_current_head(alembic_version):
+    with pytest.raises(db_core.SchemaRevisionError, match="alembic upgrade head"):
+        asyncio.run(db_core.verify_schema_revision())
+
+    alembic_version("20261017_0003")
+    with pytest.raises(db_core.SchemaRevisionError, match="20261017_0003"):
+        asyncio.run(db_core.verify_schema_revision())
+
+    alembic_version(db_core.SCHEMA_REVISION)
+    asyncio.run(db_core.verify_schema_revision())
+
+
+def test_alembic_schema_check_starts_and_serves(alembic_version, monkeypatch):
+    monkeypatch.setattr(settings, "db_schema_check", "alembic")
+    monkeypatch.setattr(settings, "processing_delay_seconds", 1)
+    alembic_version(db_core.SCHEMA_REVISION)
+    from app.main import app
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/v1/webhooks/transactions",
+            json={
+                "transaction_id": "txn_fast_start_1",
+                "source_account": "acc_user_1",
+                "destination_account": "acc_merchant_1",
+                "amount": 100,
+                "currency": "INR",
+            },
+        )
+        assert response.status_code == 202
+
+    alembic_version(None)
+    with pytest.raises(db_core.SchemaRevisionError):
+        with TestClient(app):
+            pass
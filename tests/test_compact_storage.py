@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, text
+
+from app.utils import db as db_core
+from app.utils.time import utcnow
+from app.models.transaction import PendingTransaction
+from app.repositories.transaction_repository import TransactionRepository
+
+
+async def _ingest(transaction_id: str, amount: Decimal) -> None:
+    async with db_core.SessionLocal() as db:
+        await TransactionRepository(db).ingest(
+            transaction_id=transaction_id,
+            source_account="acc_user_1",
+            destination_account="acc_merchant_1",
+            amount=amount,
+            currency="INR",
+            payload_hash=b"\x01" * 32,
+            now=utcnow(),
+            stale_timeout_seconds=120,
+        )
+
+
+async def _pending_ids() -> set[str]:
+    async with db_core.SessionLocal() as db:
+        return set((await db.execute(select(PendingTransaction.transaction_id))).scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_amounts_are_stored_as_minor_units_and_hashes_as_bytes(test_engine):
+    await _ingest("txn_compact_amount", Decimal("10.005"))
+
+    async with db_core.SessionLocal() as db:
+        stored = (
+            await db.execute(
+                text("SELECT amount_minor, payload_hash FROM transactions WHERE transaction_id = 'txn_compact_amount'")
+            )
+        ).one()
+        transaction = await TransactionRepository(db).get_one_by_transaction_id("txn_compact_amount")
+
+    # Half away from zero, as the former NUMERIC(18, 2) cast rounded.
+    assert stored.amount_minor == 1001
+    assert stored.payload_hash == b"\x01" * 32
+    assert transaction.amount == Decimal("10.01")
+
+
+@pytest.mark.asyncio
+async def test_pending_set_follows_processing_transitions(test_engine):
+    for transaction_id in ("txn_compact_done", "txn_compact_failed", "txn_compact_open"):
+        await _ingest(transaction_id, Decimal("1"))
+    assert await _pending_ids() == {"txn_compact_done", "txn_compact_failed", "txn_compact_open"}
+    async with db_core.SessionLocal() as db:
+        claimed = await TransactionRepository(db).claim_due_for_processing(due_before=utcnow(), limit=10)
+    assert set(claimed) == {"txn_compact_done", "txn_compact_failed", "txn_compact_open"}
+
+    async with db_core.SessionLocal() as db:
+        repository = TransactionRepository(db)
+        assert await repository.mark_processed("txn_compact_done", processed_at=utcnow())
+        assert await repository.mark_failed("txn_compact_failed", error_message="boom")
+        # Start stamps and interrupts do not set status, so the row stays pending.
+        assert await repository.mark_interrupted("txn_compact_open", message="interrupted")
+
+    assert await _pending_ids() == {"txn_compact_open"}
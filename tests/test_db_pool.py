@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.util import memoized_property
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.services.pool_autoscaler import autoscale_pool, next_pool_size
+
+
+def test_prewarm_opens_idle_connections_and_shrink_closes_surplus(test_engine, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_adaptive_min_size", 2)
+    monkeypatch.setattr(settings, "db_pool_adaptive_max_size", 8)
+    engine = create_async_engine(
+        test_engine.url, poolclass=db_core.InstrumentedAsyncQueuePool, pool_size=6, max_overflow=2
+    )
+    monkeypatch.setattr(db_core, "engine", engine)
+
+    async def _run() -> None:
+        pool = db_core.instrumented_pool()
+        # Capped at the pool size: anything above it would be closed again on check-in.
+        assert await db_core.prewarm_pool(10) == 6
+        assert (pool.checkedin(), pool.checkedout()) == (6, 0)
+        assert pool.checkouts_total == 6
+
+        pool.take_window()
+        assert await autoscale_pool(pool) == 5
+        assert (pool.size(), pool.checkedin(), pool.checkedout()) == (5, 5, 0)
+
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT 1"))).scalar_one() == 1
+            assert pool.checkedout() == 1
+        assert pool.checkedin() == 5
+        await engine.dispose()
+
+    asyncio.run(_run())
+
+
+def test_pool_grows_to_keep_overflow_connections(test_engine):
+    engine = create_async_engine(
+        test_engine.url, poolclass=db_core.InstrumentedAsyncQueuePool, pool_size=2, max_overflow=4
+    )
+
+    async def _hold(conns: int) -> None:
+        opened = [engine.connect() for _ in range(conns)]
+        await asyncio.gather(*(conn.start() for conn in opened))
+        for conn in opened:
+            await conn.close()
+
+    async def _run() -> None:
+        pool = engine.pool
+        await _hold(5)
+        # Three overflow connections were closed on check-in; only the pool size stays open.
+        assert pool.checkedin() == 2
+
+        pool.resize(5)
+        await _hold(5)
+        assert (pool.size(), pool.checkedin(), pool.overflow()) == (5, 5, 0)
+        assert pool.resizes_total == 1
+        await engine.dispose()
+
+    asyncio.run(_run())
+
+
+def test_resize_internals_and_pool_logger_match_the_installed_sqlalchemy(test_engine):
+    engine = create_async_engine(
+        test_engine.url, poolclass=db_core.InstrumentedAsyncQueuePool, pool_size=3, max_overflow=1
+    )
+    pool = engine.pool
+
+    # resize() and close_surplus_idle() adjust these directly; see the note above _ResizableAsyncQueue.
+    assert isinstance(AsyncAdaptedQueue.__dict__["_queue"], memoized_property)
+    assert isinstance(pool._pool, db_core._ResizableAsyncQueue)
+    assert (pool._pool.maxsize, pool._overflow) == (3, -3)
+    assert isinstance(pool._overflow_lock, type(threading.Lock())) and callable(pool._dec_overflow)
+
+    assert pool.logger.name.startswith("sqlalchemy.pool.")
+    asyncio.run(engine.dispose())
+
+
+def test_next_pool_size_grows_on_waits_and_shrinks_on_idle_headroom():
+    def window(checkouts=100, slow=0, timeouts=0, peak=0):
+        return db_core.PoolWaitWindow(
+            checkouts=checkouts, slow_checkouts=slow, timeouts=timeouts, peak_checked_out=peak
+        )
+
+    bounds = {"min_size": 2, "max_size": 20}
+    assert next_pool_size(8, window(slow=10, peak=8), **bounds) == 10
+    assert next_pool_size(8, window(slow=5, peak=13), **bounds) == 13
+    assert next_pool_size(8, window(checkouts=3, timeouts=1, peak=8), **bounds) == 10
+    assert next_pool_size(18, window(slow=50, peak=18), **bounds) == 20
+    assert next_pool_size(8, window(slow=2, peak=3), **bounds) == 7
+    assert next_pool_size(8, window(peak=7), **bounds) == 8
+    assert next_pool_size(2, window(checkouts=0), **bounds) == 2
+
+
+def test_external_pooler_mode_disables_statement_caches(test_engine, monkeypatch):
+    monkeypatch.setattr(settings, "db_external_pooler", True)
+    connect_args = db_core._connect_args()
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+    engine = create_async_engine(test_engine.url, poolclass=NullPool, connect_args=connect_args)
+
+    async def _run() -> None:
+        async with engine.connect() as conn:
+            for _ in range(3):
+                assert (await conn.execute(text("SELECT CAST(:v AS INTEGER)"), {"v": 7})).scalar_one() == 7
+        await engine.dispose()
+
+    asyncio.run(_run())
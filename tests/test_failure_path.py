@@ -1,36 +1,100 @@
+import asyncio
+
 import pytest
 from sqlalchemy import select
 
 from app.utils import db as db_core
 from app.utils.enums import TransactionStatus
+from app.utils.time import utcnow
 from app.models.transaction import Transaction
-from app.services.processor import process_transaction_background
+from app.repositories.transaction_repository import TransactionRepository
+from app.services.processor import complete_transaction_processing_batch
+from app.utils.runtime import drain_background_tasks
+from app.utils.scheduler import DelayedBatchScheduler
+
+
+async def _add_processing(*transaction_ids: str) -> None:
+    async with db_core.SessionLocal() as db:
+        for transaction_id in transaction_ids:
+            db.add(
+                Transaction(
+                    transaction_id=transaction_id,
+                    source_account="acc_user_1",
+                    destination_account="acc_merchant_1",
+                    amount=100,
+                    currency="INR",
+                    status=TransactionStatus.PROCESSING,
+                    payload_hash=transaction_id.encode(),
+                )
+            )
+        await db.commit()
+
+
+async def _wait_until_final(*transaction_ids: str) -> list[Transaction]:
+    for _ in range(50):
+        async with db_core.SessionLocal() as db:
+            rows = (await db.execute(
+                select(Transaction)
+                .where(Transaction.transaction_id.in_(transaction_ids))
+                .order_by(Transaction.transaction_id)
+            )).scalars().all()
+        if rows and all(row.status != TransactionStatus.PROCESSING for row in rows):
+            return rows
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"transactions not final: {transaction_ids}")
+
+
+@pytest.mark.asyncio
+async def test_failing_batch_marks_every_row_failed_and_scheduler_keeps_working(test_engine, monkeypatch):
+    async def _fail(self, transaction_ids, *, processed_at):
+        raise RuntimeError("Simulated processing failure")
+
+    await _add_processing("txn_fail_1", "txn_fail_2", "txn_after_1")
+    scheduler = DelayedBatchScheduler(
+        complete_transaction_processing_batch, worker_count=1, batch_size=10, max_pending=10
+    )
+
+    monkeypatch.setattr(TransactionRepository, "mark_many_processed", _fail)
+    scheduler.submit("txn_fail_1", 0)
+    scheduler.submit("txn_fail_2", 0)
+    failed = await _wait_until_final("txn_fail_1", "txn_fail_2")
+    assert [row.status for row in failed] == [TransactionStatus.FAILED] * 2
+    assert [row.error_message for row in failed] == ["Simulated processing failure"] * 2
+
+    monkeypatch.undo()
+    scheduler.submit("txn_after_1", 0)
+    (processed,) = await _wait_until_final("txn_after_1")
+    assert processed.status == TransactionStatus.PROCESSED
+    assert processed.error_message is None
+    assert (scheduler.in_flight, scheduler.pending) == (0, 0)
+    await drain_background_tasks()
 
 
 @pytest.mark.asyncio
-async def test_processing_failure_marks_transaction_failed(test_engine):
+async def test_final_rows_are_not_transitioned_again(test_engine):
     tx = Transaction(
-        transaction_id="txn_fail_1",
+        transaction_id="txn_final_1",
         source_account="acc_user_1",
         destination_account="acc_merchant_1",
         amount=100,
         currency="INR",
-        status=TransactionStatus.PROCESSING,
-        payload_hash="abc",
+        status=TransactionStatus.FAILED,
+        error_message="original failure",
+        payload_hash=b"abc",
     )
     async with db_core.SessionLocal() as db:
         db.add(tx)
         await db.commit()
 
-    await process_transaction_background(
-        transaction_id="txn_fail_1",
-        processing_delay_seconds=0,
-        fail_for_testing=True,
-    )
+    async with db_core.SessionLocal() as db:
+        repository = TransactionRepository(db)
+        assert await repository.mark_processed("txn_final_1", processed_at=utcnow()) is False
+        assert await repository.mark_many_processed(["txn_final_1", "txn_missing"], processed_at=utcnow()) == []
 
     async with db_core.SessionLocal() as db:
-        updated = (await db.execute(
-            select(Transaction).where(Transaction.transaction_id == "txn_fail_1")
+        unchanged = (await db.execute(
+            select(Transaction).where(Transaction.transaction_id == "txn_final_1")
         )).scalar_one()
-        assert updated.status == TransactionStatus.FAILED
-        assert updated.error_message is not None
+        assert unchanged.status == TransactionStatus.FAILED
+        assert unchanged.processed_at is None
+        assert unchanged.error_message == "original failure"
@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.utils import db as db_core
+from app.utils.enums import TransactionStatus
+from app.utils.time import utcnow
+from app.repositories.transaction_repository import TransactionRepository, _transition_stmt
+
+
+def _rows(prefix: str) -> list[dict]:
+    return [
+        {
+            "transaction_id": f"{prefix}_{i}",
+            "source_account": "acc_user_1",
+            "destination_account": "acc_merchant_1",
+            "amount": Decimal("12.34"),
+            "currency": "INR",
+            "status": TransactionStatus.PROCESSING,
+            "processing_started_at": utcnow(),
+            "payload_hash": bytes([i]) * 32,
+        }
+        for i in range(3)
+    ]
+
+
+async def _hot_path(prefix: str, *, notify: bool) -> None:
+    ids = [row["transaction_id"] for row in _rows(prefix)]
+    async with db_core.SessionLocal() as db:
+        repository = TransactionRepository(db, notify_final_transitions=notify)
+        assert await repository.create_many_if_not_exists(_rows(prefix)) == set(ids)
+        assert (await repository.get_one_by_transaction_id(ids[0])).amount == Decimal("12.34")
+        assert {t.transaction_id for t in await repository.get_many_by_transaction_ids(ids)} == set(ids)
+        assert await repository.start_processing(ids[0], now=utcnow())
+        assert await repository.mark_interrupted(ids[0], message="interrupted")
+        assert await repository.mark_processed(ids[0], processed_at=utcnow())
+        assert not await repository.mark_failed(ids[0], error_message="too late")
+        assert sorted(await repository.mark_many_failed(ids, error_message="boom")) == ids[1:]
+
+
+@pytest.mark.asyncio
+async def test_hot_statements_are_built_once_and_hit_the_compiled_cache(test_engine):
+    assert _transition_stmt("processed", many=True, notify=True) is _transition_stmt(
+        "processed", many=True, notify=True
+    )
+    await _hot_path("txn_hot_warm", notify=True)
+
+    cache_hits: list[bool] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        cache_hits.append(context.cache_hit == context.dialect.CACHE_HIT)
+
+    event.listen(test_engine.sync_engine, "after_cursor_execute", _record)
+    try:
+        await _hot_path("txn_hot_again", notify=True)
+    finally:
+        event.remove(test_engine.sync_engine, "after_cursor_execute", _record)
+    assert cache_hits and all(cache_hits)
@@ -1,10 +1,18 @@
 import asyncio
 import time
+from datetime import timedelta
 
-from sqlalchemy import select
+import pytest
+from sqlalchemy import select, update
 
 from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.duplicate_filter import duplicate_filter
+from app.utils.enums import TransactionStatus
+from app.utils.time import utcnow
+from app.dto.webhook import TransactionWebhookIn
 from app.models.transaction import Transaction
+from app.services.webhook_service import WebhookService
 
 
 def test_same_payload_duplicate_only_processes_once(client):
@@ -38,3 +46,75 @@ def test_same_payload_duplicate_only_processes_once(client):
             assert rows[0].duplicate_conflict_count == 0
 
     asyncio.run(_assert_db_state())
+
+
+@pytest.mark.asyncio
+async def test_duplicate_of_stale_row_is_reopened_once(test_engine):
+    payload = TransactionWebhookIn(
+        transaction_id="txn_stale_1",
+        source_account="acc_user_789",
+        destination_account="acc_merchant_456",
+        amount=1500,
+        currency="INR",
+    )
+    async with db_core.SessionLocal() as db:
+        assert await WebhookService(db).ingest_transaction_webhook(payload) == ("txn_stale_1", True)
+        assert await WebhookService(db).ingest_transaction_webhook(payload) == ("txn_stale_1", False)
+
+    stale_started_at = utcnow() - timedelta(seconds=settings.processing_stale_timeout_seconds + 1)
+    async with db_core.SessionLocal() as db:
+        await db.execute(
+            update(Transaction)
+            .where(Transaction.transaction_id == "txn_stale_1")
+            .values(processing_started_at=stale_started_at, error_message="interrupted")
+        )
+        await db.commit()
+
+    async with db_core.SessionLocal() as db:
+        assert await WebhookService(db).ingest_transaction_webhook(payload) == ("txn_stale_1", True)
+        assert await WebhookService(db).ingest_transaction_webhook(payload) == ("txn_stale_1", False)
+
+    async with db_core.SessionLocal() as db:
+        row = (await db.execute(
+            select(Transaction).where(Transaction.transaction_id == "txn_stale_1")
+        )).scalar_one()
+        assert row.processing_started_at > stale_started_at
+        assert row.error_message is None
+        assert row.duplicate_conflict_count == 0
+
+
+@pytest.mark.asyncio
+async def test_duplicate_of_final_row_is_answered_from_filter(test_engine):
+    payload = TransactionWebhookIn(
+        transaction_id="txn_final_dup_1",
+        source_account="acc_user_789",
+        destination_account="acc_merchant_456",
+        amount=1500,
+        currency="INR",
+    )
+    async with db_core.SessionLocal() as db:
+        assert await WebhookService(db).ingest_transaction_webhook(payload) == ("txn_final_dup_1", True)
+        await db.execute(
+            update(Transaction)
+            .where(Transaction.transaction_id == "txn_final_dup_1")
+            .values(status=TransactionStatus.PROCESSED, processed_at=utcnow())
+        )
+        await db.commit()
+
+    hits_before = duplicate_filter.hits
+    async with db_core.SessionLocal() as db:
+        # The first redelivery learns the final status from the database, the second skips it.
+        assert await WebhookService(db).ingest_transaction_webhook(payload) == ("txn_final_dup_1", False)
+    async with db_core.SessionLocal() as db:
+        assert await WebhookService(db).ingest_transaction_webhook(payload) == ("txn_final_dup_1", False)
+        assert not db.in_transaction()
+    assert duplicate_filter.hits == hits_before + 1
+
+    # A conflicting payload is never answered from memory.
+    conflicting = payload.model_copy(update={"amount": 2500})
+    async with db_core.SessionLocal() as db:
+        assert await WebhookService(db).ingest_transaction_webhook(conflicting) == ("txn_final_dup_1", False)
+        row = (await db.execute(
+            select(Transaction).where(Transaction.transaction_id == "txn_final_dup_1")
+        )).scalar_one()
+        assert row.duplicate_conflict_count == 1
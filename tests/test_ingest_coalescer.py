@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.utils import db as db_core
+from app.utils.enums import WebhookIngestOutcome
+from app.dto.webhook import TransactionWebhookIn
+from app.models.transaction import Transaction
+from app.services.ingest_coalescer import IngestCoalescer
+from app.utils.timing import StageTimer, _current_timer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_ingests_are_flushed_as_one_batch(test_engine, payload):
+    coalescer = IngestCoalescer(max_items=4, max_wait_seconds=0.05)
+
+    results = await asyncio.gather(
+        coalescer.submit(TransactionWebhookIn(**payload("txn_coalesce_1"))),
+        coalescer.submit(TransactionWebhookIn(**payload("txn_coalesce_2"))),
+        coalescer.submit(TransactionWebhookIn(**payload("txn_coalesce_1"))),
+        coalescer.submit(TransactionWebhookIn(**payload("txn_coalesce_3"))),
+        coalescer.submit(TransactionWebhookIn(**payload("txn_coalesce_4"))),
+    )
+    # Fifth caller is flushed by the timer after the size-triggered flush of the first four.
+    assert results == [
+        ("txn_coalesce_1", WebhookIngestOutcome.CREATED, True),
+        ("txn_coalesce_2", WebhookIngestOutcome.CREATED, True),
+        ("txn_coalesce_1", WebhookIngestOutcome.DUPLICATE, False),
+        ("txn_coalesce_3", WebhookIngestOutcome.CREATED, True),
+        ("txn_coalesce_4", WebhookIngestOutcome.CREATED, True),
+    ]
+
+    async with db_core.SessionLocal() as db:
+        count = (await db.execute(select(func.count()).select_from(Transaction))).scalar_one()
+        assert count == 4
+
+
+@pytest.mark.asyncio
+async def test_flush_stages_are_not_charged_to_the_triggering_request(test_engine, payload):
+    coalescer = IngestCoalescer(max_items=2, max_wait_seconds=0.05)
+
+    async def _timed_submit(transaction_id: str) -> StageTimer:
+        timer = StageTimer()
+        _current_timer.set(timer)
+        await coalescer.submit(TransactionWebhookIn(**payload(transaction_id)))
+        return timer
+
+    timers = await asyncio.gather(_timed_submit("txn_timed_1"), _timed_submit("txn_timed_2"))
+    assert [set(timer.stages) for timer in timers] == [{"coalesce_wait"}, {"coalesce_wait"}]
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.enums import TransactionStatus
+from app.utils.time import utcnow
+from app.models.transaction import Transaction
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.memory_repository import InMemoryTransactionRepository, InMemoryTransactionStore, memory_store
+
+
+@pytest.fixture
+def memory_client(client, monkeypatch):
+    monkeypatch.setattr(settings, "repository_backend", "memory")
+    memory_store.clear()
+    yield client
+    memory_store.clear()
+
+
+def _ingest_kwargs(transaction_id: str, payload_hash: bytes, now, stale_timeout_seconds: int = 120) -> dict:
+    return {
+        "transaction_id": transaction_id,
+        "source_account": "acc_user_789",
+        "destination_account": "acc_merchant_456",
+        "amount": Decimal("1500"),
+        "currency": "INR",
+        "payload_hash": payload_hash,
+        "now": now,
+        "stale_timeout_seconds": stale_timeout_seconds,
+    }
+
+
+def test_memory_backend_serves_the_api_without_touching_postgres(memory_client, payload):
+    webhook = payload("txn_memory_1")
+
+    assert memory_client.post("/v1/webhooks/transactions", json=webhook).status_code == 202
+    assert memory_client.post("/v1/webhooks/transactions", json=webhook).status_code == 202
+    assert memory_client.post("/v1/webhooks/transactions", json={**webhook, "amount": 1600}).status_code == 202
+
+    response = memory_client.get("/v1/transactions/txn_memory_1", params={"wait": 5})
+    assert response.status_code == 200
+    body = response.json()[0]
+    assert body["status"] == TransactionStatus.PROCESSED.value
+    assert Decimal(str(body["amount"])) == Decimal("1500")
+    assert memory_store.rows["txn_memory_1"].duplicate_conflict_count == 1
+
+    async def _count_rows() -> int:
+        async with db_core.SessionLocal() as db:
+            return (await db.execute(select(func.count()).select_from(Transaction))).scalar_one()
+
+    assert asyncio.run(_count_rows()) == 0
+
+
+def test_memory_repository_matches_ingest_and_transition_semantics():
+    repository = InMemoryTransactionRepository(store=InMemoryTransactionStore())
+    now = utcnow()
+
+    async def _run() -> None:
+        created = await repository.ingest(**_ingest_kwargs("txn_mem_sem", b"hash_a", now))
+        assert created.created and not created.conflict
+
+        duplicate = await repository.ingest(**_ingest_kwargs("txn_mem_sem", b"hash_a", now))
+        assert not duplicate.created and not duplicate.conflict and not duplicate.reopened
+        assert duplicate.existing_status == TransactionStatus.PROCESSING
+
+        conflict = await repository.ingest(**_ingest_kwargs("txn_mem_sem", b"hash_b", now))
+        assert conflict.conflict and conflict.existing_payload_hash == b"hash_a"
+
+        # Past the stale timeout a redelivery re-opens the PROCESSING row for another attempt.
+        later = now + timedelta(seconds=5)
+        reopened = await repository.ingest(**_ingest_kwargs("txn_mem_sem", b"hash_a", later, stale_timeout_seconds=1))
+        assert reopened.reopened
+        assert repository.store.rows["txn_mem_sem"].processing_started_at == later
+
+        assert await repository.claim_due_for_processing(due_before=later, limit=10) == ["txn_mem_sem"]
+        assert await repository.mark_many_processed(["txn_mem_sem", "txn_mem_sem"], processed_at=later) == ["txn_mem_sem"]
+        # Final rows never transition again and are never re-opened.
+        assert not await repository.mark_failed("txn_mem_sem", error_message="late failure")
+        final = await repository.ingest(
+            **_ingest_kwargs("txn_mem_sem", b"hash_a", later + timedelta(seconds=60), stale_timeout_seconds=1)
+        )
+        assert final.existing_status == TransactionStatus.PROCESSED and not final.reopened
+
+    asyncio.run(_run())
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_rounds_amounts_like_postgres(test_engine):
+    now = utcnow()
+    amounts = {"txn_parity_1": "10.5", "txn_parity_2": "10.005", "txn_parity_3": "1500"}
+    memory_repository = InMemoryTransactionRepository(store=InMemoryTransactionStore())
+
+    async with db_core.SessionLocal() as db:
+        postgres_repository = TransactionRepository(db)
+        for repository in (postgres_repository, memory_repository):
+            for transaction_id, amount in amounts.items():
+                await repository.ingest(
+                    **{**_ingest_kwargs(transaction_id, transaction_id.encode(), now), "amount": Decimal(amount)}
+                )
+        stored = []
+        for repository in (postgres_repository, memory_repository):
+            rows = await repository.get_rows_by_transaction_ids(list(amounts))
+            stored.append({row.transaction_id: str(row.amount) for row in rows})
+
+    assert stored[0] == stored[1] == {
+        "txn_parity_1": "10.50",
+        "txn_parity_2": "10.01",
+        "txn_parity_3": "1500.00",
+    }
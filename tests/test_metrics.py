@@ -0,0 +1,37 @@
+import time
+
+from app.utils.metrics import Histogram
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", labels=("outcome",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "created")
+    histogram.observe(0.5, "created")
+    histogram.observe(5, "created")
+
+    lines = list(histogram.render())
+
+    assert 'demo_seconds_bucket{outcome="created",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{outcome="created",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{outcome="created",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{outcome="created"} 3' in lines
+
+
+def test_metrics_endpoint_reports_ingest_outcomes_and_processing(client, payload):
+    webhook = payload("txn_metrics_1")
+    assert client.post("/v1/webhooks/transactions", json=webhook).status_code == 202
+    assert client.post("/v1/webhooks/transactions", json=webhook).status_code == 202
+    assert client.post("/v1/webhooks/transactions", json={**webhook, "amount": 10}).status_code == 202
+    assert client.get("/v1/transactions/txn_metrics_1", params={"wait": 10}).json()[0]["status"] == "PROCESSED"
+    time.sleep(0.1)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    for outcome in ("created", "duplicate", "conflict"):
+        assert f'webhook_ingest_duration_seconds_count{{outcome="{outcome}"}}' in body
+    assert "transaction_processing_lag_seconds_count" in body
+    assert 'transaction_processing_duration_seconds_count{result="processed"}' in body
+    assert "background_tasks " in body
@@ -0,0 +1,189 @@
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import func, select, text
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.enums import TransactionStatus
+from app.utils.time import utcnow
+from app.models.transaction import Transaction, TransactionKey
+from app.repositories.transaction_repository import (
+    _SELECT_ROWS_BY_TRANSACTION_ID,
+    _SELECT_ROWS_BY_TRANSACTION_IDS,
+    TransactionRepository,
+    _transition_stmt,
+)
+from app.services.partition_maintenance import (
+    _add_months,
+    _month_start,
+    autogenerate_include_name,
+    create_future_partitions,
+    partition_name,
+    run_partition_maintenance,
+)
+
+
+async def _partitions() -> set[str]:
+    async with db_core.engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits AS i JOIN pg_class AS child ON child.oid = i.inhrelid"
+                " WHERE i.inhparent = 'transactions'::regclass"
+            )
+        )
+        return set(result.scalars().all())
+
+
+async def _insert_old_transaction(
+    transaction_id: str, months_ago: int, status: TransactionStatus = TransactionStatus.PROCESSED
+) -> None:
+    created_at = _add_months(_month_start(utcnow()), -months_ago) + timedelta(days=3)
+    async with db_core.engine.begin() as conn:
+        await create_future_partitions(conn, now=created_at, premake_months=0)
+    async with db_core.SessionLocal() as db:
+        db.add(TransactionKey(transaction_id=transaction_id, created_at=created_at))
+        db.add(
+            Transaction(
+                transaction_id=transaction_id,
+                source_account="acc_user_1",
+                destination_account="acc_merchant_1",
+                amount=100,
+                currency="INR",
+                status=status,
+                created_at=created_at,
+                processed_at=created_at if status == TransactionStatus.PROCESSED else None,
+                payload_hash=b"hash_old",
+            )
+        )
+        await db.commit()
+
+
+async def _scanned_partitions(stmt, params: dict) -> set[str]:
+    # Partitions EXPLAIN ANALYZE shows as actually scanned; pruned ones are absent or "(never executed)".
+    async with db_core.engine.connect() as conn:
+        # A few rows per partition make sequential scans cheapest; production-sized partitions are index-probed.
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        compiled = stmt.compile(dialect=conn.dialect)
+        bound = compiled.construct_params(params)
+        plan = await conn.exec_driver_sql(
+            "EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF) " + compiled.string,
+            tuple(bound[name] for name in compiled.positiontup),
+        )
+        lines = plan.scalars().all()
+        await conn.rollback()
+    scanned = set()
+    for line in lines:
+        match = re.search(r"Scan (?:using \S+ )?on (transactions_(?:p\d{6}|default))\b", line)
+        if match and "never executed" not in line:
+            scanned.add(match.group(1))
+    return scanned
+
+
+async def _ingest(transaction_id: str, payload_hash: bytes):
+    async with db_core.SessionLocal() as db:
+        return await TransactionRepository(db).ingest(
+            transaction_id=transaction_id,
+            source_account="acc_user_1",
+            destination_account="acc_merchant_1",
+            amount=Decimal("100"),
+            currency="INR",
+            payload_hash=payload_hash,
+            now=utcnow(),
+            stale_timeout_seconds=120,
+        )
+
+
+async def _row_count(transaction_id: str) -> int:
+    async with db_core.SessionLocal() as db:
+        stmt = select(func.count()).select_from(Transaction).where(Transaction.transaction_id == transaction_id)
+        return (await db.execute(stmt)).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_maintenance_creates_current_and_future_monthly_partitions(test_engine):
+    created, retired = await run_partition_maintenance()
+
+    month = _month_start(utcnow())
+    expected = {partition_name(_add_months(month, offset)) for offset in range(settings.partition_premake_months + 1)}
+    assert set(created) == expected and retired == []
+    assert expected | {"transactions_default"} == await _partitions()
+    # Idempotent: a second run finds nothing to do.
+    assert await run_partition_maintenance() == ([], [])
+
+
+@pytest.mark.asyncio
+async def test_duplicates_are_detected_against_rows_in_older_partitions(test_engine):
+    await run_partition_maintenance()
+    await _insert_old_transaction("txn_partition_old", months_ago=2)
+
+    duplicate = await _ingest("txn_partition_old", b"hash_old")
+    conflict = await _ingest("txn_partition_old", b"hash_new")
+
+    assert not duplicate.created and duplicate.existing_status == TransactionStatus.PROCESSED
+    assert conflict.conflict and conflict.existing_payload_hash == b"hash_old"
+    assert await _row_count("txn_partition_old") == 1
+
+
+@pytest.mark.asyncio
+async def test_retention_detaches_old_partitions_and_releases_their_keys(test_engine, monkeypatch):
+    monkeypatch.setattr(settings, "partition_retention_months", 2)
+    await run_partition_maintenance()
+    await _insert_old_transaction("txn_partition_expired", months_ago=4)
+    await _insert_old_transaction("txn_partition_kept", months_ago=1)
+    expired = partition_name(_add_months(_month_start(utcnow()), -4))
+
+    _, retired = await run_partition_maintenance()
+
+    assert retired == [expired]
+    assert expired not in await _partitions()
+    async with db_core.SessionLocal() as db:
+        keys = set((await db.execute(select(TransactionKey.transaction_id))).scalars().all())
+        assert keys == {"txn_partition_kept"}
+        await db.execute(text(f"DROP TABLE {expired}"))
+        await db.commit()
+
+    # Past retention, a redelivery starts over as a new transaction in the current partition.
+    assert (await _ingest("txn_partition_expired", b"hash_old")).created
+    assert not (await _ingest("txn_partition_kept", b"hash_old")).created
+
+
+@pytest.mark.asyncio
+async def test_lookups_and_transitions_scan_only_the_partitions_holding_the_rows(test_engine):
+    await run_partition_maintenance()
+    await _insert_old_transaction("txn_prune_1", months_ago=2, status=TransactionStatus.PROCESSING)
+    await _insert_old_transaction("txn_prune_2", months_ago=1, status=TransactionStatus.PROCESSING)
+    month = _month_start(utcnow())
+    older, newer = partition_name(_add_months(month, -2)), partition_name(_add_months(month, -1))
+    ids = ["txn_prune_1", "txn_prune_2"]
+
+    assert await _scanned_partitions(_SELECT_ROWS_BY_TRANSACTION_ID, {"transaction_id": ids[0]}) == {older}
+    assert await _scanned_partitions(_SELECT_ROWS_BY_TRANSACTION_IDS, {"transaction_ids": ids}) == {older, newer}
+    interrupt_one = _transition_stmt("interrupt", many=False, notify=False)
+    assert await _scanned_partitions(interrupt_one, {"target_id": ids[1], "message": "x"}) == {newer}
+    interrupt_many = _transition_stmt("interrupt", many=True, notify=False)
+    assert await _scanned_partitions(interrupt_many, {"target_ids": ids, "message": "x"}) == {older, newer}
+
+    async with db_core.SessionLocal() as db:
+        repository = TransactionRepository(db)
+        assert sorted(await repository.mark_many_processed(ids, processed_at=utcnow())) == ids
+        rows = await repository.get_rows_by_transaction_ids(ids)
+    assert {row.transaction_id: row.status for row in rows} == dict.fromkeys(ids, TransactionStatus.PROCESSED)
+
+
+@pytest.mark.asyncio
+async def test_autogenerate_leaves_partitions_and_their_indexes_alone(test_engine):
+    await run_partition_maintenance()
+
+    def _diffs(sync_conn, opts: dict) -> list:
+        return compare_metadata(MigrationContext.configure(sync_conn, opts=opts), db_core.Base.metadata)
+
+    async with db_core.engine.connect() as conn:
+        unfiltered = await conn.run_sync(_diffs, {})
+        filtered = await conn.run_sync(_diffs, {"include_name": autogenerate_include_name})
+    assert any(diff[0] == "remove_table" for diff in unfiltered)
+    assert filtered == []
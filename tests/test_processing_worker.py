@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.enums import TransactionStatus
+from app.utils.runtime import set_shutdown_signal
+from app.models.transaction import Transaction
+from app.worker import run_worker
+
+
+@pytest.fixture
+def worker_runner(monkeypatch):
+    monkeypatch.setattr(settings, "processing_runner", "worker")
+    monkeypatch.setattr(settings, "queue_poll_interval_seconds", 0.05)
+
+
+def test_api_only_ingests_and_worker_process_finalizes(worker_runner, client, post_webhook):
+    post_webhook("txn_worker_runner_1")
+
+    stats = client.get("/v1/runtime/stats").json()["processing"]
+    assert stats["runner"] == "worker"
+    # Nothing was scheduled in the API process, and no sweeper or queue worker runs there.
+    assert stats["pending"] == 0 and stats["in_flight"] == 0 and stats["background_tasks"] == 0
+
+    async def _status() -> TransactionStatus:
+        async with db_core.SessionLocal() as db:
+            return (
+                await db.execute(select(Transaction.status).where(Transaction.transaction_id == "txn_worker_runner_1"))
+            ).scalar_one()
+
+    async def _run_worker_until_processed() -> TransactionStatus:
+        worker = asyncio.create_task(run_worker())
+        try:
+            for _ in range(200):
+                status = await _status()
+                if status != TransactionStatus.PROCESSING:
+                    return status
+                await asyncio.sleep(0.05)
+            return status
+        finally:
+            set_shutdown_signal()
+            await worker
+
+    assert asyncio.run(_run_worker_until_processed()) == TransactionStatus.PROCESSED
@@ -0,0 +1,39 @@
+import pytest
+
+from app.utils.config import settings
+from app.utils.timing import _current_timer, stage
+
+
+@pytest.fixture
+def server_timing_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "server_timing_enabled", True)
+
+
+def _stage_names(header: str) -> list[str]:
+    return [part.split(";", 1)[0].strip() for part in header.split(",")]
+
+
+def test_webhook_response_carries_server_timing_stages(client, server_timing_enabled, payload):
+    created = client.post("/v1/webhooks/transactions", json=payload("txn_timing_1"))
+    assert created.status_code == 202
+    # The test engine uses NullPool, so there is no pooled checkout stage here.
+    assert _stage_names(created.headers["server-timing"]) == ["validate", "capacity", "hash", "insert", "commit", "total"]
+
+    duplicate = client.post("/v1/webhooks/transactions", json=payload("txn_timing_1"))
+    assert {"hash", "insert", "commit", "total"} <= set(_stage_names(duplicate.headers["server-timing"]))
+
+
+def test_server_timing_is_absent_when_disabled(client, payload):
+    response = client.post("/v1/webhooks/transactions", json=payload("txn_timing_1"))
+    assert response.status_code == 202
+    assert "server-timing" not in response.headers
+
+
+def test_stage_outside_a_timed_request_is_a_no_op(client, payload):
+    with stage("insert"):
+        pass
+    assert _current_timer.get() is None
+
+    response = client.post("/v1/webhooks/transactions", json=payload("txn_timing_untimed"))
+    assert response.status_code == 202
+    assert "server-timing" not in response.headers
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.utils import db as db_core
+from app.utils.config import settings
+from app.utils.enums import TransactionStatus
+from app.utils.runtime import drain_background_tasks
+from app.utils.time import utcnow
+from app.models.transaction import Transaction
+from app.services.stale_sweeper import sweep_stale_transactions
+
+
+@pytest.mark.asyncio
+async def test_sweeper_reclaims_stale_rows_in_bounded_batches(test_engine, make_transaction):
+    stale_started_at = utcnow() - timedelta(seconds=settings.processing_stale_timeout_seconds + 60)
+
+    def _interrupted(transaction_id: str, processing_started_at, **overrides):
+        return make_transaction(
+            transaction_id,
+            processing_started_at=processing_started_at,
+            error_message="Processing interrupted by shutdown; eligible for retry",
+            **overrides,
+        )
+
+    async with db_core.SessionLocal() as db:
+        db.add_all(
+            [
+                _interrupted("txn_sweep_interrupted", None),
+                _interrupted("txn_sweep_stale_1", stale_started_at),
+                _interrupted("txn_sweep_stale_2", stale_started_at),
+                _interrupted("txn_sweep_fresh", utcnow()),
+                _interrupted("txn_sweep_failed", None, status=TransactionStatus.FAILED),
+            ]
+        )
+        await db.commit()
+
+    first = await sweep_stale_transactions(max_rows=2, batch_size=1)
+    second = await sweep_stale_transactions(max_rows=10, batch_size=10)
+    await drain_background_tasks()
+
+    assert len(first) == 2
+    assert first[0] == "txn_sweep_interrupted"
+    assert set(first + second) == {"txn_sweep_interrupted", "txn_sweep_stale_1", "txn_sweep_stale_2"}
+
+    async with db_core.SessionLocal() as db:
+        rows = (await db.execute(select(Transaction))).scalars().all()
+        reclaimed = {row.transaction_id: row for row in rows if row.transaction_id in set(first + second)}
+        assert all(row.processing_started_at is not None for row in reclaimed.values())
+        assert all(row.error_message is None for row in reclaimed.values())
@@ -0,0 +1,37 @@
+import json
+import time
+
+
+def test_long_poll_returns_once_transaction_is_processed(client, post_webhook):
+    post_webhook("txn_wait_1")
+
+    started = time.perf_counter()
+    response = client.get("/v1/transactions/txn_wait_1", params={"wait": 10})
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    assert response.json()[0]["status"] == "PROCESSED"
+    assert elapsed < 8
+    notifier = client.get("/v1/runtime/stats").json()["status_notifier"]
+    assert notifier["listening"] is True
+    assert notifier["subscribers"] == 0
+
+
+def test_long_poll_times_out_with_current_state_for_unknown_id(client):
+    response = client.get("/v1/transactions/txn_wait_missing", params={"wait": 0.2})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_event_stream_reports_each_state_until_final(client, post_webhook):
+    post_webhook("txn_events_1")
+
+    statuses = []
+    with client.stream("GET", "/v1/transactions/txn_events_1/events", params={"wait": 10}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        for line in response.iter_lines():
+            if line.startswith("data: "):
+                statuses.append(json.loads(line[len("data: "):])[0]["status"])
+
+    assert statuses == ["PROCESSING", "PROCESSED"]
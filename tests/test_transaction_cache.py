@@ -0,0 +1,49 @@
+import asyncio
+
+from sqlalchemy import update
+
+from app.utils import db as db_core
+from app.utils.cache import TransactionReadCache, transaction_cache
+from app.utils.enums import TransactionStatus
+from app.models.transaction import Transaction
+
+
+def test_cache_evicts_least_recently_used_and_expires_processing_entries():
+    cache = TransactionReadCache(max_entries=2, processing_ttl_seconds=0)
+    cache.put("txn_a", b"a", final=True)
+    cache.put("txn_b", b"b", final=True)
+    assert cache.get("txn_a") == b"a"
+    cache.put("txn_c", b"c", final=True)
+    # PROCESSING entries with a zero TTL are never stored.
+    cache.put("txn_d", b"d", final=False)
+
+    assert cache.get("txn_b") is None
+    assert cache.get("txn_d") is None
+    assert (cache.get("txn_a"), cache.get("txn_c")) == (b"a", b"c")
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 2, 1)
+
+
+def test_final_transaction_reads_are_served_from_cache(client, payload):
+    assert client.post("/v1/webhooks/transactions", json=payload("txn_cache_1")).status_code == 202
+
+    async def _finalize() -> None:
+        async with db_core.SessionLocal() as db:
+            await db.execute(
+                update(Transaction)
+                .where(Transaction.transaction_id == "txn_cache_1")
+                .values(status=TransactionStatus.FAILED)
+            )
+            await db.commit()
+
+    asyncio.run(_finalize())
+    transaction_cache.invalidate("txn_cache_1")
+
+    first = client.get("/v1/transactions/txn_cache_1")
+    hits_before = transaction_cache.hits
+    second = client.get("/v1/transactions/txn_cache_1")
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert first.json()[0]["status"] == "FAILED"
+    assert first.headers["content-type"] == "application/json"
+    assert transaction_cache.hits == hits_before + 1
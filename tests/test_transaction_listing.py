@@ -0,0 +1,30 @@
+def test_listing_walks_pages_newest_first_with_filters(client, post_webhook):
+    for index in range(5):
+        post_webhook(f"txn_list_{index}", source_account="acc_user_a" if index % 2 == 0 else "acc_user_b")
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/v1/transactions", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(txn["transaction_id"] for txn in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"txn_list_{index}" for index in reversed(range(5))]
+
+    filtered = client.get("/v1/transactions", params={"source_account": "acc_user_b"}).json()
+    assert [txn["transaction_id"] for txn in filtered["items"]] == ["txn_list_3", "txn_list_1"]
+    assert filtered["next_cursor"] is None
+    assert client.get("/v1/transactions", params={"status": "FAILED"}).json()["items"] == []
+
+
+def test_listing_rejects_malformed_cursor(client):
+    response = client.get("/v1/transactions", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+import asyncio
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.utils import db as db_core
+from app.utils.time import utcnow
+from app.dto.transaction import TransactionOut
+from app.repositories.transaction_repository import TransactionRepository
+
+
+def test_lookup_returns_found_transactions_and_reports_missing_ids(client, post_webhook):
+    for transaction_id in ("txn_lookup_1", "txn_lookup_2"):
+        post_webhook(transaction_id)
+
+    response = client.post(
+        "/v1/transactions:lookup",
+        json={"transaction_ids": ["txn_lookup_2", "txn_unknown", "txn_lookup_1", "txn_lookup_2"]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [txn["transaction_id"] for txn in body["transactions"]] == ["txn_lookup_2", "txn_lookup_1"]
+    assert body["missing"] == ["txn_unknown"]
+    single = client.get("/v1/transactions/txn_lookup_1").json()[0]
+    # Processing may finish between the two reads; the stable fields must serialize identically.
+    stable = ("transaction_id", "source_account", "destination_account", "amount", "currency", "created_at")
+    assert {key: body["transactions"][1][key] for key in stable} == {key: single[key] for key in stable}
+
+
+def test_lookup_rejects_empty_id_list(client):
+    response = client.post("/v1/transactions:lookup", json={"transaction_ids": []})
+    assert response.status_code == 422
+
+
+def test_read_bodies_are_byte_identical_to_transaction_out_serialization(client, post_webhook):
+    transaction_ids = ["txn_rows_done", "txn_rows_failed", "txn_rows_open"]
+    for transaction_id, amount in zip(transaction_ids, (1500, 10.5, 0.01)):
+        post_webhook(transaction_id, amount=amount)
+
+    async def _finish_and_serialize() -> dict[str, bytes]:
+        async with db_core.SessionLocal() as db:
+            repository = TransactionRepository(db)
+            await repository.mark_processed("txn_rows_done", processed_at=utcnow())
+            await repository.mark_failed("txn_rows_failed", error_message="boom")
+            transactions = await repository.get_many_by_transaction_ids(transaction_ids)
+        adapter = TypeAdapter(List[TransactionOut])
+        return {txn.transaction_id: adapter.dump_json([TransactionOut.model_validate(txn)]) for txn in transactions}
+
+    expected = asyncio.run(_finish_and_serialize())
+    for transaction_id in transaction_ids:
+        assert client.get(f"/v1/transactions/{transaction_id}").content == expected[transaction_id]
+
+    response = client.post("/v1/transactions:lookup", json={"transaction_ids": transaction_ids})
+    items = b",".join(expected[transaction_id][1:-1] for transaction_id in transaction_ids)
+    assert response.content == b'{"transactions":[' + items + b'],"missing":[]}'
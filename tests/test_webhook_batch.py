@@ -0,0 +1,87 @@
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import select, update
+
+from app.utils import db as db_core
+from app.utils.enums import WebhookIngestOutcome
+from app.utils.time import utcnow
+from app.dto.webhook import TransactionWebhookIn
+from app.models.transaction import Transaction
+from app.services.webhook_service import WebhookService
+
+
+def test_batch_ingest_reports_per_item_outcomes(client, payload):
+    assert client.post("/v1/webhooks/transactions", json=payload("txn_batch_existing")).status_code == 202
+
+    response = client.post(
+        "/v1/webhooks/transactions:batch",
+        json=[
+            payload("txn_batch_new_1"),
+            payload("txn_batch_existing"),
+            payload("txn_batch_existing", amount=9999),
+            payload("txn_batch_new_2"),
+            payload("txn_batch_new_1"),
+        ],
+    )
+    assert response.status_code == 202
+    body = response.json()
+    assert [item["transaction_id"] for item in body] == [
+        "txn_batch_new_1",
+        "txn_batch_existing",
+        "txn_batch_existing",
+        "txn_batch_new_2",
+        "txn_batch_new_1",
+    ]
+    assert [item["outcome"] for item in body] == ["CREATED", "DUPLICATE", "CONFLICT", "CREATED", "DUPLICATE"]
+    assert all(item["acknowledged"] is True for item in body)
+
+    async def _assert_db_state() -> None:
+        async with db_core.SessionLocal() as db:
+            rows = (await db.execute(select(Transaction).order_by(Transaction.transaction_id))).scalars().all()
+            assert [row.transaction_id for row in rows] == ["txn_batch_existing", "txn_batch_new_1", "txn_batch_new_2"]
+            existing = rows[0]
+            assert float(existing.amount) == 1500.0
+            assert existing.duplicate_conflict_count == 1
+
+    asyncio.run(_assert_db_state())
+
+
+def test_batch_ingest_rejects_empty_batch(client):
+    response = client.post("/v1/webhooks/transactions:batch", json=[])
+    assert response.status_code == 422
+
+
+def test_concurrent_duplicate_batches_keep_every_conflict_and_reopen_once(test_engine, payload):
+    async def _run() -> None:
+        async with db_core.SessionLocal() as db:
+            results = await WebhookService(db).ingest_transaction_webhooks(
+                [TransactionWebhookIn(**payload("txn_batch_race"))], use_duplicate_filter=False
+            )
+            assert results[0][1] == WebhookIngestOutcome.CREATED
+            # Make the row look stuck so a duplicate delivery re-opens it.
+            await db.execute(
+                update(Transaction)
+                .where(Transaction.transaction_id == "txn_batch_race")
+                .values(processing_started_at=utcnow() - timedelta(hours=1))
+            )
+            await db.commit()
+
+        async def _batch() -> list[tuple]:
+            async with db_core.SessionLocal() as db:
+                payloads = [
+                    TransactionWebhookIn(**payload("txn_batch_race", amount=2000)),
+                    TransactionWebhookIn(**payload("txn_batch_race", amount=3000)),
+                ]
+                return await WebhookService(db).ingest_transaction_webhooks(payloads, use_duplicate_filter=False)
+
+        batches = await asyncio.gather(*(_batch() for _ in range(5)))
+        assert all(outcome == WebhookIngestOutcome.CONFLICT for batch in batches for _, outcome, _ in batch)
+        assert sum(scheduled for batch in batches for _, _, scheduled in batch) == 1
+
+        async with db_core.SessionLocal() as db:
+            stored = await db.scalar(select(Transaction).where(Transaction.transaction_id == "txn_batch_race"))
+        assert stored.duplicate_conflict_count == 10
+        assert float(stored.amount) == 1500.0
+
+    asyncio.run(_run())
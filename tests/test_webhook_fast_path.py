@@ -0,0 +1,77 @@
+import hashlib
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.utils.config import settings
+from app.utils.idempotency import canonical_payload, payload_hash
+from app.dto.webhook import TransactionWebhookIn
+from app.router.webhook_fast_path import render_ack
+
+
+@pytest.fixture
+def fast_path_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "webhook_fast_path_enabled", True)
+
+
+def _without_timing(body: dict) -> dict:
+    return {key: value for key, value in body.items() if key != "response_time_ms"}
+
+
+def test_fast_path_ack_matches_the_regular_route(client, fast_path_enabled, monkeypatch, payload):
+    fast = client.post("/v1/webhooks/transactions", json=payload("txn_fast_1", currency="inr"))
+    fast_duplicate = client.post("/v1/webhooks/transactions", json=payload("txn_fast_1", currency="inr"))
+    monkeypatch.setattr(settings, "webhook_fast_path_enabled", False)
+    regular = client.post("/v1/webhooks/transactions", json=payload("txn_fast_2", currency="inr"))
+
+    for response in (fast, fast_duplicate):
+        assert response.status_code == regular.status_code == 202
+        assert response.headers["content-type"] == regular.headers["content-type"]
+        assert list(response.json()) == list(regular.json())
+        assert isinstance(response.json()["response_time_ms"], float)
+    assert _without_timing(fast.json()) == {**_without_timing(regular.json()), "transaction_id": "txn_fast_1"}
+
+    # The duplicate was recognised against the row the fast path wrote.
+    transactions = client.get("/v1/transactions/txn_fast_1").json()
+    assert len(transactions) == 1
+    assert transactions[0]["currency"] == "INR"
+
+
+def test_fast_path_passes_invalid_payloads_to_the_regular_route(client, fast_path_enabled, monkeypatch, payload):
+    invalid = payload("txn_fast_invalid", amount=-5, currency="inr")
+    fast = client.post("/v1/webhooks/transactions", json=invalid)
+    malformed = client.post(
+        "/v1/webhooks/transactions", content=b"{not json", headers={"content-type": "application/json"}
+    )
+    monkeypatch.setattr(settings, "webhook_fast_path_enabled", False)
+    regular = client.post("/v1/webhooks/transactions", json=invalid)
+    regular_malformed = client.post(
+        "/v1/webhooks/transactions", content=b"{not json", headers={"content-type": "application/json"}
+    )
+
+    assert fast.status_code == regular.status_code == 422
+    assert fast.content == regular.content
+    assert malformed.status_code == regular_malformed.status_code == 422
+    assert malformed.content == regular_malformed.content
+
+
+def test_ack_template_and_field_hash_match_the_generic_encoders():
+    for transaction_id in ("txn_plain", 'txn_"quoted"\\', "txn_ünïcode_ "):
+        ack = json.dumps(
+            {"status_code": 202, "acknowledged": True, "transaction_id": transaction_id, "response_time_ms": 1.234},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        assert render_ack(transaction_id, 1.234) == ack
+
+        webhook = TransactionWebhookIn(
+            transaction_id=transaction_id,
+            source_account="acc_é",
+            destination_account="acc_merchant",
+            amount=Decimal("10.005"),
+            currency="eur",
+        )
+        serialized = json.dumps(canonical_payload(webhook), sort_keys=True, separators=(",", ":"))
+
+        assert payload_hash(webhook) == hashlib.sha256(serialized.encode("utf-8")).digest()
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.utils import db as db_core
+from app.utils.enums import TransactionStatus
+from app.utils.time import utcnow
+from app.models.transaction import Transaction
+from app.repositories.transaction_repository import TransactionRepository
+from app.services.queue_worker import process_due_transactions
+
+
+@pytest.mark.asyncio
+async def test_queue_worker_processes_only_due_rows(test_engine, make_transaction):
+    now = utcnow()
+    async with db_core.SessionLocal() as db:
+        db.add_all(
+            [
+                make_transaction("txn_queue_due", processing_started_at=now - timedelta(seconds=60)),
+                make_transaction("txn_queue_not_due", processing_started_at=now - timedelta(seconds=1)),
+            ]
+        )
+        await db.commit()
+
+    processed = await process_due_transactions(processing_delay_seconds=30, batch_size=10)
+    assert processed == 1
+
+    async with db_core.SessionLocal() as db:
+        rows = (await db.execute(select(Transaction).order_by(Transaction.transaction_id))).scalars().all()
+        statuses = {row.transaction_id: row.status for row in rows}
+        assert statuses == {
+            "txn_queue_due": TransactionStatus.PROCESSED,
+            "txn_queue_not_due": TransactionStatus.PROCESSING,
+        }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_skip_locked_rows(test_engine, make_transaction):
+    started_at = utcnow() - timedelta(seconds=60)
+    async with db_core.SessionLocal() as db:
+        db.add_all([make_transaction(f"txn_queue_claim_{i}", processing_started_at=started_at) for i in range(4)])
+        await db.commit()
+
+    due_before = utcnow()
+    async with db_core.SessionLocal() as first_db, db_core.SessionLocal() as second_db:
+        first = await TransactionRepository(first_db).claim_due_for_processing(due_before=due_before, limit=3)
+        second = await TransactionRepository(second_db).claim_due_for_processing(due_before=due_before, limit=3)
+
+    first_ids = set(first)
+    second_ids = set(second)
+    assert len(first_ids) == 3
+    assert len(second_ids) == 1
+    assert not first_ids & second_ids